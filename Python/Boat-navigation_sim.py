@@ -1,6 +1,4 @@
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
 import random
 import math
 
@@ -19,10 +17,12 @@ class State:
     TURN = "TURN"
 
 class AquaguardSim:
-    def __init__(self):
+    def __init__(self, rng=random):
+        # rng: the random module, or a random.Random(seed) to make one run repeatable (fleet_sim.py relies on it)
+        self.rng = rng
         self.x = POOL_WIDTH / 2
         self.y = POOL_HEIGHT / 2
-        self.heading = random.uniform(0, 360) 
+        self.heading = self.rng.uniform(0, 360) 
         self.state = State.CRUISE
         
         self.reverse_counter = 0
@@ -108,18 +108,18 @@ class AquaguardSim:
                 elif self.collision_type == "LEFT_BLOCKED":
                     # left side has wall, force turn right
                     # random angle between 70~100 (70% prob) or 110~150 (30% prob)
-                    angle = random.randint(70, 100) if random.random() < 0.7 else random.randint(110, 150)
+                    angle = self.rng.randint(70, 100) if self.rng.random() < 0.7 else self.rng.randint(110, 150)
                     self.turn_target_angle = -angle # postive angle = right turn
                     
                 elif self.collision_type == "RIGHT_BLOCKED":
                     # right side has wall, force turn left
-                    angle = random.randint(70, 100) if random.random() < 0.7 else random.randint(110, 150)
+                    angle = self.rng.randint(70, 100) if self.rng.random() < 0.7 else self.rng.randint(110, 150)
                     self.turn_target_angle = angle # negative angle = left turn
                     
                 else: # FREE
                     # choose random turn direction, if only front sonar collides
-                    turn_dir = random.choice([-1, 1]) 
-                    angle = random.randint(70, 100) if random.random() < 0.7 else random.randint(110, 150)
+                    turn_dir = self.rng.choice([-1, 1]) 
+                    angle = self.rng.randint(70, 100) if self.rng.random() < 0.7 else self.rng.randint(110, 150)
                     self.turn_target_angle = angle * turn_dir
                 
                 self.turn_accumulated = 0
@@ -136,61 +136,69 @@ class AquaguardSim:
         self.y = max(20, min(POOL_HEIGHT - 20, self.y))
 
 # --- visulization ---
-fig, ax = plt.subplots(figsize=(10, 6))
-sim = AquaguardSim()
-
-pool_rect = plt.Rectangle((0, 0), POOL_WIDTH, POOL_HEIGHT, fill=False, lw=3, color='black')
-ax.add_patch(pool_rect)
-
-boat_dot, = ax.plot([], [], 'ro', markersize=10, label='Robot') 
-boat_dir, = ax.plot([], [], 'r-', lw=2) 
-ray_front, = ax.plot([], [], 'g--', alpha=0.5)
-ray_left, = ax.plot([], [], 'g--', alpha=0.5)
-ray_right, = ax.plot([], [], 'g--', alpha=0.5)
-limit_left, = ax.plot([], [], 'r-', lw=3, alpha=0.6)
-limit_right, = ax.plot([], [], 'r-', lw=3, alpha=0.6)
-
-status_text = ax.text(20, POOL_HEIGHT + 20, "", fontsize=12, color='blue', fontfamily='monospace')
-
-ax.set_xlim(-50, POOL_WIDTH + 50)
-ax.set_ylim(-50, POOL_HEIGHT + 50)
-ax.set_aspect('equal')
-ax.set_title("Aquaguard: Dead Corner Escape + Smart Turn")
-ax.grid(True, alpha=0.3)
-
-def animate(frame):
-    sim.update()
-    boat_dot.set_data([sim.x], [sim.y])
-    rad = math.radians(sim.heading)
-    boat_dir.set_data([sim.x, sim.x + 60 * math.cos(rad)], 
-                      [sim.y, sim.y + 60 * math.sin(rad)])
+def main():
+    import matplotlib.pyplot as plt
+    import matplotlib.animation as animation
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sim = AquaguardSim()
+
+    pool_rect = plt.Rectangle((0, 0), POOL_WIDTH, POOL_HEIGHT, fill=False, lw=3, color='black')
+    ax.add_patch(pool_rect)
+
+    boat_dot, = ax.plot([], [], 'ro', markersize=10, label='Robot') 
+    boat_dir, = ax.plot([], [], 'r-', lw=2) 
+    ray_front, = ax.plot([], [], 'g--', alpha=0.5)
+    ray_left, = ax.plot([], [], 'g--', alpha=0.5)
+    ray_right, = ax.plot([], [], 'g--', alpha=0.5)
+    limit_left, = ax.plot([], [], 'r-', lw=3, alpha=0.6)
+    limit_right, = ax.plot([], [], 'r-', lw=3, alpha=0.6)
+
+    status_text = ax.text(20, POOL_HEIGHT + 20, "", fontsize=12, color='blue', fontfamily='monospace')
+
+    ax.set_xlim(-50, POOL_WIDTH + 50)
+    ax.set_ylim(-50, POOL_HEIGHT + 50)
+    ax.set_aspect('equal')
+    ax.set_title("Aquaguard: Dead Corner Escape + Smart Turn")
+    ax.grid(True, alpha=0.3)
+
+    def animate(frame):
+        sim.update()
+        boat_dot.set_data([sim.x], [sim.y])
+        rad = math.radians(sim.heading)
+        boat_dir.set_data([sim.x, sim.x + 60 * math.cos(rad)], 
+                          [sim.y, sim.y + 60 * math.sin(rad)])
     
-    def get_ray_coords(dist, angle_offset):
-        r_angle = math.radians(sim.heading + angle_offset)
-        return ([sim.x, sim.x + dist * math.cos(r_angle)],
-                [sim.y, sim.y + dist * math.sin(r_angle)])
-
-    fx, fy = get_ray_coords(sim.sensors['front'], 0)
-    ray_front.set_data(fx, fy)
-    lx, ly = get_ray_coords(sim.sensors['left'], 90)
-    ray_left.set_data(lx, ly)
-    rx, ry = get_ray_coords(sim.sensors['right'], -90)
-    ray_right.set_data(rx, ry)
-
-    lx_lim, ly_lim = get_ray_coords(DEAD_CORNER_DIST, 90)
-    limit_left.set_data(lx_lim, ly_lim)
-    rx_lim, ry_lim = get_ray_coords(DEAD_CORNER_DIST, -90)
-    limit_right.set_data(rx_lim, ry_lim)
+        def get_ray_coords(dist, angle_offset):
+            r_angle = math.radians(sim.heading + angle_offset)
+            return ([sim.x, sim.x + dist * math.cos(r_angle)],
+                    [sim.y, sim.y + dist * math.sin(r_angle)])
+
+        fx, fy = get_ray_coords(sim.sensors['front'], 0)
+        ray_front.set_data(fx, fy)
+        lx, ly = get_ray_coords(sim.sensors['left'], 90)
+        ray_left.set_data(lx, ly)
+        rx, ry = get_ray_coords(sim.sensors['right'], -90)
+        ray_right.set_data(rx, ry)
+
+        lx_lim, ly_lim = get_ray_coords(DEAD_CORNER_DIST, 90)
+        limit_left.set_data(lx_lim, ly_lim)
+        rx_lim, ry_lim = get_ray_coords(DEAD_CORNER_DIST, -90)
+        limit_right.set_data(rx_lim, ry_lim)
     
-    status_msg = (
-        f"State: {sim.state}\n" #display current state
-        f"Type: {sim.collision_type}\n" # display collision type
-        f"Front: {int(sim.sensors['front'])}" #display front sonar distance
-        f" | Left: {int(sim.sensors['left'])}" #display left sonar distance
-        f" | Right: {int(sim.sensors['right'])}" #display right sonar distance
-    )
-    status_text.set_text(status_msg)
-    return boat_dot, boat_dir, ray_front, ray_left, ray_right, limit_left, limit_right, status_text
-
-ani = animation.FuncAnimation(fig, animate, frames=200, interval=40, blit=True)
-plt.show()
\ No newline at end of file
+        status_msg = (
+            f"State: {sim.state}\n" #display current state
+            f"Type: {sim.collision_type}\n" # display collision type
+            f"Front: {int(sim.sensors['front'])}" #display front sonar distance
+            f" | Left: {int(sim.sensors['left'])}" #display left sonar distance
+            f" | Right: {int(sim.sensors['right'])}" #display right sonar distance
+        )
+        status_text.set_text(status_msg)
+        return boat_dot, boat_dir, ray_front, ray_left, ray_right, limit_left, limit_right, status_text
+
+    ani = animation.FuncAnimation(fig, animate, frames=200, interval=40, blit=True)
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
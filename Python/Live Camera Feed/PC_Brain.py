@@ -1,10 +1,18 @@
 ﻿import asyncio
+import os, sys, time
 import cv2
 import imagezmq
 import numpy as np
 import requests
-from livekit import rtc
-from ultralytics import YOLO
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "openVino CPU"))
+from detection_engine import create_engine
+from hybrid_tracker import HybridTracker
+from roi_detector import RoiDetector, ROI_IMGSZ
+from input_scheduler import AdaptiveEngine
+from tiled_detector import TiledDetector
+from steering import SteeringEstimator
+from pool_region import with_pool_region
 
 # --- CONFIGURATION ---
 # 1. LIVEKIT SETTINGS (Masquerading as the Raspberry Pi)
@@ -12,53 +20,127 @@ ROOM_URL = "wss://pbrobot-ir91vwzj.livekit.cloud"
 # We use 'identity=raspberry' so the dashboard thinks this IS the robot
 TOKEN_URL = "https://pbrobot.onrender.com/getToken?identity=raspberry&roomName=pool"
 
-# 2. CONTROL SETTINGS
-model = YOLO("yolo11n.pt")
+# 2. DETECTOR SETTINGS
+# "ultralytics", "openvino", "onnxruntime", or "auto" (fastest from `detection_engine.py bench`)
+DETECTOR_BACKEND = os.environ.get("DETECTOR_BACKEND", "auto")
+# Same input size / confidence as the model.track() call this replaced (ultralytics defaults),
+# not detection_engine's 416 / 0.30, so recall on small, distant swimmers doesn't change
+DETECT_IMGSZ = 640
+DETECT_CONF = 0.25
+# "hybrid": detector every N frames + optical flow in between (N adapts to motion/CPU)
+# "full":   detector on every frame
+TRACKING_MODE = os.environ.get("TRACKING_MODE", "hybrid")
+# Once a person is locked, infer only a window around them at ROI_IMGSZ (full frame every few frames)
+ROI_INFERENCE = os.environ.get("ROI_INFERENCE", "1") == "1"
+# Full-frame input size follows LATENCY_TARGET_MS through input_scheduler.INPUT_SIZES
+ADAPTIVE_INPUT = os.environ.get("ADAPTIVE_INPUT", "1") == "1"
+# Full frame as overlapping 320 px tiles at the engine's own input size, for small, distant swimmers
+# (tiled_detector.py; costs several inferences per moving frame, replaces ADAPTIVE_INPUT when on)
+TILED_INFERENCE = os.environ.get("TILED_INFERENCE", "0") == "1"
+
+# 3. CONTROL SETTINGS
 TARGET_CLASS_ID = 0       # Person
 STOP_DISTANCE = 0.6       
 FORWARD_SPEED = 0.4       
 STEERING_SENSITIVITY = 0.7
+# Keep steering (and driving) on the predicted position this many seconds after the target is lost.
+# (0: stop and search as soon as it's gone)
+STEERING_COAST_S = float(os.environ.get("STEERING_COAST_S", "0"))
 
 # --- VIDEO PUBLISHER CLASS ---
-class ProcessedVideoSource(rtc.VideoSource):
-    def __init__(self):
-        super().__init__(640, 480)
-
-    def publish_frame(self, cv2_frame):
-        # Resize to standard resolution
-        frame = cv2.resize(cv2_frame, (640, 480))
-        # Convert BGR (OpenCV) -> YUV (LiveKit)
-        frame_yuv = cv2.cvtColor(frame, cv2.COLOR_BGR2YUV_I420)
-        
-        video_frame = rtc.VideoFrame(
-            width=640,
-            height=480,
-            data=frame_yuv.tobytes(),
-            type=rtc.VideoBufferType.I420,
-        )
-        self.capture_frame(video_frame)
+def make_video_source(rtc):
+    # Defined on demand so livekit is only imported once we actually stream
+    class ProcessedVideoSource(rtc.VideoSource):
+        def __init__(self):
+            super().__init__(640, 480)
+
+        def publish_frame(self, cv2_frame):
+            # Resize to standard resolution
+            frame = cv2.resize(cv2_frame, (640, 480))
+            # Convert BGR (OpenCV) -> YUV (LiveKit)
+            frame_yuv = cv2.cvtColor(frame, cv2.COLOR_BGR2YUV_I420)
+            
+            video_frame = rtc.VideoFrame(
+                width=640,
+                height=480,
+                data=frame_yuv.tobytes(),
+                type=rtc.VideoBufferType.I420,
+            )
+            self.capture_frame(video_frame)
+
+    return ProcessedVideoSource()
+
+def load_detector(steering):
+    """Build the detector and run a warm-up pass, so the first real frame is not the slow one."""
+    t0 = time.perf_counter()
+    if TILED_INFERENCE:
+        engine = TiledDetector(create_engine(DETECTOR_BACKEND, conf=DETECT_CONF))
+    elif ADAPTIVE_INPUT:
+        # starts at DETECT_IMGSZ and only steps down while LATENCY_TARGET_MS is missed
+        engine = AdaptiveEngine(lambda size: create_engine(DETECTOR_BACKEND, imgsz=size, conf=DETECT_CONF),
+                                start=DETECT_IMGSZ)
+    else:
+        engine = create_engine(DETECTOR_BACKEND, imgsz=DETECT_IMGSZ, conf=DETECT_CONF)
+    # Only look at the calibrated pool (`pool_region.py calibrate`): crop in, boxes outside dropped.
+    # Applied to the base engine, so the ROI and tracker layers never lock onto someone outside it.
+    engine = with_pool_region(engine)
+    if ROI_INFERENCE:
+        # crop around the person steering follows, not whoever overlaps or scores best
+        engine = RoiDetector(engine, create_engine(DETECTOR_BACKEND, imgsz=ROI_IMGSZ, conf=DETECT_CONF),
+                             target_class=TARGET_CLASS_ID, select=steering.select,
+                             region=getattr(engine, "region", None))
+    warm_s = engine.warmup()
+    print(f"✅ Detector ready: {engine.name} in {time.perf_counter() - t0:.1f}s (warm-up {warm_s:.2f}s)")
+    return engine
+
+def make_target_finder(detector, steering):
+    """frame -> box (x1, y1, x2, y2) of the person we follow, or None."""
+    if TRACKING_MODE == "hybrid":
+        # the tracker locks onto whoever steering.select picks on each detector frame
+        tracker = HybridTracker(detector, target_class=TARGET_CLASS_ID, select=steering.select)
+        return lambda frame: tracker.update(frame)[0]
+
+    def locked_target(frame):
+        boxes, scores, class_ids = detector.detect(frame)
+        i = steering.select(boxes, class_ids, frame.shape)
+        return None if i is None else boxes[i]
+    return locked_target
 
 async def main():
+    # Kalman-smoothed target, predicted forward by the capture -> command delay; its select()
+    # decides who the detector, tracker and steering all follow
+    steering = SteeringEstimator(sensitivity=STEERING_SENSITIVITY, target_class=TARGET_CLASS_ID,
+                                 coast_s=STEERING_COAST_S)
+    # Load + warm up the model in the background while we set up the network side
+    detector_task = asyncio.create_task(asyncio.to_thread(load_detector, steering))
+
     # --- SETUP ZMQ (Listen for Pi) ---
     image_hub = imagezmq.ImageHub()
-    print("🧠 Laptop Brain Listening for Pi on Port 5555...")
 
     # --- SETUP LIVEKIT (Connect to Dashboard) ---
     print("☁️ Connecting to LiveKit as 'raspberry'...")
+    room = None
+    video_source = None
     try:
+        from livekit import rtc
         resp = requests.get(TOKEN_URL)
         token = resp.json()["token"]
         room = rtc.Room()
         await room.connect(ROOM_URL, token)
         
         # Publish the video track
-        video_source = ProcessedVideoSource()
+        video_source = make_video_source(rtc)
         track = rtc.LocalVideoTrack.create_video_track("camera", video_source)
         await room.local_participant.publish_track(track)
         print("✅ Dashboard Stream Active! (Website will show YOLO view)")
     except Exception as e:
         print(f"⚠️ LiveKit Error (Continuing offline): {e}")
 
+    # Only answer the Pi once the detector is warm
+    detector = await detector_task
+    find_target = make_target_finder(detector, steering)
+    print("🧠 Laptop Brain Listening for Pi on Port 5555...")
+
     # --- MAIN LOOP ---
     try:
         while True:
@@ -76,39 +158,31 @@ async def main():
             command_text = "SEARCHING"
             color = (0, 0, 255) # Red
 
-            results = model.track(frame, persist=True, verbose=False)
+            target = find_target(frame)
+            aim = steering.update(target, frame.shape)
             
-            if results[0].boxes.id is not None:
-                boxes = results[0].boxes.xyxy.cpu().numpy()
-                class_ids = results[0].boxes.cls.int().cpu().numpy()
+            if aim is not None:
+                x1, y1, x2, y2 = aim.box
+                obj_center_x = int((x1 + x2) / 2)
+                obj_center_y = int((y1 + y2) / 2)
                 
-                for box, cls in zip(boxes, class_ids):
-                    if int(cls) != TARGET_CLASS_ID: continue
-
-                    x1, y1, x2, y2 = box
-                    obj_center_x = int((x1 + x2) / 2)
-                    obj_center_y = int((y1 + y2) / 2)
-                    obj_height = y2 - y1
-                    
-                    # Logic: Distance & Steering
-                    pixel_coverage = obj_height / height
-                    raw_error = (obj_center_x - center_x) / (width / 2)
-                    turn_val = max(-1.0, min(1.0, raw_error * STEERING_SENSITIVITY))
-
-                    if pixel_coverage > STOP_DISTANCE:
-                        command_text = "STOP (Arrived)"
-                        color = (0, 0, 255)
-                    else:
-                        throttle_val = FORWARD_SPEED
-                        command_text = "TRACKING"
-                        color = (0, 255, 0)
-
-                    # Draw Visuals (These will appear on Dashboard)
-                    cv2.rectangle(frame, (int(x1), int(y1)), (int(x2), int(y2)), color, 4)
-                    cv2.line(frame, (center_x, center_y), (obj_center_x, obj_center_y), color, 2)
-                    cv2.putText(frame, f"{command_text} T:{turn_val:.2f}", (int(x1), int(y1)-10), 
-                                cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
-                    break
+                # Logic: Distance & Steering (where the target will be when the command lands)
+                pixel_coverage = aim.coverage
+                turn_val = aim.turn
+
+                if pixel_coverage > STOP_DISTANCE:
+                    command_text = "STOP (Arrived)"
+                    color = (0, 0, 255)
+                else:
+                    throttle_val = FORWARD_SPEED
+                    command_text = "TRACKING"
+                    color = (0, 255, 0)
+
+                # Draw Visuals (These will appear on Dashboard)
+                cv2.rectangle(frame, (int(x1), int(y1)), (int(x2), int(y2)), color, 4)
+                cv2.line(frame, (center_x, center_y), (obj_center_x, obj_center_y), color, 2)
+                cv2.putText(frame, f"{command_text} T:{turn_val:.2f}", (int(x1), int(y1)-10), 
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
 
             # C. Send Command Back to Pi
             final_cmd = f"DIR {throttle_val:.3f} {turn_val:.3f}"
@@ -116,7 +190,8 @@ async def main():
             print(f"cmd: {final_cmd}")
 
             # D. Stream to Dashboard
-            video_source.publish_frame(frame)
+            if video_source is not None:
+                video_source.publish_frame(frame)
 
             # E. Show Locally
             cv2.imshow("Laptop Brain", frame)
@@ -126,7 +201,8 @@ async def main():
             await asyncio.sleep(0)
 
     finally:
-        await room.disconnect()
+        if room is not None:
+            await room.disconnect()
         cv2.destroyAllWindows()
 
 if __name__ == "__main__":
@@ -1,9 +1,14 @@
 
 import asyncio
+import os, sys
 import cv2
+import numpy as np
 from livekit import rtc
 import requests
-from ultralytics import solutions, YOLO
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "openVino CPU"))
+from batch_inference import BatchedInferenceService, ultralytics_batch_fn
+from input_scheduler import InputSizeScheduler
 
 # Get token from your API
 ROOM_URL = "wss://your-project.livekit.cloud"
@@ -11,7 +16,11 @@ ROOM_URL = "wss://your-project.livekit.cloud"
 # ?? Replace with your deployed API endpoint on Render (or local for testing)
 TOKEN_URL = "https://pbrobot.onrender.com/getToken?identity=raspberry&roomName=pool"
 
-input_model = YOLO ('yolo11n.pt')  # load a pretrained YOLOv11 nano model)
+# pretrained YOLOv11 nano model behind the shared batching service, so other
+# producers in this process can share the same model and batch with us.
+# Input size starts at 640 and steps down/up to hold LATENCY_TARGET_MS as CPU load changes.
+input_size = InputSizeScheduler(start=640)
+inference = BatchedInferenceService(ultralytics_batch_fn('yolo11n.pt', conf=0.5, scheduler=input_size))
 
 
 
@@ -30,7 +39,8 @@ class CameraStream(rtc.VideoSource):
             if not ret:
                 continue
 
-            results = input_model(frame, conf=0.5, device='cpu', imgsz=640)[0] # predict on the frame on model
+            # predict on the frame off the event loop; the service batches concurrent requests
+            results = await asyncio.wrap_future(inference.submit(frame))
             annotated = results.plot()  #annotate the frame
 
             frame = cv2.resize(annotated, (self.width, self.height))
@@ -52,6 +62,11 @@ class CameraStream(rtc.VideoSource):
 
 # --- Main Logic ---
 async def main():
+    # Warm up the model before we go live, so the first published frames aren't stalled
+    inference.start()
+    await asyncio.wrap_future(inference.submit(np.zeros((480, 640, 3), np.uint8)))
+    print("Detector ready")
+
     # Get token from backend
     resp = requests.get(TOKEN_URL)
     data = resp.json()
@@ -80,7 +95,10 @@ async def main():
     print("? Track publish request done:", pub.sid)
 
     # Start camera capture loop
-    await camera.run()
+    try:
+        await camera.run()
+    finally:
+        inference.stop()
 
 
 if __name__ == "__main__":
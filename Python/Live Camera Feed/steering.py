@@ -0,0 +1,156 @@
+# steering.py
+# Turn detections into a steering estimate that is consistent from frame to frame and already
+# accounts for the delay between the camera frame and the moment the DIR command reaches the motors.
+#
+#  - select(): pick the same person every frame (nearest to the prediction once locked, otherwise
+#    largest box / nearest to centre). HybridTracker and RoiDetector take it as their `select`, so
+#    the person they follow between detections is the one we steer towards
+#  - a constant-velocity Kalman filter on (centre x, centre y, height), in frame fractions
+#  - update(): filter the new box and predict it forward by the measured pipeline latency
+#
+# With the Pi's send-and-wait loop, the Pi grabs a new frame right after it gets a reply, so the time
+# between two of our replies is the capture -> command delay. That is what we measure and predict over.
+import time
+from collections import namedtuple
+
+import numpy as np
+
+TARGET_CLASS_ID = 0          # person
+SELECT_MODE = "largest"      # "largest" (nearest person) or "center" (nearest image centre)
+SENSITIVITY = 0.7
+ACCEL_NOISE = 2.0            # frame fractions / s^2: how hard the target can change speed
+MEAS_NOISE = 0.02            # frame fractions: box jitter of the detector
+REINIT_JUMP = 0.35           # a measurement this far from the prediction is a new target, not motion
+COAST_S = 0.0                # keep steering on the prediction this long after the target disappears (opt-in)
+EXTRA_LATENCY_S = 0.0        # serial + motor response on top of the measured loop delay
+MAX_LOOKAHEAD_S = 0.6        # never extrapolate further than this
+LATENCY_ALPHA = 0.2
+
+# turn in [-1, 1]; coverage = predicted box height / frame height; box = predicted box in pixels
+Aim = namedtuple("Aim", "turn coverage box measured")
+
+
+class ConstantVelocityKalman:
+    """State [cx, cy, h, vx, vy, vh]; measurements [cx, cy, h]."""
+
+    def __init__(self, z, accel_noise=ACCEL_NOISE, meas_noise=MEAS_NOISE):
+        self.q = accel_noise ** 2
+        self.R = np.eye(3) * meas_noise ** 2
+        self.x = np.r_[np.asarray(z, float), 0.0, 0.0, 0.0]
+        self.P = np.diag([meas_noise ** 2] * 3 + [1.0] * 3)   # position known, velocity not
+
+    def _F(self, dt):
+        F = np.eye(6)
+        F[:3, 3:] = np.eye(3) * dt
+        return F
+
+    def _Q(self, dt):
+        # white acceleration noise, per axis [[dt^4/4, dt^3/2], [dt^3/2, dt^2]]
+        Q = np.zeros((6, 6))
+        Q[:3, :3] = np.eye(3) * dt ** 4 / 4
+        Q[:3, 3:] = Q[3:, :3] = np.eye(3) * dt ** 3 / 2
+        Q[3:, 3:] = np.eye(3) * dt ** 2
+        return Q * self.q
+
+    def predict(self, dt):
+        F = self._F(dt)
+        self.x = F @ self.x
+        self.P = F @ self.P @ F.T + self._Q(dt)
+
+    def update(self, z):
+        y = np.asarray(z, float) - self.x[:3]
+        S = self.P[:3, :3] + self.R
+        K = self.P[:, :3] @ np.linalg.inv(S)
+        self.x = self.x + K @ y
+        self.P = self.P - K @ self.P[:3, :]   # (I - K H) P, H picks the first three states
+
+    def ahead(self, dt):
+        """State dt seconds from now, without touching the filter."""
+        return self._F(dt) @ self.x
+
+
+class SteeringEstimator:
+    """
+    aim = steering.update(box, frame.shape)   # box x1,y1,x2,y2 or None; returns Aim or None
+
+    The box's aspect ratio is kept from the latest measurement; only centre and height are filtered.
+    """
+
+    def __init__(self, sensitivity=SENSITIVITY, mode=SELECT_MODE, target_class=TARGET_CLASS_ID,
+                 extra_latency_s=EXTRA_LATENCY_S, coast_s=COAST_S):
+        self.sensitivity = sensitivity
+        self.mode = mode
+        self.target_class = target_class
+        self.extra_latency_s = extra_latency_s
+        self.coast_s = coast_s
+
+        self.kf = None
+        self.aspect = 0.5          # width / height of the last measured box
+        self.latency_s = None      # EMA of the time between updates
+        self._last_t = None
+        self._last_seen = None
+
+    # ---- target selection ----
+    def select(self, boxes, class_ids, frame_shape, now=None):
+        """
+        Index of the box to follow among one frame's detections, or None. Doesn't change any state.
+        `now` is the frame's time on update()'s clock (default: now).
+        """
+        cand = np.flatnonzero(np.asarray(class_ids) == self.target_class)
+        if not len(cand):
+            return None
+        boxes = np.asarray(boxes, float)
+        h, w = frame_shape[:2]
+        centres = np.c_[(boxes[cand, 0] + boxes[cand, 2]) / (2 * w), (boxes[cand, 1] + boxes[cand, 3]) / (2 * h)]
+        if self.kf is not None:
+            # locked: stay on whoever is nearest to where we expect the target to be now, i.e. the
+            # filtered state carried forward from the last update to this frame
+            now = time.perf_counter() if now is None else now
+            dt = min(MAX_LOOKAHEAD_S, max(0.0, now - self._last_t))
+            d = np.linalg.norm(centres - self.kf.ahead(dt)[:2], axis=1)
+            if d.min() < REINIT_JUMP:
+                return int(cand[d.argmin()])
+        if self.mode == "center":
+            return int(cand[np.linalg.norm(centres - 0.5, axis=1).argmin()])
+        area = (boxes[cand, 2] - boxes[cand, 0]) * (boxes[cand, 3] - boxes[cand, 1])
+        return int(cand[area.argmax()])
+
+    # ---- filtering + latency compensation ----
+    def update(self, box, frame_shape, now=None):
+        now = time.perf_counter() if now is None else now
+        h, w = frame_shape[:2]
+        dt = 0.0 if self._last_t is None else now - self._last_t
+        if self._last_t is not None:
+            self.latency_s = dt if self.latency_s is None else (1 - LATENCY_ALPHA) * self.latency_s + LATENCY_ALPHA * dt
+        self._last_t = now
+
+        if box is not None:
+            x1, y1, x2, y2 = box
+            z = ((x1 + x2) / (2 * w), (y1 + y2) / (2 * h), (y2 - y1) / h)
+            self.aspect = (x2 - x1) / max(1e-6, y2 - y1) * h / w
+            if self.kf is None:
+                self.kf = ConstantVelocityKalman(z)
+            else:
+                self.kf.predict(dt)
+                if np.hypot(z[0] - self.kf.x[0], z[1] - self.kf.x[1]) > REINIT_JUMP:
+                    self.kf = ConstantVelocityKalman(z)   # someone else: don't blend two people
+                else:
+                    self.kf.update(z)
+            self._last_seen = now
+        elif self.kf is not None and now - self._last_seen <= self.coast_s:
+            self.kf.predict(dt)                           # coast on the prediction for a moment
+        else:
+            self.reset()
+            return None
+
+        lookahead = min(MAX_LOOKAHEAD_S, (self.latency_s or 0.0) + self.extra_latency_s)
+        cx, cy, bh = self.kf.ahead(lookahead)[:3]
+        cx, cy, bh = float(np.clip(cx, 0, 1)), float(np.clip(cy, 0, 1)), float(max(bh, 0.0))
+        turn = max(-1.0, min(1.0, (cx - 0.5) / 0.5 * self.sensitivity))
+        bw = bh * self.aspect
+        pbox = ((cx - bw / 2) * w, (cy - bh / 2) * h, (cx + bw / 2) * w, (cy + bh / 2) * h)
+        return Aim(turn, bh, pbox, box is not None)
+
+    def reset(self):
+        self.kf = None
+        self._last_seen = None
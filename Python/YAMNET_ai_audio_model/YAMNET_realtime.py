@@ -1,78 +1,42 @@
-import pyaudio, numpy as np
-from collections import deque
-import tensorflow as tf
-import tensorflow_hub as hub
-import csv
-import noisereduce as nr
+from audio_ring import RATE, CHUNK, WIN_CHUNKS, HOP_CHUNKS
+from audio_capture import AudioCapture
+from audio_pipeline import AudioPipeline
+from audio_events import EventAlerter
+from yamnet_model import load_classifier
 
 print("Code Starting from here -->", "\n")
 ##model set up part
-#download the model
-model = hub.load('https://www.kaggle.com/models/google/yamnet/TensorFlow2/yamnet/1')
-
-#get the class map (labels) path
-class_map_path = model.class_map_path().numpy() 
-
-#Load and return the list of all class labels from provided CSV file path
-def class_names_from_csv(class_map_csv_text):
-  class_names = []
-  with tf.io.gfile.GFile(class_map_csv_text) as csvfile:  # Open the CSV file with given path
-    reader = csv.DictReader(csvfile)
-    for row in reader:                                            # Iterate through each row in the CSV file
-      class_names.append(row['display_name'])   #append the display_name column value to class_names list
-
-  return class_names
-
-class_map_path = model.class_map_path().numpy()
-class_names = class_names_from_csv(class_map_path)  #This list contains all 521 class labels used by YAMNet
+# load YAMNet from the local files in models/ (run `python yamnet_model.py fetch` once);
+# backend = $YAMNET_BACKEND: "tflite", "saved_model", "tflite_patches" or "auto"
+classifier = load_classifier()
+print(f"YAMNet backend: {classifier.name}")
 
 ##audio input set up part
-# audio stream parameters
-RATE = 16000
-CHUNK = 320            # 20 ms
-WIN_CHUNKS = 48        # 0.96 s
-HOP_CHUNKS = 24        # 0.48 s
-
-
-# open PyAudio stream at 16 kHz mono, continuous read on microphone input
-stream = pyaudio.PyAudio().open(format=pyaudio.paInt16,
-                                  channels=1,
-                                  rate=RATE,
-                                  input=True,
-                                  frames_per_buffer=CHUNK)
-# buffer to hold audio chunks
-buf = deque(maxlen=WIN_CHUNKS)
-
-# counter for hop size
-hop_counter = 0
-
-# continuous read loop
+# audio stream parameters (RATE, CHUNK, WIN_CHUNKS, HOP_CHUNKS) live in audio_ring.py
+
+# PyAudio callback thread fills a float32 ring buffer (audio_ring.py); this loop only runs inference.
+# If inference takes longer than a hop, whole hops are dropped (DROP_POLICY in audio_capture.py), not audio.
+capture = AudioCapture(RATE, CHUNK, WIN_CHUNKS * CHUNK, HOP_CHUNKS * CHUNK).start()
+# per hop (audio_pipeline.py): streaming denoise -> log-mel frames -> energy gate -> YAMNet
+# -> splash / scream / shout as rate-limited PostAlertToDb.send_alert calls.
+# audio_replay.py runs the same pipeline on WAV files.
+pipeline = AudioPipeline(classifier, WIN_CHUNKS * CHUNK, HOP_CHUNKS * CHUNK, alerter=EventAlerter())
+REPORT_EVERY_HOPS = 125   # ~1 min
+
+# inference loop
 while True:
-    data = stream.read(CHUNK)                 # bytes
-    buf.append(np.frombuffer(data, np.int16)) # int16 array
-    hop_counter += 1
-
-    if len(buf) == WIN_CHUNKS and hop_counter >= HOP_CHUNKS:
-        hop_counter = 0
-        win = np.concatenate(list(buf))             # int16, length 15360
-        wav = (win.astype(np.float64) / 32768.0)    # convert to float64  and normalize to range of [-1, 1]
-        print("recorded clip info: ", "shape: ", wav.shape, "type: ", wav.dtype)
-        print("Type:", type(wav))
-
-        # feed wav to YAMNet from here
-        # --- Apply noise reduction ---
-        clean_signal = nr.reduce_noise(y=wav, 
-                               sr=16000, 
-                               stationary=False)
-        # --------------------------------
-
-        # Run the model, get scores, embeddings, and spectrogram
-        scores, embeddings, spectrogram = model(clean_signal)  
-        scores_np = scores.numpy()  
-        spectrogram_np = spectrogram.numpy()
-        inferred_class = class_names[scores_np.mean(axis=0).argmax()] #get the class with highest mean score of all frames
-        # get top 5 classes with highest mean scores
-        top_five_indices = scores_np.mean(axis=0).argsort()[-5:][::-1]
-        print(f'The main sound is: {inferred_class}')
-        print(f'Top 5 sounds are: {[class_names[i] for i in top_five_indices]}')
-
+    wav = capture.get(timeout=1.0)            # float32, length 15360, valid until the next get()
+    if wav is None:
+        print("No audio for 1 s:", capture.stats())
+        continue
+
+    res = pipeline.process(wav, capture.new_samples)
+    if pipeline.hops % REPORT_EVERY_HOPS == 0:
+        print(f"model duty cycle: {100 * pipeline.duty_cycle:.0f}% of {pipeline.hops} hops, capture: {capture.stats()}")
+    if not res.ran:
+        continue   # quiet: nothing for YAMNet to hear
+
+    print(f'The main sound is: {res.label}')
+    print(f'Top 5 sounds are: {res.top5}')
+    if capture.dropped_hops or capture.overflows:
+        print("capture:", capture.stats())
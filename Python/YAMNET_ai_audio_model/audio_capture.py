@@ -0,0 +1,130 @@
+# audio_capture.py
+# Microphone capture decoupled from inference. PortAudio calls _on_audio() on its own thread for
+# every 20 ms chunk; the callback only writes into the AudioRingBuffer and, every hop, copies the
+# window into a free slot of a small preallocated pool. The inference loop calls get() and works on
+# whatever window it is handed, however long that takes - capture never waits for it.
+#
+# When inference falls behind, hops are dropped instead of audio:
+#   "latest"  get() returns the newest window and drops the ones it skipped (lowest latency)
+#   "fifo"    get() returns windows in order; with QUEUE_HOPS already waiting the oldest is dropped
+import threading
+from collections import deque
+
+import numpy as np
+
+from audio_ring import AudioRingBuffer, RATE, CHUNK, WIN_CHUNKS, HOP_CHUNKS
+
+DROP_POLICY = "latest"
+QUEUE_HOPS = 2            # windows that may wait for the consumer
+# PortAudio callback status flags (pyaudio.paInputUnderflow / paInputOverflow)
+PA_INPUT_UNDERFLOW = 0x1
+PA_INPUT_OVERFLOW = 0x2
+PA_CONTINUE = 0
+
+
+class AudioCapture:
+    """
+    capture = AudioCapture(); capture.start()
+    while True:
+        wav = capture.get(timeout=1.0)     # float32 window or None; valid until the next get()
+    """
+
+    def __init__(self, rate=RATE, chunk=CHUNK, window=WIN_CHUNKS * CHUNK, hop=HOP_CHUNKS * CHUNK,
+                 policy=DROP_POLICY, queue_hops=QUEUE_HOPS):
+        if policy not in ("latest", "fifo"):
+            raise ValueError(f"policy must be 'latest' or 'fifo', not {policy!r}")
+        self.rate = rate
+        self.chunk = chunk
+        self.policy = policy
+        self.queue_hops = queue_hops
+        self.ring = AudioRingBuffer(window, hop)
+        self._slots = [np.empty(window, np.float32) for _ in range(queue_hops + 1)]   # +1: held by the consumer
+        self._free = list(range(len(self._slots)))
+        self._ready = deque()          # slot indices, oldest first
+        self._held = None              # slot the consumer is working on
+        self._slot_hop = [0] * len(self._slots)   # hop number each slot's window was published at
+        self.hop_index = None          # hop number (1-based) of the last window get() returned
+        self.new_samples = 0           # samples in the last get() window that the one before didn't have
+        self._cond = threading.Condition()
+        self._pa = None
+        self._stream = None
+        # stats
+        self.hops = 0                  # windows produced by the callback
+        self.dropped_hops = 0          # windows never handed to the consumer
+        self.overflows = 0             # PortAudio lost input (the callback itself was too slow)
+        self.underruns = 0             # PortAudio padded input with silence
+        self.timeouts = 0              # get() calls that found no window in time
+
+    def start(self):
+        import pyaudio
+        self._pa = pyaudio.PyAudio()
+        self._stream = self._pa.open(format=pyaudio.paInt16, channels=1, rate=self.rate, input=True,
+                                     frames_per_buffer=self.chunk, stream_callback=self._on_audio)
+        self._stream.start_stream()
+        return self
+
+    def stop(self):
+        if self._stream is not None:
+            self._stream.stop_stream()
+            self._stream.close()
+            self._stream = None
+        if self._pa is not None:
+            self._pa.terminate()
+            self._pa = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ---- producer: PortAudio thread ----
+    def _on_audio(self, in_data, frame_count, time_info, status):
+        if status & PA_INPUT_OVERFLOW:
+            self.overflows += 1
+        if status & PA_INPUT_UNDERFLOW:
+            self.underruns += 1
+        if self.ring.push(memoryview(in_data).cast("h")):
+            self._publish()
+        return None, PA_CONTINUE
+
+    def _publish(self):
+        with self._cond:
+            self.hops += 1
+            if len(self._ready) < self.queue_hops:
+                slot = self._free.pop()
+            else:                       # consumer is behind by queue_hops: recycle the oldest waiting window
+                slot = self._ready.popleft()
+                self.dropped_hops += 1
+            self.ring.window(out=self._slots[slot])   # scaled to float32 straight into the slot
+            self._slot_hop[slot] = self.hops
+            self._ready.append(slot)
+            self._cond.notify()
+
+    # ---- consumer: inference thread ----
+    def get(self, timeout=None):
+        """Next window per the drop policy, or None on timeout. The previous window is released."""
+        with self._cond:
+            if self._held is not None:
+                self._free.append(self._held)
+                self._held = None
+            if not self._cond.wait_for(lambda: self._ready, timeout):
+                self.timeouts += 1
+                return None
+            if self.policy == "latest":
+                while len(self._ready) > 1:
+                    self._free.append(self._ready.popleft())
+                    self.dropped_hops += 1
+            self._held = self._ready.popleft()
+            hop_no, window = self._slot_hop[self._held], self.ring.window_size
+            self.new_samples = window if self.hop_index is None else min(window, (hop_no - self.hop_index) * self.ring.hop)
+            self.hop_index = hop_no
+            return self._slots[self._held]
+
+    @property
+    def backlog(self):
+        return len(self._ready)
+
+    def stats(self):
+        return {"hops": self.hops, "dropped_hops": self.dropped_hops, "overflows": self.overflows,
+                "underruns": self.underruns, "timeouts": self.timeouts}
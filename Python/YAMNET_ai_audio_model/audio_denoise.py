@@ -0,0 +1,220 @@
+# audio_denoise.py
+# Streaming spectral gating, a causal version of noisereduce's non-stationary mode.
+# nr.reduce_noise(stationary=False) redoes the STFT and the noise estimate over the whole 0.96 s
+# window every 0.48 s hop, so half of every call repeats the previous one. StreamingDenoiser keeps
+# its STFT overlap, running noise profile and mask state between calls and only processes new samples.
+#
+# Per STFT frame:  noise  = exponential average of |X| with time constant NOISE_TIME_CONSTANT_S, but
+#                           SIGNAL_TIME_CONSTANT_S on bins above THRESH x noise, so a sustained event
+#                           isn't learned as noise within seconds (a lasting background rise still is)
+#                  mask   = sigmoid(SLOPE * (|X| / noise - THRESH)), smoothed over time, then over
+#                           frequency; the smoothing can widen the mask but never lower it below the
+#                           time-smoothed value, so narrowband sounds (a whistle, a tone) keep their bins
+#                  output = X * (1 - PROP_DECREASE * (1 - mask)), overlap-added
+# The same knobs as noisereduce, but the noise average and mask smoothing look backwards only. Output
+# is delayed by N_FFT - STFT_HOP samples (24 ms).
+#
+#   python audio_denoise.py [recording.wav]    quality vs noisereduce (if installed) + CPU per hop
+import sys, time, wave
+
+import numpy as np
+
+from audio_ring import AudioRingBuffer, RATE, CHUNK, WIN_CHUNKS, HOP_CHUNKS
+
+N_FFT = 512                   # 32 ms frames
+STFT_HOP = 128                # 8 ms, 75 % overlap
+NOISE_TIME_CONSTANT_S = 2.0   # noisereduce's time_constant_s
+SIGNAL_TIME_CONSTANT_S = 20.0 # noise-estimate time constant on bins currently classed as signal
+THRESH = 2.0                  # noisereduce's thresh_n_mult_nonstationary
+SLOPE = 10.0                  # noisereduce's sigmoid_slope_nonstationary
+PROP_DECREASE = 1.0
+FREQ_SMOOTH_HZ = 500
+TIME_SMOOTH_MS = 50
+
+
+class StreamingDenoiser:
+    """
+    den = StreamingDenoiser()
+    out = den.process(samples)   # float32; len(out) is a multiple of STFT_HOP, delayed by N_FFT - STFT_HOP
+    """
+
+    def __init__(self, rate=RATE, n_fft=N_FFT, hop=STFT_HOP, time_constant_s=NOISE_TIME_CONSTANT_S,
+                 signal_time_constant_s=SIGNAL_TIME_CONSTANT_S, thresh=THRESH, slope=SLOPE,
+                 prop_decrease=PROP_DECREASE, freq_smooth_hz=FREQ_SMOOTH_HZ, time_smooth_ms=TIME_SMOOTH_MS):
+        self.n_fft = n_fft
+        self.hop = hop
+        self.thresh = thresh
+        self.slope = slope
+        self.prop_decrease = prop_decrease
+        self.window = (0.5 - 0.5 * np.cos(2 * np.pi * np.arange(n_fft) / n_fft)).astype(np.float32)   # periodic Hann
+        self.norm = np.float32(np.sum(self.window ** 2) / hop)    # analysis x synthesis window overlap sum
+        frame_s = hop / rate
+        self.noise_decay = np.exp(-frame_s / time_constant_s)
+        self.signal_decay = np.exp(-frame_s / signal_time_constant_s)
+        self.settle_frames = int(round(time_constant_s / frame_s))   # plain average until the floor has settled
+        self.mask_decay = np.exp(-frame_s / (time_smooth_ms / 1000.0))
+        self.freq_half = max(0, int(round(freq_smooth_hz / (rate / n_fft) / 2)))
+
+        self._in = np.zeros(n_fft - hop, np.float32)     # input not yet covered by a full frame
+        self._ola = np.zeros(n_fft - hop, np.float32)    # overlap-add tail still waiting for later frames
+        self._noise = None                               # running |X| per bin
+        self._frames = 0                                 # STFT frames seen
+        self._mask = None                                # last frame's smoothed mask
+
+    def process(self, samples):
+        buf = np.concatenate((self._in, np.asarray(samples, np.float32)))
+        n_frames = (len(buf) - self.n_fft) // self.hop + 1 if len(buf) >= self.n_fft else 0
+        if n_frames <= 0:
+            self._in = buf
+            return np.zeros(0, np.float32)
+        idx = np.arange(self.n_fft)[None, :] + self.hop * np.arange(n_frames)[:, None]
+        spec = np.fft.rfft(buf[idx] * self.window, axis=1)
+        gain = self._gain(np.abs(spec))
+        frames = np.fft.irfft(spec * gain, n=self.n_fft, axis=1).astype(np.float32) * self.window
+
+        out_len = n_frames * self.hop
+        acc = np.zeros(out_len + self.n_fft - self.hop, np.float32)
+        acc[:len(self._ola)] = self._ola
+        for i in range(self.n_fft // self.hop):          # overlap-add all frames in n_fft/hop strided adds
+            part = frames[:, i * self.hop:(i + 1) * self.hop].reshape(-1)
+            acc[i * self.hop:i * self.hop + len(part)] += part
+        self._ola = acc[out_len:].copy()
+        self._in = buf[out_len:].copy()
+        return acc[:out_len] / self.norm
+
+    def _gain(self, mag):
+        """Per-frame gains: the noise floor and mask smoothing are recursive in time, the rest is batched."""
+        noise = np.empty_like(mag)
+        prev = mag[0] if self._noise is None else self._noise
+        a, a_sig = self.noise_decay, self.signal_decay
+        for t in range(len(mag)):
+            # bins well above the floor are (probably) signal: let them pull the floor up only slowly.
+            # Not before the floor has settled, or bins that started low would take ages to catch up.
+            d = np.where(mag[t] > self.thresh * prev, a_sig, a) if self._frames + t >= self.settle_frames else a
+            prev = d * prev + (1 - d) * mag[t]
+            noise[t] = prev
+        self._noise = prev
+        self._frames += len(mag)
+        with np.errstate(over="ignore"):
+            mask = 1.0 / (1.0 + np.exp(-self.slope * (mag / np.maximum(noise, 1e-10) - self.thresh)))
+        # time first, so the max below can't keep a lone noise peak (musical noise) at full strength
+        prev = mask[0] if self._mask is None else self._mask
+        b = self.mask_decay
+        for t in range(len(mask)):
+            prev = b * prev + (1 - b) * mask[t]
+            mask[t] = prev
+        self._mask = prev
+        smooth = _smooth_freq(_smooth_freq(mask, self.freq_half // 2), self.freq_half // 2)   # two boxes = triangle, like noisereduce
+        np.maximum(mask, smooth, out=mask)
+        return 1.0 - self.prop_decrease * (1.0 - mask)
+
+    @property
+    def delay(self):
+        return self.n_fft - self.hop
+
+
+def _smooth_freq(mask, half):
+    """Moving average over +-half bins (edges averaged over what exists)."""
+    if half <= 0:
+        return mask
+    c = np.cumsum(np.pad(mask, ((0, 0), (half + 1, half)), mode="constant"), axis=1)
+    ones = np.cumsum(np.pad(np.ones(mask.shape[1]), (half + 1, half)))
+    k = 2 * half + 1
+    return (c[:, k:] - c[:, :-k]) / (ones[k:] - ones[:-k])
+
+
+class WindowDenoiser:
+    """
+    Denoised model windows from overlapping input windows, doing STFT work on the new samples only.
+    clean = den(wav, new_samples)    # new_samples: how much of wav wasn't in the previous call (None = hop)
+    """
+
+    def __init__(self, window=WIN_CHUNKS * CHUNK, hop=HOP_CHUNKS * CHUNK, **kwargs):
+        self.hop = hop
+        self.denoiser = StreamingDenoiser(**kwargs)
+        self.clean = AudioRingBuffer(window, hop, np.float32)
+        self._started = False
+
+    def __call__(self, wav, new_samples=None):
+        new = len(wav) if not self._started else min(len(wav), new_samples or self.hop)
+        self._started = True
+        self.clean.push(self.denoiser.process(wav[-new:]))
+        return self.clean.window()
+
+
+# ---- quality + CPU comparison ----
+def read_wav(path, rate=RATE):
+    """Mono float32 in [-1, 1) at `rate` (linear resampling; good enough for a comparison)."""
+    with wave.open(path, "rb") as w:
+        sr, ch, width = w.getframerate(), w.getnchannels(), w.getsampwidth()
+        raw = w.readframes(w.getnframes())
+    dtype = {1: np.uint8, 2: np.int16, 4: np.int32}[width]
+    x = np.frombuffer(raw, dtype).reshape(-1, ch).mean(axis=1)
+    x = (x - 128) / 128.0 if width == 1 else x / float(np.iinfo(dtype).max + 1)
+    if sr != rate:
+        x = np.interp(np.arange(0, len(x) * rate / sr) * sr / rate, np.arange(len(x)), x)
+    return x.astype(np.float32)
+
+
+def _synthetic(seconds=30, rate=RATE, seed=0):
+    """Pump-like hum + hiss, with voice-like harmonic bursts (200 Hz fundamental) standing in for events."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(seconds * rate) / rate
+    x = 0.05 * rng.standard_normal(len(t)) + 0.03 * np.sin(2 * np.pi * 100 * t)
+    bursts = (np.sin(2 * np.pi * 0.25 * t) > 0.9).astype(float)
+    x += 0.3 * bursts * sum(np.sin(2 * np.pi * 200 * k * t) / k for k in range(1, 16))
+    return x.astype(np.float32)
+
+
+def _windows(x, window=WIN_CHUNKS * CHUNK, hop=HOP_CHUNKS * CHUNK):
+    return [x[s - window:s] for s in range(window, len(x) + 1, hop)]
+
+
+def _frame_db(x, frame=CHUNK):
+    n = len(x) // frame
+    return 10 * np.log10(np.mean(x[:n * frame].reshape(n, frame) ** 2, axis=1) + 1e-12)
+
+
+def compare(audio, rate=RATE):
+    """
+    Per hop: ms for noisereduce on the full window vs the streaming denoiser on the new hop.
+    Quality on the stream: noise reduction (quietest 20 % of 20 ms frames) and level change of the
+    loudest 20 %, plus the log-spectral distance between the two outputs where noisereduce is present.
+    """
+    wins = _windows(audio)
+    results = {}
+
+    den = WindowDenoiser()
+    t0 = time.perf_counter()
+    stream = [den(w).copy() for w in wins]
+    results["streaming"] = ((time.perf_counter() - t0) * 1000.0 / len(wins), stream)
+    try:
+        import noisereduce as nr
+        t0 = time.perf_counter()
+        full = [nr.reduce_noise(y=w, sr=rate, stationary=False) for w in wins]
+        results["noisereduce"] = ((time.perf_counter() - t0) * 1000.0 / len(wins), full)
+    except ImportError:
+        print("(noisereduce not installed: CPU/quality for the streaming denoiser only)")
+
+    hop = HOP_CHUNKS * CHUNK
+    start = WIN_CHUNKS * CHUNK - hop                  # the newest hop of the first window starts here
+    ref = _frame_db(audio[start:start + len(wins) * hop])
+    quiet, loud = ref <= np.percentile(ref, 20), ref >= np.percentile(ref, 80)
+    print(f"{'denoiser':>12} | {'ms/hop':>6} | {'noise -dB':>9} | {'events dB':>9}")
+    outs = {}
+    for name, (ms, ws) in results.items():
+        y = np.concatenate([w[-hop:] for w in ws])    # the newest hop of each window, back to back
+        if name == "streaming":
+            y = np.r_[y[den.denoiser.delay:], np.zeros(den.denoiser.delay, np.float32)]   # undo the STFT delay
+        outs[name] = y
+        d = _frame_db(y)[:len(ref)]
+        print(f"{name:>12} | {ms:6.2f} | {np.mean(ref[quiet] - d[quiet]):9.1f} | {np.mean(d[loud] - ref[loud]):+9.1f}")
+    if len(outs) == 2:
+        a, b = (np.abs(np.fft.rfft(o[:len(o) // N_FFT * N_FFT].reshape(-1, N_FFT), axis=1)) + 1e-6 for o in outs.values())
+        lsd = np.mean(np.sqrt(np.mean((20 * np.log10(a / b)) ** 2, axis=1)))
+        print(f"log-spectral distance streaming vs noisereduce: {lsd:.1f} dB")
+    return {k: v[0] for k, v in results.items()}
+
+
+if __name__ == "__main__":
+    compare(read_wav(sys.argv[1]) if len(sys.argv) > 1 else _synthetic())
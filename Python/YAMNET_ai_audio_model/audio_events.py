@@ -0,0 +1,150 @@
+# audio_events.py
+# Most of the time a pool is quiet and YAMNet would spend every hop classifying silence.
+#  - EnergyGate looks at each 20 ms chunk's RMS level against a slowly tracked noise floor and only
+#    lets a hop through to the model when something rose above it (and for one window afterwards,
+#    so an event is seen in both windows that contain it). Loud chunks still pull the floor up, only
+#    much more slowly, so a lasting rise in background noise (a pump starting) closes the gate again
+#    after several seconds instead of holding it open for good.
+#  - EventAlerter maps YAMNet classes of interest (splash, scream, shout) to alerts and posts them
+#    through Alert/PostAlertToDb.send_alert, at most once per ALERT_COOLDOWN_S per alert type, on a
+#    background thread so a slow backend never stalls audio.
+import os, sys, time, threading
+
+import numpy as np
+
+from audio_ring import CHUNK, WIN_CHUNKS
+
+GATE_MARGIN_DB = 8.0        # a chunk this far above the noise floor opens the gate
+GATE_MIN_DB = -60.0         # never open for chunks quieter than this (dBFS)
+FLOOR_ALPHA = 0.02          # noise floor update rate per quiet chunk
+FLOOR_RISE_ALPHA = 0.002    # ... and per loud chunk (~10 s time constant at 50 chunks/s)
+HANGOVER_CHUNKS = WIN_CHUNKS
+
+DEVICE_ID = os.environ.get("AQUAGUARD_DEVICE_ID", "68cc90c7ef0763dddf1a5e9d")
+SCORE_TH = 0.3              # mean YAMNet score over the window's frames
+ALERT_COOLDOWN_S = 60.0
+# alert type -> (YAMNet display names, severity)
+EVENTS = {
+    "splash": (("Splash, splatter", "Slosh"), "warning"),
+    "scream": (("Screaming", "Crying, sobbing", "Wail, moan"), "critical"),
+    "shout": (("Shout", "Yell", "Children shouting"), "warning"),
+}
+
+
+class EnergyGate:
+    """
+    open = gate.update(new_samples)   # float32 audio since the last call; True if the model should run
+    """
+
+    def __init__(self, chunk=CHUNK, margin_db=GATE_MARGIN_DB, min_db=GATE_MIN_DB,
+                 alpha=FLOOR_ALPHA, rise_alpha=FLOOR_RISE_ALPHA, hangover=HANGOVER_CHUNKS):
+        self.chunk = chunk
+        self.margin_db = margin_db
+        self.min_db = min_db
+        self.alpha = alpha
+        self.rise_alpha = rise_alpha
+        self.hangover = hangover
+        self.floor_db = None
+        self._quiet_for = hangover        # chunks since the last loud one
+        # stats
+        self.hops = 0
+        self.opened = 0
+
+    def update(self, samples):
+        n = len(samples) // self.chunk
+        if n:
+            chunks = np.asarray(samples[-n * self.chunk:], np.float32).reshape(n, self.chunk)
+            db = 10 * np.log10(np.mean(chunks * chunks, axis=1) + 1e-12)
+            for level in db:             # a handful of chunks per hop; the floor is recursive
+                self._chunk(level)
+        self.hops += 1
+        is_open = self._quiet_for < self.hangover
+        self.opened += is_open
+        return is_open
+
+    def _chunk(self, level):
+        if self.floor_db is None:
+            self.floor_db = level
+        loud = level > max(self.floor_db + self.margin_db, self.min_db)
+        if loud:
+            self._quiet_for = 0
+            self.floor_db += self.rise_alpha * (level - self.floor_db)   # an event barely moves it, a new background does
+        else:
+            self._quiet_for += 1
+            self.floor_db += self.alpha * (level - self.floor_db)
+
+    @property
+    def duty_cycle(self):
+        """Fraction of hops that ran the model."""
+        return self.opened / max(1, self.hops)
+
+
+def _post_alert_sender():
+    """Alert/PostAlertToDb.send_alert, imported on first use (it pulls in requests)."""
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Alert"))
+    from PostAlertToDb import send_alert
+    return send_alert
+
+
+class EventAlerter:
+    """
+    alerts = alerter.check(scores, class_names)   # alert types fired this window (after rate limiting)
+    `send` defaults to PostAlertToDb.send_alert(device_id, alert_type, message, severity).
+    """
+
+    def __init__(self, send=None, device_id=DEVICE_ID, events=EVENTS, score_th=SCORE_TH,
+                 cooldown_s=ALERT_COOLDOWN_S, background=True):
+        self._send = send
+        self.device_id = device_id
+        self.events = events
+        self.score_th = score_th
+        self.cooldown_s = cooldown_s
+        self.background = background
+        self._last_sent = {}
+        self._index = None
+        # stats
+        self.detected = 0
+        self.sent = 0
+        self.suppressed = 0
+        self.failed = 0
+
+    def check(self, scores, class_names, now=None):
+        now = time.monotonic() if now is None else now
+        if self._index is None:
+            lookup = {name: i for i, name in enumerate(class_names)}
+            self._index = {kind: [lookup[n] for n in names if n in lookup] for kind, (names, _) in self.events.items()}
+        mean = np.asarray(scores).mean(axis=0)
+        fired = []
+        for kind, idx in self._index.items():
+            if not idx:
+                continue
+            best = idx[int(np.argmax(mean[idx]))]
+            if mean[best] < self.score_th:
+                continue
+            self.detected += 1
+            last = self._last_sent.get(kind)
+            if last is not None and now - last < self.cooldown_s:
+                self.suppressed += 1
+                continue
+            self._last_sent[kind] = now
+            fired.append(kind)
+            message = f"Heard {class_names[best].lower()} (score {mean[best]:.2f})"
+            self._post(kind, message, self.events[kind][1])
+        return fired
+
+    def _post(self, kind, message, severity):
+        if self.background:
+            threading.Thread(target=self._deliver, args=(kind, message, severity), daemon=True).start()
+        else:
+            self._deliver(kind, message, severity)
+
+    def _deliver(self, kind, message, severity):
+        try:
+            if self._send is None:
+                self._send = _post_alert_sender()
+            self._send(self.device_id, alert_type=kind, message=message, severity=severity)
+            self.sent += 1
+            print(f"🚨 Alert sent: {kind} - {message}")
+        except Exception as e:   # network/auth trouble must not take the audio loop down
+            self.failed += 1
+            print(f"❌ Error posting alert: {e}")
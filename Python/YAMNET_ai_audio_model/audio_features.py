@@ -0,0 +1,136 @@
+# audio_features.py
+# YAMNet's log-mel front end, computed incrementally. YAMNet turns every 0.96 s window into 96 STFT
+# frames (25 ms window, 10 ms hop) -> 64 mel bands -> log, then runs its backbone on that patch.
+# With a 0.48 s hop, half of those frames were already computed on the previous call.
+# LogMelFrontend only frames the new samples and keeps the last 96 frames as a rolling patch,
+# ready for a patch-input backbone (yamnet_model's "tflite_patches" backend).
+#
+# The constants and the mel matrix follow YAMNet's params.py / features.py (tf.signal.stft with
+# a periodic Hann window, tf.signal.linear_to_mel_weight_matrix, log(mel + 0.001)). Frames come
+# from the continuous stream, so the newest patch ends 15 ms (window - hop) before the newest sample
+# instead of zero-padding the end of the window like the full model does.
+#
+#   python audio_features.py     per-hop ms: full-window log-mel vs incremental
+import time
+
+import numpy as np
+
+from audio_ring import RATE, CHUNK, HOP_CHUNKS
+
+STFT_WINDOW = 400        # 25 ms
+STFT_HOP = 160           # 10 ms
+FFT_LENGTH = 512
+MEL_BANDS = 64
+MEL_MIN_HZ = 125.0
+MEL_MAX_HZ = 7500.0
+LOG_OFFSET = 0.001
+PATCH_FRAMES = 96        # 0.96 s
+
+
+def _hz_to_mel(hz):
+    return 1127.0 * np.log1p(np.asarray(hz, np.float64) / 700.0)
+
+
+def mel_matrix(rate=RATE, fft_length=FFT_LENGTH, bands=MEL_BANDS, lo=MEL_MIN_HZ, hi=MEL_MAX_HZ):
+    """[fft_length // 2 + 1, bands], same weights as tf.signal.linear_to_mel_weight_matrix (DC row is zero)."""
+    bins = fft_length // 2 + 1
+    spec_mel = _hz_to_mel(np.linspace(0.0, rate / 2.0, bins)[1:])[:, None]
+    edges = np.linspace(_hz_to_mel(lo), _hz_to_mel(hi), bands + 2)
+    lower, center, upper = edges[:-2], edges[1:-1], edges[2:]
+    w = np.maximum(0.0, np.minimum((spec_mel - lower) / (center - lower), (upper - spec_mel) / (upper - center)))
+    return np.vstack([np.zeros((1, bands)), w]).astype(np.float32)
+
+
+_WINDOW = (0.5 - 0.5 * np.cos(2 * np.pi * np.arange(STFT_WINDOW) / STFT_WINDOW)).astype(np.float32)
+_MEL = mel_matrix()
+
+
+def _frames_to_log_mel(frames):
+    mag = np.abs(np.fft.rfft(frames * _WINDOW, n=FFT_LENGTH, axis=1)).astype(np.float32)
+    return np.log(mag @ _MEL + LOG_OFFSET)
+
+
+def log_mel(waveform):
+    """[frames, 64] for a whole waveform (no padding): the reference the streaming version must match."""
+    waveform = np.asarray(waveform, np.float32)
+    n = (len(waveform) - STFT_WINDOW) // STFT_HOP + 1
+    if n <= 0:
+        return np.zeros((0, MEL_BANDS), np.float32)
+    idx = np.arange(STFT_WINDOW)[None, :] + STFT_HOP * np.arange(n)[:, None]
+    return _frames_to_log_mel(waveform[idx])
+
+
+class LogMelFrontend:
+    """
+    front = LogMelFrontend()
+    front.push(new_samples)         # frames only the new audio
+    patch = front.patch()           # [96, 64] float32 view, oldest frame first; valid until the next push()
+    """
+
+    def __init__(self, patch_frames=PATCH_FRAMES):
+        self.patch_frames = patch_frames
+        self._tail = np.zeros(0, np.float32)                          # samples not yet in a full frame
+        self._rows = np.zeros((2 * patch_frames, MEL_BANDS), np.float32)
+        self._rows[:] = np.log(LOG_OFFSET)                            # silence until real frames arrive
+        self._pos = patch_frames                                      # patch = rows[pos - P:pos]
+        self.frames = 0                                               # frames computed so far
+
+    def push(self, samples):
+        """Add samples; returns how many new frames they completed."""
+        buf = np.concatenate((self._tail, np.asarray(samples, np.float32)))
+        mel = log_mel(buf)
+        n = len(mel)
+        self._tail = buf[n * STFT_HOP:]
+        if n:
+            self._append(mel[-self.patch_frames:])
+            self.frames += n
+        return n
+
+    def _append(self, mel):
+        P, n = self.patch_frames, len(mel)
+        if self._pos + n > len(self._rows):        # out of room: slide the current patch to the front
+            self._rows[:P] = self._rows[self._pos - P:self._pos]
+            self._pos = P
+        self._rows[self._pos:self._pos + n] = mel
+        self._pos += n
+
+    def patch(self):
+        return self._rows[self._pos - self.patch_frames:self._pos]
+
+    @property
+    def ready(self):
+        return self.frames >= self.patch_frames
+
+
+def bench(seconds=60, repeats=3):
+    from audio_ring import WIN_CHUNKS
+    rng = np.random.default_rng(0)
+    audio = (0.1 * rng.standard_normal(seconds * RATE)).astype(np.float32)
+    window, hop = WIN_CHUNKS * CHUNK, HOP_CHUNKS * CHUNK
+    ends = range(window, len(audio) + 1, hop)
+
+    def full():
+        for e in ends:
+            log_mel(audio[e - window:e])
+
+    def incremental():
+        front = LogMelFrontend()
+        front.push(audio[:window - hop])
+        for e in ends:
+            front.push(audio[e - hop:e])
+            front.patch()
+
+    print(f"{'front end':>12} | ms/hop")
+    for name, fn in (("full window", full), ("incremental", incremental)):
+        best = min(_timed(fn) for _ in range(repeats))
+        print(f"{name:>12} | {best * 1000.0 / len(ends):6.3f}")
+
+
+def _timed(fn):
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    bench()
@@ -0,0 +1,73 @@
+# audio_pipeline.py
+# Everything YAMNET_realtime.py does with a window once AudioCapture hands it over: denoise ->
+# log-mel frames (patch backends) -> energy gate -> YAMNet -> alerts, with wall time per stage.
+# The live loop and audio_replay.py both drive this, so a replay measures the code that runs on the Pi.
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from audio_ring import CHUNK, WIN_CHUNKS, HOP_CHUNKS
+from audio_denoise import WindowDenoiser
+from audio_features import LogMelFrontend
+from audio_events import EnergyGate
+
+STAGES = ("denoise", "features", "gate", "model", "total")
+
+# ran: did YAMNet run this hop; label / top5: class names (None when it didn't); scores: mean per class
+HopResult = namedtuple("HopResult", "ran label top5 scores alerts")
+
+
+class AudioPipeline:
+    """
+    pipeline = AudioPipeline(classifier, alerter=EventAlerter())
+    res = pipeline.process(wav, capture.new_samples)
+    `classifier` is a yamnet_model classifier, or None to run the front end only.
+    """
+
+    def __init__(self, classifier, window=WIN_CHUNKS * CHUNK, hop=HOP_CHUNKS * CHUNK, gate=True, alerter=None):
+        self.classifier = classifier
+        self.class_names = classifier.class_names if classifier is not None else None
+        self.denoiser = WindowDenoiser(window, hop)
+        self.frontend = LogMelFrontend() if classifier is not None and classifier.takes_patches else None
+        self.gate = EnergyGate() if gate else None
+        self.alerter = alerter
+        self.timings = {stage: [] for stage in STAGES}   # ms per hop
+        self.hops = 0
+        self.gate_opens = 0
+        self.model_runs = 0
+
+    def process(self, wav, new_samples=None):
+        new_samples = new_samples or len(wav)
+        t0 = time.perf_counter()
+        clean = self.denoiser(wav, new_samples)
+        t1 = time.perf_counter()
+        if self.frontend is not None:
+            self.frontend.push(clean[-new_samples:])      # only the audio this window added
+        t2 = time.perf_counter()
+        is_open = self.gate.update(wav[-new_samples:]) if self.gate is not None else True
+        t3 = time.perf_counter()
+        self.gate_opens += is_open
+        result = HopResult(False, None, None, None, [])
+        if is_open and self.classifier is not None:
+            scores = self.classifier(self.frontend.patch()) if self.frontend is not None else self.classifier(clean)
+            mean = scores.mean(axis=0)
+            top5 = [self.class_names[i] for i in mean.argsort()[-5:][::-1]]
+            alerts = self.alerter.check(scores, self.class_names) if self.alerter is not None else []
+            result = HopResult(True, top5[0], top5, mean, alerts)
+            self.model_runs += 1
+        t4 = time.perf_counter()
+
+        self.hops += 1
+        for stage, dt in zip(STAGES, (t1 - t0, t2 - t1, t3 - t2, t4 - t3, t4 - t0)):
+            self.timings[stage].append(dt * 1000.0)
+        return result
+
+    @property
+    def duty_cycle(self):
+        return self.model_runs / max(1, self.hops)
+
+    def stage_percentiles(self, q=(50, 95, 99)):
+        """{stage: {"p50": ms, ...}} over every hop so far (stages that never ran are left out)."""
+        return {stage: {f"p{p}": float(np.percentile(ms, p)) for p in q}
+                for stage, ms in self.timings.items() if ms}
@@ -0,0 +1,144 @@
+# audio_replay.py
+# Stream WAV files through the live audio path without a sound card: each file is cut into the same
+# 20 ms int16 chunks PortAudio delivers and pushed through AudioCapture's callback, and the windows
+# it hands out go through AudioPipeline, exactly as in YAMNET_realtime.py.
+#
+#   python audio_replay.py rec1.wav rec2.wav             max speed, per-window labels + RTF + stage latency
+#   python audio_replay.py rec.wav --realtime            paced at 1x, with the live drop policy
+#   python audio_replay.py rec.wav --no-model            front end only (no TensorFlow needed)
+#   python audio_replay.py rec.wav --out replay.json     keep the results for a regression diff
+#
+# Several files are played back to back as one stream (denoiser and gate state carry over).
+# Alerts are printed, never posted, unless --post-alerts is given.
+import sys, json, time, argparse, threading
+
+import numpy as np
+
+from audio_ring import RATE, CHUNK, WIN_CHUNKS, HOP_CHUNKS
+from audio_capture import AudioCapture
+from audio_pipeline import AudioPipeline
+from audio_denoise import read_wav
+from audio_events import EventAlerter
+
+
+def _chunks(audio, chunk=CHUNK):
+    """float audio -> int16 byte chunks like PortAudio's (the last partial chunk is dropped, as live)."""
+    pcm = np.clip(np.round(np.asarray(audio) * 32768.0), -32768, 32767).astype(np.int16)
+    n = len(pcm) // chunk
+    return [pcm[i * chunk:(i + 1) * chunk].tobytes() for i in range(n)]
+
+
+def _show(t, res):
+    if res.ran:
+        print(f"  {t:7.2f} s  {res.label:<30} {', '.join(res.top5[1:])}")
+
+
+def _dry_run(device_id, alert_type, message, severity):
+    print(f"   (dry run) alert {alert_type} [{severity}]: {message}")
+
+
+def replay(audio, pipeline, realtime=False, policy=None, on_window=None):
+    """
+    Feed one recording through AudioCapture + pipeline. Returns (windows, capture) where windows is
+    [(end time s, HopResult)]. Max speed drains every window (nothing dropped); realtime paces the
+    chunks on a producer thread and uses the live drop policy.
+    """
+    window, hop = WIN_CHUNKS * CHUNK, HOP_CHUNKS * CHUNK
+    capture = AudioCapture(RATE, CHUNK, window, hop, policy=policy or ("latest" if realtime else "fifo"))
+    chunks = _chunks(audio)
+    windows = []
+
+    def consume(wav):
+        res = pipeline.process(wav, capture.new_samples)
+        t = (window + (capture.hop_index - 1) * hop) / RATE    # end of this window in the recording
+        windows.append((t, res))
+        if on_window is not None:
+            on_window(t, res)
+
+    if not realtime:
+        for data in chunks:
+            capture._on_audio(data, CHUNK, None, 0)
+            while capture.backlog:
+                consume(capture.get(timeout=0))
+        return windows, capture
+
+    done = threading.Event()
+
+    def produce():
+        start = time.perf_counter()
+        for i, data in enumerate(chunks):
+            delay = start + (i + 1) * CHUNK / RATE - time.perf_counter()   # a chunk is ready when it's been "recorded"
+            if delay > 0:
+                time.sleep(delay)
+            capture._on_audio(data, CHUNK, None, 0)
+        done.set()
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    while not (done.is_set() and not capture.backlog):
+        wav = capture.get(timeout=0.1)
+        if wav is not None:
+            consume(wav)
+    producer.join()
+    return windows, capture
+
+
+def report(pipeline, audio_s, wall_s, captures):
+    stats = {
+        "audio_s": audio_s,
+        "wall_s": wall_s,
+        "rtf": wall_s / max(audio_s, 1e-9),                       # < 1: faster than real time
+        "processing_rtf": sum(pipeline.timings["total"]) / 1000.0 / max(audio_s, 1e-9),
+        "hops": pipeline.hops,
+        "gate_open": pipeline.gate_opens / max(1, pipeline.hops),
+        "duty_cycle": pipeline.duty_cycle,
+        "dropped_hops": sum(c.dropped_hops for c in captures),
+        "stages_ms": pipeline.stage_percentiles(),
+    }
+    print(f"\n{stats['audio_s']:.1f} s of audio in {stats['wall_s']:.2f} s: RTF {stats['rtf']:.3f} "
+          f"(pipeline alone {stats['processing_rtf']:.4f}), {stats['hops']} hops, "
+          f"gate open {100 * stats['gate_open']:.0f}%, model duty cycle {100 * stats['duty_cycle']:.0f}%, dropped {stats['dropped_hops']}")
+    print(f"{'stage':>9} | {'p50 ms':>7} | {'p95 ms':>7} | {'p99 ms':>7}")
+    for stage, p in stats["stages_ms"].items():
+        print(f"{stage:>9} | {p['p50']:7.2f} | {p['p95']:7.2f} | {p['p99']:7.2f}")
+    return stats
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Replay WAV files through the YAMNet audio pipeline")
+    ap.add_argument("wavs", nargs="+")
+    ap.add_argument("--realtime", action="store_true", help="pace at 1x instead of max speed")
+    ap.add_argument("--no-model", action="store_true", help="front end only")
+    ap.add_argument("--backend", default=None, help="yamnet_model backend (default $YAMNET_BACKEND / auto)")
+    ap.add_argument("--no-gate", action="store_true", help="run the model on every hop")
+    ap.add_argument("--post-alerts", action="store_true", help="really post alerts to the backend")
+    ap.add_argument("--out", default=None, help="write per-window results + stats as JSON")
+    args = ap.parse_args(argv)
+
+    classifier = None
+    if not args.no_model:
+        from yamnet_model import load_classifier
+        classifier = load_classifier(args.backend)
+    alerter = EventAlerter(send=None if args.post_alerts else _dry_run, background=args.post_alerts)
+    pipeline = AudioPipeline(classifier, gate=not args.no_gate, alerter=alerter)
+
+    results, captures, audio_s = {}, [], 0.0
+    t0 = time.perf_counter()
+    for path in args.wavs:
+        audio = read_wav(path)
+        audio_s += len(audio) / RATE
+        print(f"▶ {path} ({len(audio) / RATE:.1f} s)")
+        windows, capture = replay(audio, pipeline, args.realtime, on_window=_show)
+        captures.append(capture)
+        results[path] = [{"t": round(t, 2), "ran": r.ran, "label": r.label, "top5": r.top5, "alerts": r.alerts}
+                         for t, r in windows]
+    stats = report(pipeline, audio_s, time.perf_counter() - t0, captures)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"stats": stats, "windows": results}, f, indent=2)
+        print(f"(saved to {args.out})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+# audio_ring.py
+# Streaming audio front end for YAMNet: a preallocated circular buffer of raw int16 samples.
+# Each 20 ms chunk is one buffer copy into the ring: no per-chunk arithmetic, and PortAudio's bytes
+# go in through a memoryview without an ndarray being built around them. The 0.96 s window is
+# scaled to float32 [-1, 1) once per hop, straight into a preallocated output buffer (or the
+# caller's), so the hop loop allocates nothing and the conversion is one vectorized pass a hop.
+#
+#   python audio_ring.py     per-hop CPU time and allocations: deque + concatenate vs ring
+import time
+
+import numpy as np
+
+RATE = 16000
+CHUNK = 320            # 20 ms
+WIN_CHUNKS = 48        # 0.96 s
+HOP_CHUNKS = 24        # 0.48 s
+INT16_SCALE = np.float32(1.0 / 32768.0)
+
+
+class AudioRingBuffer:
+    """
+    ring = AudioRingBuffer(window=15360, hop=7680)
+    if ring.push(int16_chunk):  # int16 ndarray, or memoryview(pa_bytes).cast("h")
+        wav = ring.window()     # float32 [window], valid until the next window() call
+
+    dtype is what the ring stores: int16 (PortAudio chunks, scaled on the way out) or float32
+    (already-float audio such as the denoiser's output, handed out as a view when contiguous).
+    """
+
+    def __init__(self, window=WIN_CHUNKS * CHUNK, hop=HOP_CHUNKS * CHUNK, dtype=np.int16):
+        self.window_size = window
+        self.hop = hop
+        self.dtype = np.dtype(dtype)
+        self._ring = np.zeros(window, self.dtype)
+        # same-dtype writes go through a memoryview: about half the call overhead of ndarray slice
+        # assignment, which is most of the per-chunk cost at 320 samples
+        self._mv = memoryview(self._ring)
+        self._out = np.empty(window, np.float32)
+        self._pos = 0            # next write index
+        self._filled = 0         # samples written, capped at window
+        self._since_hop = 0
+
+    def push(self, chunk):
+        """Write a chunk (cast to the ring's dtype). True when a new window is ready."""
+        n = len(chunk)
+        pos = self._pos
+        end = pos + n
+        if end <= self.window_size:   # the usual case: CHUNK divides the window, chunks never straddle the end
+            try:
+                self._mv[pos:end] = chunk       # e.g. an int16 chunk (array or memoryview) into the int16 ring
+            except ValueError:                  # different dtype: let numpy cast
+                self._ring[pos:end] = chunk
+            self._pos = end if end < self.window_size else 0
+        else:
+            self._push_wrapped(chunk)
+        self._since_hop += n
+        if self._filled < self.window_size:
+            self._filled = min(self.window_size, self._filled + n)
+        if self._since_hop >= self.hop and self._filled == self.window_size:
+            self._since_hop = 0
+            return True
+        return False
+
+    def _push_wrapped(self, chunk):
+        size = self.window_size
+        chunk = np.asarray(chunk)[-size:]
+        first = min(len(chunk), size - self._pos)
+        self._ring[self._pos:self._pos + first] = chunk[:first]
+        self._ring[:len(chunk) - first] = chunk[first:]
+        self._pos = (self._pos + len(chunk)) % size
+
+    def window(self, out=None):
+        """
+        Last `window` samples, oldest first, as float32. Written into `out` if given (e.g. a capture
+        slot, saving a copy), else into a reused buffer; a float ring that is contiguous is a view.
+        """
+        pos, ring = self._pos, self._ring
+        if pos == 0 and out is None and self.dtype == np.float32:
+            return ring
+        out = self._out if out is None else out
+        tail = self.window_size - pos
+        out[:tail] = ring[pos:]
+        out[tail:] = ring[:pos]
+        if self.dtype == np.int16:
+            # cast-copy above, scale in place here: no float64 temporary and no ufunc cast buffer
+            np.multiply(out, INT16_SCALE, out=out)
+        return out
+
+    @property
+    def ready(self):
+        return self._filled == self.window_size
+
+
+def _deque_frontend(chunks):
+    """What YAMNET_realtime.py used to do every hop (chunks are PortAudio bytes)."""
+    from collections import deque
+    buf = deque(maxlen=WIN_CHUNKS)
+    hop_counter = 0
+    for data in chunks:
+        buf.append(np.frombuffer(data, np.int16))
+        hop_counter += 1
+        if len(buf) == WIN_CHUNKS and hop_counter >= HOP_CHUNKS:
+            hop_counter = 0
+            win = np.concatenate(list(buf))
+            yield win.astype(np.float64) / 32768.0
+
+
+def _ring_frontend(chunks):
+    """What audio_capture.AudioCapture does: bytes into the int16 ring, one float32 window per hop."""
+    ring = AudioRingBuffer()
+    for data in chunks:
+        if ring.push(memoryview(data).cast("h")):
+            yield ring.window()
+
+
+def bench_frontend(seconds=120, repeats=3):
+    """CPU time per hop and bytes allocated per hop for both front ends on the same synthetic audio."""
+    rng = np.random.default_rng(0)
+    n_chunks = seconds * RATE // CHUNK
+    chunks = [rng.integers(-3000, 3000, CHUNK, dtype=np.int16).tobytes() for _ in range(n_chunks)]
+
+    print(f"{'front end':>16} | {'us/hop':>7} | {'KiB alloc/hop':>13} | dtype")
+    for name, frontend in (("deque+concat", _deque_frontend), ("int16 ring", _ring_frontend)):
+        best = float("inf")
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            hops = sum(1 for _ in frontend(chunks))
+            best = min(best, time.perf_counter() - t0)
+        alloc, dtype = _allocated_per_hop(frontend, chunks, hops)
+        print(f"{name:>16} | {best / hops * 1e6:7.1f} | {alloc / 1024:13.1f} | {dtype}")
+
+
+def _allocated_per_hop(frontend, chunks, hops):
+    """Peak traced memory above the baseline per hop: the temporaries the allocator churns through."""
+    import tracemalloc
+    tracemalloc.start()
+    total = 0
+    last = tracemalloc.get_traced_memory()[0]
+    dtype = None
+    for wav in frontend(chunks):
+        dtype = wav.dtype
+        cur, peak = tracemalloc.get_traced_memory()
+        total += max(0, peak - last)
+        tracemalloc.reset_peak()
+        last = cur
+    tracemalloc.stop()
+    return total / max(1, hops), dtype
+
+
+if __name__ == "__main__":
+    bench_frontend()
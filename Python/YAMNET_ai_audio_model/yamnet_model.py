@@ -0,0 +1,264 @@
+# yamnet_model.py
+# Load YAMNet from local files instead of hub.load(<Kaggle URL>) at import time: no network on the
+# Pi, no download on cold start, and with the TFLite backend no full TensorFlow either.
+#
+#   python yamnet_model.py fetch     one-time, on a machine with TensorFlow + network: SavedModel,
+#                                    a fixed-window TFLite export and the class map into models/
+#   python yamnet_model.py bench     startup time and per-window latency of each backend
+#
+#   python yamnet_model.py fetch --backbone --yamnet-src <models/research/audioset/yamnet>
+#                                    also a patch-input backbone (log-mel [96, 64] -> scores), built
+#                                    from the reference YAMNet code and yamnet.h5 weights
+#
+# Backends: load_classifier("tflite" | "saved_model" | "tflite_patches"), $YAMNET_BACKEND, or "auto"
+# (TFLite if the file and an interpreter are there, else the SavedModel). All return scores as
+# [frames, 521]. The waveform backends take a float32 window; "tflite_patches" has takes_patches=True
+# and takes an audio_features.LogMelFrontend patch, so the log-mel front end can run incrementally.
+import os, sys, csv, json, shutil, argparse, subprocess
+
+import numpy as np
+
+from audio_ring import CHUNK, WIN_CHUNKS, HOP_CHUNKS
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+MODEL_DIR = os.path.join(HERE, "models")
+SAVED_MODEL_DIR = os.path.join(MODEL_DIR, "yamnet_saved_model")
+TFLITE_PATH = os.path.join(MODEL_DIR, "yamnet.tflite")
+BACKBONE_TFLITE_PATH = os.path.join(MODEL_DIR, "yamnet_backbone.tflite")
+CLASS_MAP_PATH = os.path.join(MODEL_DIR, "yamnet_class_map.csv")
+HUB_URL = "https://www.kaggle.com/models/google/yamnet/TensorFlow2/yamnet/1"
+WEIGHTS_URL = "https://storage.googleapis.com/audioset/yamnet.h5"
+WINDOW = WIN_CHUNKS * CHUNK          # the TFLite export has a fixed input length: one 0.96 s window
+DEFAULT_BACKEND = "auto"
+BENCH_WINDOWS = 50
+
+
+def class_names(path=CLASS_MAP_PATH):
+    """display_name column of the cached YAMNet class map (521 labels)."""
+    with open(path, newline="") as f:
+        return [row["display_name"] for row in csv.DictReader(f)]
+
+
+def _tflite_interpreter():
+    """Interpreter class from the lightest package installed, or None."""
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+        return Interpreter
+    except ImportError:
+        pass
+    try:
+        from tflite_runtime.interpreter import Interpreter
+        return Interpreter
+    except ImportError:
+        pass
+    try:
+        import tensorflow as tf
+        return tf.lite.Interpreter
+    except ImportError:
+        return None
+
+
+class SavedModelClassifier:
+    name = "saved_model"
+    takes_patches = False
+
+    def __init__(self, path=SAVED_MODEL_DIR, class_map=CLASS_MAP_PATH):
+        import tensorflow as tf
+        self.model = tf.saved_model.load(path)
+        self.class_names = class_names(class_map)
+
+    def __call__(self, wav):
+        scores, _embeddings, _spectrogram = self.model(np.asarray(wav, np.float32))
+        return scores.numpy()
+
+
+class TFLiteClassifier:
+    name = "tflite"
+    takes_patches = False
+
+    def __init__(self, path=TFLITE_PATH, class_map=CLASS_MAP_PATH, num_threads=None):
+        Interpreter = _tflite_interpreter()
+        if Interpreter is None:
+            raise ImportError("No TFLite interpreter: pip install ai-edge-litert (or tflite-runtime)")
+        self.class_names = class_names(class_map)
+        self.interpreter = Interpreter(model_path=path, num_threads=num_threads)
+        inp = self.interpreter.get_input_details()[0]
+        if inp["shape_signature"][-1] == -1:   # dynamic-length export: give it one window
+            self.interpreter.resize_tensor_input(inp["index"], [WINDOW])
+        self.interpreter.allocate_tensors()
+        self._input = self.interpreter.get_input_details()[0]
+        # outputs are scores [.., 521], embeddings [.., 1024], log-mel [.., 64]: pick the scores by width
+        self._scores = next(o["index"] for o in self.interpreter.get_output_details()
+                            if o["shape"][-1] == len(self.class_names))
+        self.window = int(self._input["shape"][-1])
+
+    def __call__(self, wav):
+        wav = np.asarray(wav, np.float32)
+        if len(wav) != self.window:      # fixed-size export: pad or keep the latest samples
+            wav = np.pad(wav, (self.window - len(wav), 0)) if len(wav) < self.window else wav[-self.window:]
+        self.interpreter.set_tensor(self._input["index"], wav.reshape(self._input["shape"]))
+        self.interpreter.invoke()
+        return np.atleast_2d(self.interpreter.get_tensor(self._scores))
+
+
+class PatchClassifier:
+    """YAMNet backbone only: one [96, 64] log-mel patch in, scores [1, 521] out."""
+    name = "tflite_patches"
+    takes_patches = True
+
+    def __init__(self, path=BACKBONE_TFLITE_PATH, class_map=CLASS_MAP_PATH, num_threads=None):
+        Interpreter = _tflite_interpreter()
+        if Interpreter is None:
+            raise ImportError("No TFLite interpreter: pip install ai-edge-litert (or tflite-runtime)")
+        self.class_names = class_names(class_map)
+        self.interpreter = Interpreter(model_path=path, num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        self._input = self.interpreter.get_input_details()[0]
+        self._scores = self.interpreter.get_output_details()[0]["index"]
+
+    def __call__(self, patch):
+        self.interpreter.set_tensor(self._input["index"], np.asarray(patch, np.float32).reshape(self._input["shape"]))
+        self.interpreter.invoke()
+        return np.atleast_2d(self.interpreter.get_tensor(self._scores))
+
+
+BACKENDS = {"saved_model": SavedModelClassifier, "tflite": TFLiteClassifier, "tflite_patches": PatchClassifier}
+
+
+def load_classifier(backend=None, **kwargs):
+    """`backend` falls back to $YAMNET_BACKEND, then DEFAULT_BACKEND."""
+    backend = backend or os.environ.get("YAMNET_BACKEND") or DEFAULT_BACKEND
+    if backend == "auto":
+        backend = "tflite" if os.path.exists(TFLITE_PATH) and _tflite_interpreter() else "saved_model"
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown YAMNet backend '{backend}'. Choose from: {', '.join(BACKENDS)} or auto")
+    needed = {"saved_model": SAVED_MODEL_DIR, "tflite": TFLITE_PATH, "tflite_patches": BACKBONE_TFLITE_PATH}[backend]
+    if not os.path.exists(needed) or not os.path.exists(CLASS_MAP_PATH):
+        raise FileNotFoundError(f"{needed} missing: run `python yamnet_model.py fetch` once with network access")
+    return BACKENDS[backend](**kwargs)
+
+
+def fetch(url=HUB_URL, window=WINDOW):
+    """Download YAMNet once and write the SavedModel, TFLite export and class map to MODEL_DIR."""
+    import tensorflow as tf
+    import tensorflow_hub as hub
+    os.makedirs(MODEL_DIR, exist_ok=True)
+    model = hub.load(url)
+    shutil.copyfile(model.class_map_path().numpy().decode(), CLASS_MAP_PATH)
+    tf.saved_model.save(model, SAVED_MODEL_DIR)
+    print(f"✅ SavedModel -> {SAVED_MODEL_DIR}")
+
+    @tf.function(input_signature=[tf.TensorSpec([window], tf.float32)])
+    def serve(wav):   # the hub signature is [None]; pin the length so the interpreter needs no resize
+        return model(wav)
+    converter = tf.lite.TFLiteConverter.from_concrete_functions([serve.get_concrete_function()], model)
+    try:
+        blob = converter.convert()
+    except Exception as e:   # some TF versions need the flex ops for the STFT front end
+        print(f"⚠️ builtin-only conversion failed ({e}); retrying with SELECT_TF_OPS")
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS, tf.lite.OpsSet.SELECT_TF_OPS]
+        blob = converter.convert()
+    with open(TFLITE_PATH, "wb") as f:
+        f.write(blob)
+    print(f"✅ TFLite ({window} samples) -> {TFLITE_PATH} ({len(blob) / 1e6:.1f} MB)")
+    print(f"✅ Class map -> {CLASS_MAP_PATH}")
+
+
+def fetch_backbone(yamnet_src, weights_url=WEIGHTS_URL):
+    """
+    Patch-input TFLite model ([1, 96, 64] log-mel -> [1, 521] scores). The hub model only takes
+    waveforms, so this is built from the reference code (yamnet_src = a checkout of
+    tensorflow/models research/audioset/yamnet) and its published weights.
+    """
+    import urllib.request
+    import tensorflow as tf
+    sys.path.insert(0, yamnet_src)
+    import params as yamnet_params
+    import yamnet as yamnet_lib
+    from audio_features import PATCH_FRAMES, MEL_BANDS
+
+    os.makedirs(MODEL_DIR, exist_ok=True)
+    weights = os.path.join(MODEL_DIR, "yamnet.h5")
+    if not os.path.exists(weights):
+        urllib.request.urlretrieve(weights_url, weights)
+    params = yamnet_params.Params()
+    patches = tf.keras.Input(batch_size=1, shape=(PATCH_FRAMES, MEL_BANDS))
+    predictions, _embeddings = yamnet_lib.yamnet(patches, params)
+    backbone = tf.keras.Model(patches, predictions)
+    backbone.load_weights(weights, by_name=True)   # same layer names as the reference waveform model
+    blob = tf.lite.TFLiteConverter.from_keras_model(backbone).convert()
+    with open(BACKBONE_TFLITE_PATH, "wb") as f:
+        f.write(blob)
+    print(f"✅ TFLite backbone ([{PATCH_FRAMES}, {MEL_BANDS}] patches) -> {BACKBONE_TFLITE_PATH} ({len(blob) / 1e6:.1f} MB)")
+
+
+# ---- benchmark ----
+_BENCH_SNIPPET = """
+import json, time
+t0 = time.perf_counter()
+from yamnet_model import load_classifier
+clf = load_classifier({backend!r})
+startup = time.perf_counter() - t0
+import numpy as np
+from audio_features import LogMelFrontend
+audio = (np.random.default_rng(0).standard_normal({window} + {n} * {hop}) * 0.1).astype(np.float32)
+front = LogMelFrontend()
+front.push(audio[:{window}])
+
+def step(i):
+    new = audio[{window} + i * {hop}:{window} + (i + 1) * {hop}]
+    if clf.takes_patches:   # frame only the new audio, backbone on the rolling patch
+        front.push(new)
+        return clf(front.patch())
+    return clf(audio[(i + 1) * {hop}:{window} + (i + 1) * {hop}])   # the whole window through the model
+
+step(0)
+lat = []
+for i in range({n}):
+    t = time.perf_counter(); step(i); lat.append((time.perf_counter() - t) * 1000.0)
+print("BENCH " + json.dumps(dict(startup_s=startup, mean_ms=float(np.mean(lat)), p95_ms=float(np.percentile(lat, 95)))))
+"""
+
+
+def benchmark(backends=tuple(BACKENDS), n=BENCH_WINDOWS):
+    """
+    Each backend in a fresh process, so startup includes the imports a cold start pays for.
+    ms/hop is what one 0.48 s hop costs: the whole window for waveform backends, the incremental
+    log-mel frames plus the backbone for "tflite_patches".
+    """
+    print(f"{'backend':>14} | {'startup s':>9} | {'ms/hop':>9} | {'p95 ms':>7}")
+    results = {}
+    for backend in backends:
+        code = _BENCH_SNIPPET.format(backend=backend, window=WINDOW, hop=HOP_CHUNKS * CHUNK, n=n)
+        proc = subprocess.run([sys.executable, "-c", code], cwd=HERE, capture_output=True, text=True)
+        line = next((l for l in proc.stdout.splitlines() if l.startswith("BENCH ")), None)
+        if line is None:
+            print(f"{backend:>14} | failed: {(proc.stderr.strip().splitlines() or ['?'])[-1]}")
+            continue
+        r = results[backend] = json.loads(line[6:])
+        print(f"{backend:>14} | {r['startup_s']:9.2f} | {r['mean_ms']:9.1f} | {r['p95_ms']:7.1f}")
+    return results
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Local YAMNet model files")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    f = sub.add_parser("fetch", help="download once and export SavedModel + TFLite + class map")
+    f.add_argument("--backbone", action="store_true", help="also export the patch-input backbone")
+    f.add_argument("--yamnet-src", default=None, help="tensorflow/models research/audioset/yamnet checkout")
+    b = sub.add_parser("bench", help="startup time and per-window latency per backend")
+    b.add_argument("--windows", type=int, default=BENCH_WINDOWS)
+    args = ap.parse_args(argv)
+    if args.cmd == "fetch":
+        fetch()
+        if args.backbone:
+            if not args.yamnet_src:
+                ap.error("--backbone needs --yamnet-src")
+            fetch_backbone(args.yamnet_src)
+    else:
+        benchmark(n=args.windows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+# fleet_sim.py
+# AquaguardSim (Boat-navigation_sim.py) for thousands of boats at once, headless. Every boat's
+# position, heading, sonar readings, FSM state and collision type live in NumPy arrays; raycasts,
+# motion and CRUISE/REVERSE/TURN transitions are computed for the whole fleet per step.
+#
+# Random draws only happen when a boat picks its initial heading or finishes reversing, so each boat
+# keeps its own random.Random(seed) and draws in the same order as the scalar sim. Boat i of
+# FleetSim(seeds) therefore follows the same trajectory as AquaguardSim(rng=random.Random(seeds[i])),
+# bit for bit as long as numpy's float64 sin/cos round like libm's (they do on the dev machines; a
+# SIMD build that rounds differently can flip a rare threshold comparison).
+#
+#   python fleet_sim.py [boats] [steps]    Monte Carlo summary + steps/s against the scalar sim
+import os, sys, time, random, importlib.util
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_scalar_sim():
+    """Boat-navigation_sim.py as a module (its name isn't importable); parameters come from there."""
+    spec = importlib.util.spec_from_file_location("boat_navigation_sim", os.path.join(HERE, "Boat-navigation_sim.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+_sim = load_scalar_sim()
+POOL_WIDTH, POOL_HEIGHT = _sim.POOL_WIDTH, _sim.POOL_HEIGHT
+BOAT_SPEED, TURN_SPEED = _sim.BOAT_SPEED, _sim.TURN_SPEED
+SENSOR_MAX_DIST = _sim.SENSOR_MAX_DIST
+COLLISION_DIST, DEAD_CORNER_DIST = _sim.COLLISION_DIST, _sim.DEAD_CORNER_DIST
+REVERSE_STEPS = 12
+WALL_MARGIN = 20
+RAY_OFFSETS = (0, 90, -90)   # front, left, right sonar
+
+# FSM states and collision types as small ints; the names match AquaguardSim's strings
+CRUISE, REVERSE, TURN = 0, 1, 2
+STATES = (_sim.State.CRUISE, _sim.State.REVERSE, _sim.State.TURN)
+NONE, FREE, LEFT_BLOCKED, RIGHT_BLOCKED, TRAPPED = 0, 1, 2, 3, 4
+COLLISIONS = ("NONE", "FREE", "LEFT_BLOCKED", "RIGHT_BLOCKED", "TRAPPED")
+
+
+class FleetSim:
+    """
+    fleet = FleetSim(seeds=range(5000))
+    fleet.step()            # one AquaguardSim.update() for every boat
+    fleet.run(2000)         # many steps + Monte Carlo counters
+    """
+
+    def __init__(self, n=None, seeds=None):
+        seeds = list(range(n)) if seeds is None else list(seeds)
+        self.n = len(seeds)
+        self.rngs = [random.Random(s) for s in seeds]
+        self.x = np.full(self.n, POOL_WIDTH / 2)
+        self.y = np.full(self.n, POOL_HEIGHT / 2)
+        self.heading = np.array([r.uniform(0, 360) for r in self.rngs])
+        self.state = np.full(self.n, CRUISE, np.int8)
+        self.reverse_counter = np.zeros(self.n, np.int64)
+        self.turn_target = np.zeros(self.n)
+        self.turn_accumulated = np.zeros(self.n)
+        self.collision_type = np.full(self.n, NONE, np.int8)
+        self.front = np.zeros(self.n)
+        self.left = np.zeros(self.n)
+        self.right = np.zeros(self.n)
+        # sin/cos of heading + (0, 90, -90) degrees. Headings only change while turning, so only those
+        # boats are recomputed: same inputs, same values, a quarter of the trig (the bulk of the cost).
+        self._sin = np.zeros((3, self.n))
+        self._cos = np.zeros((3, self.n))
+        self._stale = np.ones(self.n, bool)
+        # Monte Carlo counters
+        self.steps = 0
+        self.state_steps = np.zeros((self.n, len(STATES)), np.int64)
+        self.collisions = np.zeros((self.n, len(COLLISIONS)), np.int64)
+
+    def _update_trig(self):
+        idx = np.flatnonzero(self._stale)
+        if len(idx):
+            for k, offset in enumerate(RAY_OFFSETS):
+                ray = np.radians(self.heading[idx] + offset)
+                self._sin[k, idx] = np.sin(ray)
+                self._cos[k, idx] = np.cos(ray)
+            self._stale[idx] = False
+
+    def raycast(self, k):
+        """Distance to the nearest wall along ray k (heading + RAY_OFFSETS[k]), capped at SENSOR_MAX_DIST."""
+        sin_a, cos_a = self._sin[k], self._cos[k]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            dx = np.where(cos_a > 0, (POOL_WIDTH - self.x) / cos_a,
+                          np.where(cos_a < 0, -self.x / cos_a, SENSOR_MAX_DIST))
+            dy = np.where(sin_a > 0, (POOL_HEIGHT - self.y) / sin_a,
+                          np.where(sin_a < 0, -self.y / sin_a, SENSOR_MAX_DIST))
+        dist = np.full(self.n, float(SENSOR_MAX_DIST))
+        dist = np.where(dx > 0, np.minimum(dist, dx), dist)
+        return np.where(dy > 0, np.minimum(dist, dy), dist)
+
+    def step(self):
+        # 1. sensors
+        self._update_trig()
+        self.front = self.raycast(0)
+        self.left = self.raycast(1)
+        self.right = self.raycast(2)
+        state = self.state.copy()   # every boat runs exactly one branch, chosen by its state at the start
+        cos_h, sin_h = self._cos[0], self._sin[0]   # radians(heading + 0) is radians(heading)
+
+        # 2a. CRUISE: collide (-> REVERSE, classify the collision) or move forward
+        cruise = state == CRUISE
+        hit = cruise & (self.front < COLLISION_DIST)
+        go = cruise & ~hit
+        left_blocked = self.left < DEAD_CORNER_DIST
+        right_blocked = self.right < DEAD_CORNER_DIST
+        kind = np.select([left_blocked & right_blocked, left_blocked, right_blocked],
+                         [TRAPPED, LEFT_BLOCKED, RIGHT_BLOCKED], FREE).astype(np.int8)
+        self.state[hit] = REVERSE
+        self.reverse_counter[hit] = REVERSE_STEPS
+        self.collision_type[hit] = kind[hit]
+        np.add.at(self.collisions, (np.flatnonzero(hit), kind[hit]), 1)
+        self.x[go] += cos_h[go] * BOAT_SPEED
+        self.y[go] += sin_h[go] * BOAT_SPEED
+
+        # 2b. REVERSE: back off, then pick a turn (-> TURN)
+        rev = state == REVERSE
+        back = rev & (self.reverse_counter > 0)
+        self.x[back] -= cos_h[back] * (BOAT_SPEED * 0.5)
+        self.y[back] -= sin_h[back] * (BOAT_SPEED * 0.5)
+        self.reverse_counter[back] -= 1
+        done = np.flatnonzero(rev & ~back)
+        if len(done):
+            self.state[done] = TURN
+            self.turn_target[done] = [self._turn_angle(i) for i in done]
+            self.turn_accumulated[done] = 0
+
+        # 2c. TURN: rotate in TURN_SPEED steps until the target angle is covered (-> CRUISE)
+        turn = state == TURN
+        rotating = turn & (np.abs(self.turn_accumulated) < np.abs(self.turn_target))
+        step = np.where(self.turn_target > 0, TURN_SPEED, -TURN_SPEED)
+        self.heading[rotating] += step[rotating]
+        self.turn_accumulated[rotating] += step[rotating]
+        self._stale |= rotating
+        self.state[turn & ~rotating] = CRUISE
+
+        np.clip(self.x, WALL_MARGIN, POOL_WIDTH - WALL_MARGIN, out=self.x)
+        np.clip(self.y, WALL_MARGIN, POOL_HEIGHT - WALL_MARGIN, out=self.y)
+        self.steps += 1
+        self.state_steps[np.arange(self.n), state] += 1
+
+    def _turn_angle(self, i):
+        """AquaguardSim's REVERSE -> TURN decision for boat i, drawing from its own generator in the same order."""
+        r, kind = self.rngs[i], self.collision_type[i]
+        if kind == TRAPPED:
+            return 170 if self.left[i] < self.right[i] else -170
+        if kind == LEFT_BLOCKED:
+            return -(r.randint(70, 100) if r.random() < 0.7 else r.randint(110, 150))
+        if kind == RIGHT_BLOCKED:
+            return r.randint(70, 100) if r.random() < 0.7 else r.randint(110, 150)
+        turn_dir = r.choice([-1, 1])
+        angle = r.randint(70, 100) if r.random() < 0.7 else r.randint(110, 150)
+        return angle * turn_dir
+
+    def run(self, steps, on_step=None):
+        for _ in range(steps):
+            self.step()
+            if on_step is not None:
+                on_step(self)
+        return self.summary()
+
+    def summary(self):
+        """Fleet-wide Monte Carlo statistics so far."""
+        total = max(1, self.steps * self.n)
+        per_boat = self.collisions[:, 1:].sum(axis=1)
+        return {
+            "boats": self.n,
+            "steps": self.steps,
+            "state_fraction": {name: float(self.state_steps[:, k].sum() / total) for k, name in enumerate(STATES)},
+            "collisions_per_1000_steps": {name: float(self.collisions[:, k].sum() * 1000.0 / total)
+                                          for k, name in enumerate(COLLISIONS) if k != NONE},
+            "collisions_per_boat_p50_p95": (float(np.percentile(per_boat, 50)), float(np.percentile(per_boat, 95))),
+        }
+
+
+def benchmark(boats=2000, steps=500, scalar_boats=50):
+    """Boat-steps per second: AquaguardSim one boat at a time vs FleetSim."""
+    t0 = time.perf_counter()
+    for s in range(scalar_boats):
+        boat = _sim.AquaguardSim(rng=random.Random(s))
+        for _ in range(steps):
+            boat.update()
+    scalar = scalar_boats * steps / (time.perf_counter() - t0)
+
+    fleet = FleetSim(boats)
+    t0 = time.perf_counter()
+    stats = fleet.run(steps)
+    vector = boats * steps / (time.perf_counter() - t0)
+
+    print(f"AquaguardSim: {scalar:,.0f} boat-steps/s | FleetSim ({boats} boats): {vector:,.0f} boat-steps/s "
+          f"({vector / scalar:.0f}x)")
+    print("time in state:", {k: f"{100 * v:.1f}%" for k, v in stats["state_fraction"].items()})
+    print("collisions / 1000 steps:", {k: round(v, 2) for k, v in stats["collisions_per_1000_steps"].items()})
+    print("collisions per boat p50/p95:", stats["collisions_per_boat_p50_p95"])
+    return stats
+
+
+if __name__ == "__main__":
+    boats = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    steps = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    benchmark(boats, steps)
@@ -0,0 +1,192 @@
+# nav_runner.py
+# Headless fast-forward for the navigation sim: step AquaguardSim.update() as fast as the CPU allows
+# instead of once per 40 ms animation frame, and measure how well the escape policy covers the pool.
+#  - occupancy grid: visits per CELL_PX x CELL_PX pool cell
+#  - coverage % over time (and the step each COVERAGE_MARKS level was reached)
+#  - time stuck in corners: steps within CORNER_DIST of two walls, and the longest such stay
+#  - collisions by type (CRUISE -> REVERSE transitions)
+# The trajectory is kept, so the run can be replayed with matplotlib afterwards.
+#
+#   python nav_runner.py --steps 20000 --seed 0            one boat
+#   python nav_runner.py --steps 5000 --boats 1000         fleet_sim, coverage distribution over seeds
+#   python nav_runner.py --steps 3000 --replay             then animate the recorded run
+import sys, time, random, argparse
+
+import numpy as np
+
+import fleet_sim
+from fleet_sim import POOL_WIDTH, POOL_HEIGHT, STATES, COLLISIONS
+
+CELL_PX = 25
+CORNER_DIST = 100            # px from both walls counts as "in a corner"
+COVERAGE_MARKS = (0.5, 0.8, 0.9)
+GRID_SHAPE = (int(np.ceil(POOL_HEIGHT / CELL_PX)), int(np.ceil(POOL_WIDTH / CELL_PX)))
+
+
+def _cells(x, y):
+    """Flat occupancy-grid index for positions (scalars or arrays)."""
+    row = np.minimum((np.asarray(y) // CELL_PX).astype(np.int64), GRID_SHAPE[0] - 1)
+    col = np.minimum((np.asarray(x) // CELL_PX).astype(np.int64), GRID_SHAPE[1] - 1)
+    return row * GRID_SHAPE[1] + col
+
+
+def _in_corner(x, y):
+    near_x = (np.asarray(x) < CORNER_DIST) | (np.asarray(x) > POOL_WIDTH - CORNER_DIST)
+    near_y = (np.asarray(y) < CORNER_DIST) | (np.asarray(y) > POOL_HEIGHT - CORNER_DIST)
+    return near_x & near_y
+
+
+def run(steps, seed=None, report_every=100):
+    """
+    One boat for `steps` (>= 1) updates. Returns (stats, traj, grid): traj is a structured array of x, y,
+    heading, state, front, left, right per step (what the replay needs), grid the visits per cell.
+    """
+    if steps < 1:
+        raise ValueError(f"steps must be at least 1, got {steps}")
+    sim = fleet_sim._sim.AquaguardSim(rng=random.Random(seed))
+    traj = np.zeros(steps, [("x", "f8"), ("y", "f8"), ("heading", "f8"), ("state", "i1"),
+                            ("front", "f8"), ("left", "f8"), ("right", "f8")])
+    collisions = dict.fromkeys(COLLISIONS[1:], 0)
+    t0 = time.perf_counter()
+    for i in range(steps):
+        before = sim.state
+        sim.update()
+        if before == fleet_sim._sim.State.CRUISE and sim.state == fleet_sim._sim.State.REVERSE:
+            collisions[sim.collision_type] += 1
+        traj[i] = (sim.x, sim.y, sim.heading, STATES.index(sim.state),
+                   sim.sensors["front"], sim.sensors["left"], sim.sensors["right"])
+    wall_s = time.perf_counter() - t0
+
+    # metrics in one vectorized pass over the recorded run
+    cells = _cells(traj["x"], traj["y"])
+    grid = np.bincount(cells, minlength=GRID_SHAPE[0] * GRID_SHAPE[1]).reshape(GRID_SHAPE)
+    first_visit = np.full(grid.size, steps, np.int64)
+    np.minimum.at(first_visit, cells, np.arange(steps))
+    covered_by = np.bincount(first_visit[first_visit < steps], minlength=steps).cumsum() / grid.size
+    corner = _in_corner(traj["x"], traj["y"])
+    stats = {
+        "steps": steps,
+        "steps_per_s": steps / wall_s,
+        "coverage": float(covered_by[-1]),
+        "coverage_curve": [(int(s), float(covered_by[s - 1])) for s in range(report_every, steps + 1, report_every)],
+        "steps_to_coverage": {m: _first(covered_by >= m) for m in COVERAGE_MARKS},
+        "corner_fraction": float(corner.mean()),
+        "longest_corner_stay": _longest_run(corner),
+        "collisions": collisions,
+        "state_fraction": {name: float(np.mean(traj["state"] == k)) for k, name in enumerate(STATES)},
+    }
+    return stats, traj, grid
+
+
+def run_fleet(steps, boats, seeds=None):
+    """Coverage / corner time / collisions for many seeds at once on fleet_sim.FleetSim."""
+    if steps < 1:
+        raise ValueError(f"steps must be at least 1, got {steps}")
+    fleet = fleet_sim.FleetSim(boats, seeds)
+    visited = np.zeros((fleet.n, GRID_SHAPE[0] * GRID_SHAPE[1]), bool)
+    corner_steps = np.zeros(fleet.n, np.int64)
+    rows = np.arange(fleet.n)
+    t0 = time.perf_counter()
+    for _ in range(steps):
+        fleet.step()
+        visited[rows, _cells(fleet.x, fleet.y)] = True
+        corner_steps += _in_corner(fleet.x, fleet.y)
+    wall_s = time.perf_counter() - t0
+    coverage = visited.mean(axis=1)
+    summary = fleet.summary()
+    return {
+        "boats": fleet.n,
+        "steps": steps,
+        "boat_steps_per_s": fleet.n * steps / wall_s,
+        "coverage_p5_p50_p95": tuple(float(np.percentile(coverage, p)) for p in (5, 50, 95)),
+        "corner_fraction_p50_p95": tuple(float(np.percentile(corner_steps / steps, p)) for p in (50, 95)),
+        "collisions_per_1000_steps": summary["collisions_per_1000_steps"],
+        "state_fraction": summary["state_fraction"],
+    }
+
+
+def _first(mask):
+    idx = np.flatnonzero(mask)
+    return int(idx[0]) + 1 if len(idx) else None
+
+
+def _longest_run(mask):
+    if not mask.any():
+        return 0
+    edges = np.diff(np.r_[0, mask.astype(np.int8), 0])
+    return int((np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)).max())
+
+
+def replay(traj, grid=None, every=1, interval=40):
+    """Animate a recorded run (matplotlib only needed here), with the occupancy grid underneath."""
+    import matplotlib.pyplot as plt
+    import matplotlib.animation as animation
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    if grid is not None:
+        ax.imshow(np.log1p(grid), origin="lower", extent=(0, POOL_WIDTH, 0, POOL_HEIGHT), cmap="Blues", alpha=0.6)
+    ax.add_patch(plt.Rectangle((0, 0), POOL_WIDTH, POOL_HEIGHT, fill=False, lw=3, color='black'))
+    path, = ax.plot([], [], 'b-', lw=0.5, alpha=0.4)
+    boat_dot, = ax.plot([], [], 'ro', markersize=10)
+    boat_dir, = ax.plot([], [], 'r-', lw=2)
+    status_text = ax.text(20, POOL_HEIGHT + 20, "", fontsize=12, color='blue', fontfamily='monospace')
+    ax.set_xlim(-50, POOL_WIDTH + 50)
+    ax.set_ylim(-50, POOL_HEIGHT + 50)
+    ax.set_aspect('equal')
+    ax.set_title("Aquaguard: headless run replay")
+    frames = range(0, len(traj), every)
+
+    def animate(i):
+        p = traj[i]
+        rad = np.radians(p["heading"])
+        path.set_data(traj["x"][:i + 1], traj["y"][:i + 1])
+        boat_dot.set_data([p["x"]], [p["y"]])
+        boat_dir.set_data([p["x"], p["x"] + 60 * np.cos(rad)], [p["y"], p["y"] + 60 * np.sin(rad)])
+        status_text.set_text(f"Step: {i}  State: {STATES[p['state']]}\n"
+                             f"Front: {int(p['front'])} | Left: {int(p['left'])} | Right: {int(p['right'])}")
+        return path, boat_dot, boat_dir, status_text
+
+    ani = animation.FuncAnimation(fig, animate, frames=frames, interval=interval, blit=True)
+    plt.show()
+    return ani
+
+
+def _positive_int(text):
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Headless navigation sim with coverage metrics")
+    ap.add_argument("--steps", type=_positive_int, default=20000)
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--boats", type=int, default=0, help="run this many seeds on fleet_sim instead of one boat")
+    ap.add_argument("--replay", action="store_true", help="animate the recorded run afterwards")
+    ap.add_argument("--every", type=int, default=1, help="replay every n-th step")
+    args = ap.parse_args(argv)
+
+    if args.boats:
+        s = run_fleet(args.steps, args.boats)
+        print(f"{s['boats']} boats x {s['steps']} steps at {s['boat_steps_per_s']:,.0f} boat-steps/s")
+        print("coverage p5/p50/p95:", ", ".join(f"{100 * c:.1f}%" for c in s["coverage_p5_p50_p95"]))
+        print("time in corners p50/p95:", ", ".join(f"{100 * c:.1f}%" for c in s["corner_fraction_p50_p95"]))
+        print("collisions / 1000 steps:", {k: round(v, 2) for k, v in s["collisions_per_1000_steps"].items()})
+        return 0
+
+    stats, traj, grid = run(args.steps, args.seed)
+    print(f"{stats['steps']} steps at {stats['steps_per_s']:,.0f} steps/s "
+          f"(the animation runs 25 steps/s)")
+    print(f"coverage: {100 * stats['coverage']:.1f}% of {grid.size} cells; steps to reach "
+          + ", ".join(f"{int(100 * m)}%: {n}" for m, n in stats["steps_to_coverage"].items()))
+    print(f"in corners: {100 * stats['corner_fraction']:.1f}% of steps, longest stay {stats['longest_corner_stay']} steps")
+    print("collisions:", stats["collisions"])
+    print("time in state:", {k: f"{100 * v:.1f}%" for k, v in stats["state_fraction"].items()})
+    if args.replay:
+        replay(traj, grid, args.every)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
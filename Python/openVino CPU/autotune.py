@@ -0,0 +1,173 @@
+# autotune.py
+# Sweep the CPU knobs on this host instead of guessing them: torch intra/inter-op threads,
+# OpenVINO NUM_STREAMS / INFERENCE_NUM_THREADS and inference_pool worker counts, all on the
+# same recorded frames. The best latency and best throughput settings go to PROFILE_PATH,
+# which the detectors read at startup (missing profile = library defaults).
+#
+#   python autotune.py --source calib_frames            full sweep, writes the profile
+#   python autotune.py --source clip.mp4 --only openvino
+import os, sys, json, platform, argparse, subprocess, tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PROFILE_PATH = os.path.join(HERE, "tuning_profile.json")   # per host, gitignored
+TUNE_FRAMES = 60
+SECTIONS = ("torch", "openvino", "workers")
+
+
+# ---- profile (loaded by the detectors, keep this part import-light) ----
+def load_profile(path=None):
+    try:
+        with open(path or PROFILE_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def openvino_config(mode="latency"):
+    """NUM_STREAMS / INFERENCE_NUM_THREADS for `mode` ("latency" or "throughput"), or {}."""
+    return dict(load_profile().get(mode, {}).get("openvino", {}))
+
+
+def torch_threads(mode="latency"):
+    """(intra_op, inter_op) for `mode`, or None if the host hasn't been tuned."""
+    t = load_profile().get(mode, {}).get("torch")
+    return (t["intra_op"], t["inter_op"]) if t else None
+
+
+def apply_torch_threads(mode="latency", default=None):
+    """Set torch's thread pools from the profile (or `default` intra-op threads). Returns what was set."""
+    threads = torch_threads(mode) or ((default, None) if default else None)
+    if threads is None:
+        return None
+    import torch
+    intra, inter = threads
+    torch.set_num_threads(intra)
+    if inter:
+        try:
+            torch.set_num_interop_threads(inter)
+        except RuntimeError:
+            pass  # only allowed before torch's first parallel op; intra-op is what matters for YOLO
+    return threads
+
+
+def best_workers(default=None):
+    return load_profile().get("throughput", {}).get("workers", default)
+
+
+# ---- sweep ----
+def _thread_counts(cpus=None):
+    cpus = cpus or os.cpu_count() or 1
+    return sorted({1, 2, max(1, cpus // 2), cpus} & set(range(1, cpus + 1)))
+
+
+_TORCH_SNIPPET = """
+import json, sys, time
+import numpy as np, torch
+torch.set_num_threads({intra}); torch.set_num_interop_threads({inter})
+from ultralytics import YOLO
+frames = np.load({frames!r})
+model = YOLO({model!r})
+model(frames[0], imgsz={imgsz}, device="cpu", verbose=False)
+lat = []
+for f in frames:
+    t0 = time.perf_counter()
+    model(f, imgsz={imgsz}, device="cpu", verbose=False)
+    lat.append((time.perf_counter() - t0) * 1000.0)
+print("TUNE " + json.dumps(dict(mean_ms=float(np.mean(lat)), fps=1000.0 / float(np.mean(lat)))))
+"""
+
+
+def sweep_torch(frames):
+    """Inter-op threads can only be set once per process, so every combination gets a fresh one."""
+    from ov_detection import MODEL_PT, IMG_SIZE
+    import numpy as np
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "frames.npy")
+        np.save(path, np.stack(frames))
+        for intra in _thread_counts():
+            for inter in (1, 2):
+                code = _TORCH_SNIPPET.format(intra=intra, inter=inter, frames=path, model=MODEL_PT, imgsz=IMG_SIZE)
+                proc = subprocess.run([sys.executable, "-c", code], cwd=HERE, capture_output=True, text=True)
+                line = next((l for l in proc.stdout.splitlines() if l.startswith("TUNE ")), None)
+                if line is None:
+                    print(f"⚠️ torch {intra}/{inter}: failed ({(proc.stderr.strip().splitlines() or ['?'])[-1]})")
+                    continue
+                res = json.loads(line[5:])
+                rows.append({"section": "torch", "config": {"intra_op": intra, "inter_op": inter}, **res})
+    return rows
+
+
+def sweep_openvino(frames):
+    import ov_detection, ov_quantize
+    ir_dir = ov_detection.ir_dir_for()
+    rows = []
+    for streams in _thread_counts():
+        for threads in _thread_counts():
+            if threads < streams:
+                continue   # a stream needs at least one thread
+            config = {"NUM_STREAMS": streams, "INFERENCE_NUM_THREADS": threads}
+            mean_ms, _ = ov_quantize.measure_latency(ir_dir, frames, config)
+            fps = ov_quantize.measure_throughput(ir_dir, frames, config=config)
+            rows.append({"section": "openvino", "config": config, "mean_ms": mean_ms, "fps": fps})
+    return rows
+
+
+def sweep_workers(frames):
+    import inference_pool
+    cpus = os.cpu_count() or 1
+    return [{"section": "workers", "config": n, "mean_ms": None,
+             "fps": inference_pool.measure_fps(frames, n)} for n in _thread_counts(cpus)]
+
+
+def tune(frames, sections=SECTIONS, out_path=None):
+    sweeps = {"torch": sweep_torch, "openvino": sweep_openvino, "workers": sweep_workers}
+    rows = []
+    for name in sections:
+        try:
+            rows += sweeps[name](frames)
+        except Exception as e:   # a missing runtime shouldn't stop the other sweeps
+            print(f"⚠️ {name}: skipped ({e})")
+
+    out_path = out_path or PROFILE_PATH
+    profile = load_profile(out_path)   # a partial sweep keeps the other sections' results
+    profile.update({"host": {"cpus": os.cpu_count(), "machine": platform.machine(), "system": platform.system()},
+                    "frames": len(frames)})
+    for mode, key, best in (("latency", "mean_ms", min), ("throughput", "fps", max)):
+        section = profile.setdefault(mode, {})
+        for name in sections:
+            cands = [r for r in rows if r["section"] == name and r[key] is not None]
+            if cands:
+                section[name] = best(cands, key=lambda r: r[key])["config"]
+    profile.setdefault("results", {}).update({name: [r for r in rows if r["section"] == name] for name in sections})
+
+    print(f"{'section':>9} | {'config':<45} | {'mean ms':>7} | {'FPS':>6}")
+    for r in rows:
+        ms = f"{r['mean_ms']:7.1f}" if r["mean_ms"] is not None else f"{'-':>7}"
+        print(f"{r['section']:>9} | {json.dumps(r['config']):<45} | {ms} | {r['fps']:6.1f}")
+    with open(out_path, "w") as f:
+        json.dump(profile, f, indent=2)
+    print(f"🏁 latency: {profile.get('latency')}\n🏁 throughput: {profile.get('throughput')}\n(saved to {out_path})")
+    return profile
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Tune threads/streams/workers for this host")
+    ap.add_argument("--source", default=None, help="image folder or video file (default: webcam)")
+    ap.add_argument("--frames", type=int, default=TUNE_FRAMES)
+    ap.add_argument("--only", nargs="+", default=list(SECTIONS), choices=list(SECTIONS))
+    args = ap.parse_args(argv)
+
+    from detection_engine import load_frames
+    import cv2
+    frames = load_frames(args.source, args.frames)
+    if not frames:
+        print("No frames to tune on.")
+        return 1
+    frames = [cv2.resize(f, (640, 480)) for f in frames]   # one shape, so the pool's ring fits them all
+    tune(frames, args.only)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+# batch_inference.py
+# In-process YOLO inference service: any number of producers submit single frames,
+# one worker thread groups them into batches (bounded by size and wait time),
+# runs the model once per batch and routes each result back to its caller.
+import os, sys, time, threading, queue
+from concurrent.futures import Future
+
+import numpy as np
+
+MODEL_PT = "yolo11n.pt"
+IMG_SIZE = 416
+CONF_TH = 0.30
+MAX_BATCH_SIZE = 8     # frames per model call
+MAX_WAIT_MS = 10       # how long the first frame of a batch may wait for company
+
+# ---- benchmark settings ----
+BENCH_BATCH_SIZES = (1, 2, 4, 8)
+BENCH_FRAMES = 64
+BENCH_PRODUCERS = 8
+
+_STOP = object()
+
+
+class BatchedInferenceService:
+    """
+    Collects frames from many threads and runs them through `infer_batch` together.
+
+    `infer_batch(frames)` gets a list of frames and must return one result per frame,
+    in the same order. `submit(frame)` returns a Future holding that frame's result.
+    """
+
+    def __init__(self, infer_batch, max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS):
+        self.infer_batch = infer_batch
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, max_wait_ms / 1000.0)
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()   # orders submit() against stop(): nothing gets queued behind _STOP
+        # stats
+        self.batches = 0
+        self.frames = 0
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="batch-inference", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is not None:
+                self._queue.put(_STOP)
+        if thread is not None:
+            thread.join(timeout)
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def submit(self, frame):
+        fut = Future()
+        with self._lock:
+            if self._thread is None:
+                raise RuntimeError("inference service is not running (call start() first)")
+            self._queue.put((frame, fut))
+        return fut
+
+    def infer(self, frame, timeout=None):
+        """Blocking convenience wrapper around submit()."""
+        return self.submit(frame).result(timeout)
+
+    @property
+    def mean_batch_size(self):
+        return self.frames / max(1, self.batches)
+
+    def _collect(self, first):
+        """Gather more queued frames until the batch is full or the wait budget is spent."""
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch, stopping = self._collect(item)
+            self._run_batch(batch)
+            if stopping:
+                break
+        # fail anything that was queued behind the stop request
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                item[1].set_exception(RuntimeError("inference service stopped"))
+
+    def _run_batch(self, batch):
+        frames = [frame for frame, _ in batch]
+        try:
+            results = self.infer_batch(frames)
+            if len(results) != len(frames):
+                raise RuntimeError(f"infer_batch returned {len(results)} results for {len(frames)} frames")
+        except Exception as e:
+            for _, fut in batch:
+                fut.set_exception(e)
+            return
+        self.batches += 1
+        self.frames += len(frames)
+        for (_, fut), res in zip(batch, results):
+            fut.set_result(res)
+
+
+def ultralytics_batch_fn(model_pt=MODEL_PT, imgsz=IMG_SIZE, conf=CONF_TH, scheduler=None, **predict_kwargs):
+    """
+    Return an infer_batch() that runs an ultralytics YOLO model on a list of frames.
+    With an input_scheduler.InputSizeScheduler, imgsz follows the scheduler batch by batch.
+    """
+    from ultralytics import YOLO
+    model = YOLO(model_pt)
+
+    def infer_batch(frames):
+        if scheduler is None:
+            return model(frames, imgsz=imgsz, conf=conf, device="cpu", verbose=False, **predict_kwargs)
+        t0 = time.perf_counter()
+        out = model(frames, imgsz=scheduler.size, conf=conf, device="cpu", verbose=False, **predict_kwargs)
+        scheduler.observe((time.perf_counter() - t0) * 1000.0)  # every frame in the batch waits this long
+        return out
+
+    return infer_batch
+
+
+def benchmark(infer_batch=None, batch_sizes=BENCH_BATCH_SIZES, n_frames=BENCH_FRAMES,
+              producers=BENCH_PRODUCERS, frame_shape=(480, 640, 3)):
+    """Throughput (frames/s) of the service for each max batch size, on synthetic frames."""
+    if infer_batch is None:
+        infer_batch = ultralytics_batch_fn()
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 255, frame_shape, dtype=np.uint8)
+
+    infer_batch([frame])  # warm-up, keeps model load out of the numbers
+    rows = []
+    for bs in batch_sizes:
+        with BatchedInferenceService(infer_batch, max_batch_size=bs) as svc:
+            per_producer = max(1, n_frames // producers)
+
+            def producer():
+                for _ in range(per_producer):
+                    svc.infer(frame)
+
+            threads = [threading.Thread(target=producer) for _ in range(producers)]
+            t0 = time.perf_counter()
+            for t in threads: t.start()
+            for t in threads: t.join()
+            dt = time.perf_counter() - t0
+            rows.append((bs, svc.frames / dt, svc.mean_batch_size, 1000.0 * dt / max(1, svc.batches)))
+
+    print(f"{'max_batch':>9} | {'FPS':>7} | {'mean batch':>10} | {'ms/batch':>8}")
+    for bs, fps, mean_bs, ms in rows:
+        print(f"{bs:>9} | {fps:7.1f} | {mean_bs:10.2f} | {ms:8.1f}")
+    return rows
+
+
+if __name__ == "__main__":
+    torch_threads = os.environ.get("TORCH_THREADS")
+    if torch_threads:
+        import torch
+        torch.set_num_threads(int(torch_threads))
+    sizes = tuple(int(a) for a in sys.argv[1:]) or BENCH_BATCH_SIZES
+    benchmark(batch_sizes=sizes)
@@ -0,0 +1,297 @@
+# detection_engine.py
+# One detect(frame) -> (boxes, scores, class_ids) interface over the detector stacks
+# we use: ultralytics (PyTorch), OpenVINO IR and ONNX Runtime.
+#
+#   boxes     float32 [N,4]  x1,y1,x2,y2 in frame pixels
+#   scores    float32 [N]
+#   class_ids int64   [N]
+#
+# Backend is picked by config: create_engine("openvino"), the DETECTOR_BACKEND env var,
+# or "auto" = whichever backend won the last `python detection_engine.py bench` on this host.
+import os, sys, time, json, glob, argparse
+
+import numpy as np
+import cv2
+
+import ov_detection
+from ov_detection import MODEL_PT, IMG_SIZE, CONF_TH, IOU_TH, CLASS_FILTER
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BACKEND = "ultralytics"
+ONNX_PATH = "yolo11n.onnx"
+BENCH_RESULT = os.path.join(HERE, "engine_benchmark.json")   # written by `bench`, read by "auto"; per host, gitignored
+BENCH_FRAMES = 100
+BENCH_WARMUP = 5
+
+
+def _empty():
+    return np.zeros((0,4), np.float32), np.zeros((0,), np.float32), np.zeros((0,), np.int64)
+
+
+class DetectionEngine:
+    """Base class. Subclasses implement detect(); everything else is shared."""
+    name = "base"
+
+    def __init__(self, imgsz=IMG_SIZE, conf=CONF_TH, iou=IOU_TH, classes=CLASS_FILTER):
+        self.imgsz = imgsz
+        self.conf = conf
+        self.iou = iou
+        self.classes = classes
+
+    def detect(self, frame):
+        raise NotImplementedError
+
+    def __call__(self, frame):
+        return self.detect(frame)
+
+    def detect_batch(self, frames):
+        """detect() over several frames; backends that can batch natively override this."""
+        return [self.detect(f) for f in frames]
+
+    def warmup(self, runs=ov_detection.WARMUP_RUNS, frame_shape=(480,640,3)):
+        """Run detect() on a blank frame so lazy init/allocation happens before the first real frame."""
+        t0 = time.perf_counter()
+        blank = np.zeros(frame_shape, np.uint8)
+        for _ in range(runs):
+            self.detect(blank)
+        return time.perf_counter() - t0
+
+
+class UltralyticsEngine(DetectionEngine):
+    name = "ultralytics"
+
+    def __init__(self, model_pt=MODEL_PT, **kwargs):
+        super().__init__(**kwargs)
+        import autotune
+        autotune.apply_torch_threads("latency")   # no-op until autotune.py has run on this host
+        from ultralytics import YOLO
+        self.model = YOLO(model_pt)
+
+    def _predict(self, source):
+        classes = sorted(self.classes) if self.classes is not None else None
+        return self.model(source, imgsz=self.imgsz, conf=self.conf, iou=self.iou, classes=classes,
+                          device="cpu", verbose=False)
+
+    @staticmethod
+    def _unpack(r):
+        if r.boxes is None or not len(r.boxes):
+            return _empty()
+        return (r.boxes.xyxy.cpu().numpy().astype(np.float32),
+                r.boxes.conf.cpu().numpy().astype(np.float32),
+                r.boxes.cls.cpu().numpy().astype(np.int64))
+
+    def detect(self, frame):
+        return self._unpack(self._predict(frame)[0])
+
+    def detect_batch(self, frames):
+        return [self._unpack(r) for r in self._predict(list(frames))]
+
+
+class _RawYoloEngine(DetectionEngine):
+    """Shared pre/postprocess for backends that hand back the raw YOLO output tensor."""
+    prep = None   # frame -> (blob, scale, pad); float32 NCHW preprocess() unless a backend sets one
+
+    def _infer(self, blob):
+        raise NotImplementedError
+
+    def detect(self, frame):
+        if self.prep is not None:
+            blob, scale, pad = self.prep(frame)
+        else:
+            blob, scale, pad = ov_detection.preprocess(frame, self.imgsz)
+        pred = self._infer(blob)
+        return ov_detection.postprocess(pred[0], scale, pad, frame.shape,
+                                        conf_th=self.conf, iou_th=self.iou, class_filter=self.classes)
+
+
+class OpenVINOEngine(_RawYoloEngine):
+    name = "openvino"
+
+    def __init__(self, ir_dir=None, device="CPU", config=None, u8_input=ov_detection.USE_U8_IR,
+                 precision=ov_detection.IR_PRECISION, **kwargs):
+        super().__init__(**kwargs)
+        self.ir_dir = ir_dir or ov_detection.ir_dir_for(precision)
+        self.ir_xml, self.prep = ov_detection.make_preprocessor(u8_input, self.imgsz)
+        self.config = config or ov_detection.ov_config("LATENCY")
+        self.device = device
+        self.compiled = ov_detection.compile_ir(self.ir_dir, self.ir_xml, self.config, device, img_size=self.imgsz)
+        self.request = self.compiled.create_infer_request()
+        self.output = self.compiled.outputs[0]
+        self._batch_request = None   # dynamic-batch copy of the model, compiled on first detect_batch()
+
+    def _infer(self, blob):
+        return self.request.infer({0: blob}, share_inputs=True)[self.output]
+
+    def detect_batch(self, frames):
+        if len(frames) < 2:
+            return [self.detect(f) for f in frames]
+        if self._batch_request is None:
+            compiled = ov_detection.compile_ir(self.ir_dir, self.ir_xml, self.config, self.device,
+                                               img_size=self.imgsz, dynamic_batch=True)
+            self._batch_request = compiled.create_infer_request()
+            self._batch_output = compiled.outputs[0]
+        batch, metas = None, []
+        for i, f in enumerate(frames):
+            blob, scale, pad = self.prep(f)   # the u8 prep reuses one buffer, so copy out per frame
+            if batch is None:
+                batch = np.empty((len(frames),) + blob.shape[1:], blob.dtype)
+            batch[i] = blob[0]
+            metas.append((scale, pad, f.shape))
+        pred = self._batch_request.infer({0: batch}, share_inputs=True)[self._batch_output]
+        return [ov_detection.postprocess(pred[i], scale, pad, shape, conf_th=self.conf, iou_th=self.iou,
+                                         class_filter=self.classes)
+                for i, (scale, pad, shape) in enumerate(metas)]
+
+
+def onnx_path_for(imgsz=IMG_SIZE):
+    """The export is static-shape, so every input size gets its own file."""
+    return ONNX_PATH if imgsz == IMG_SIZE else f"yolo11n_{imgsz}.onnx"
+
+
+def export_onnx(path=ONNX_PATH, imgsz=IMG_SIZE):
+    if os.path.isfile(path):
+        return path
+    from ultralytics import YOLO
+    exported = YOLO(MODEL_PT).export(format="onnx", imgsz=imgsz, dynamic=False, simplify=True)
+    if os.path.abspath(exported) != os.path.abspath(path):
+        os.replace(exported, path)
+    return path
+
+
+class OnnxRuntimeEngine(_RawYoloEngine):
+    name = "onnxruntime"
+
+    def __init__(self, onnx_path=None, providers=("CPUExecutionProvider",), **kwargs):
+        super().__init__(**kwargs)
+        import onnxruntime as ort
+        onnx_path = onnx_path or export_onnx(onnx_path_for(self.imgsz), imgsz=self.imgsz)
+        options = ort.SessionOptions()
+        if ov_detection.thread_budget():
+            options.intra_op_num_threads = ov_detection.thread_budget()
+        self.session = ort.InferenceSession(onnx_path, options, providers=list(providers))
+        self.input_name = self.session.get_inputs()[0].name
+
+    def _infer(self, blob):
+        return self.session.run(None, {self.input_name: blob})[0]
+
+
+BACKENDS = {
+    UltralyticsEngine.name: UltralyticsEngine,
+    OpenVINOEngine.name: OpenVINOEngine,
+    OnnxRuntimeEngine.name: OnnxRuntimeEngine,
+}
+
+
+def fastest_backend(default=DEFAULT_BACKEND):
+    """Backend that won the last benchmark on this host (or `default` if none was run)."""
+    try:
+        with open(BENCH_RESULT) as f:
+            return json.load(f)["fastest"]
+    except (OSError, KeyError, ValueError):
+        return default
+
+
+def create_engine(backend=None, **kwargs):
+    """
+    Build a detection engine. `backend` falls back to $DETECTOR_BACKEND, then DEFAULT_BACKEND.
+    "auto" picks the fastest backend from the last benchmark run.
+    """
+    backend = backend or os.environ.get("DETECTOR_BACKEND") or DEFAULT_BACKEND
+    if backend == "auto":
+        backend = fastest_backend()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown detector backend '{backend}'. Choose from: {', '.join(BACKENDS)} or auto")
+    return BACKENDS[backend](**kwargs)
+
+
+# ---- benchmark ----
+def load_frames(source=None, n=BENCH_FRAMES):
+    """Frames from an image folder, a video file, or the webcam (source=None)."""
+    if source and os.path.isdir(source):
+        paths = sorted(p for ext in ("*.jpg", "*.jpeg", "*.png") for p in glob.glob(os.path.join(source, ext)))
+        frames = []
+        for p in paths:
+            if len(frames) == n:
+                break
+            frame = cv2.imread(p)
+            if frame is None:
+                print(f"⚠️ Skipping unreadable image {p}")
+                continue
+            frames.append(frame)
+        if not frames:
+            raise ValueError(f"No readable images in '{source}'")
+        return frames
+    cap = cv2.VideoCapture(source if source else 0)
+    frames = []
+    while len(frames) < n:
+        ok, frame = cap.read()
+        if not ok: break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def benchmark(frames, backends=tuple(BACKENDS), warmup=BENCH_WARMUP, **kwargs):
+    """Run every backend over the same frames. Returns {backend: stats} and records the fastest."""
+    results = {}
+    for name in backends:
+        try:
+            t0 = time.perf_counter()
+            engine = create_engine(name, **kwargs)
+            load_s = time.perf_counter() - t0
+        except Exception as e:
+            print(f"⚠️ {name}: unavailable ({e})")
+            continue
+        for f in frames[:warmup]:
+            engine.detect(f)
+        lat = []
+        n_det = 0
+        for f in frames:
+            t = time.perf_counter()
+            boxes, _, _ = engine.detect(f)
+            lat.append(time.perf_counter() - t)
+            n_det += len(boxes)
+        lat_ms = np.array(lat) * 1000.0
+        results[name] = {
+            "load_s": round(load_s, 3),
+            "mean_ms": round(float(lat_ms.mean()), 2),
+            "p50_ms": round(float(np.percentile(lat_ms, 50)), 2),
+            "p95_ms": round(float(np.percentile(lat_ms, 95)), 2),
+            "fps": round(1000.0 / float(lat_ms.mean()), 1),
+            "detections": n_det,
+        }
+
+    print(f"{'backend':>12} | {'load s':>6} | {'mean ms':>7} | {'p50 ms':>6} | {'p95 ms':>6} | {'FPS':>6} | dets")
+    for name, r in results.items():
+        print(f"{name:>12} | {r['load_s']:6.2f} | {r['mean_ms']:7.2f} | {r['p50_ms']:6.2f} | "
+              f"{r['p95_ms']:6.2f} | {r['fps']:6.1f} | {r['detections']}")
+    if results:
+        fastest = min(results, key=lambda k: results[k]["mean_ms"])
+        with open(BENCH_RESULT, "w") as f:
+            json.dump({"fastest": fastest, "imgsz": kwargs.get("imgsz", IMG_SIZE),
+                       "frames": len(frames), "results": results}, f, indent=2)
+        print(f"🏁 Fastest on this host: {fastest} (saved to {BENCH_RESULT})")
+    return results
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Detection engine tools")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("bench", help="compare backends on the same frames")
+    b.add_argument("--source", default=None, help="image folder or video file (default: webcam)")
+    b.add_argument("--frames", type=int, default=BENCH_FRAMES)
+    b.add_argument("--imgsz", type=int, default=IMG_SIZE)
+    b.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=list(BACKENDS))
+    args = ap.parse_args(argv)
+
+    if args.cmd == "bench":
+        frames = load_frames(args.source, args.frames)
+        if not frames:
+            print("No frames to benchmark.")
+            return 1
+        benchmark(frames, args.backends, imgsz=args.imgsz)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+# hybrid_tracker.py
+# Follow one target without running the detector on every frame: detect every N frames
+# (or when tracking gets shaky) and carry the box forward in between with sparse
+# Lucas-Kanade optical flow on a downscaled grey image, which costs ~1-3 ms on a Pi-class CPU.
+# N adapts to how fast the target moves and to how expensive the detector is on this host.
+import os, sys, time, math
+
+import numpy as np
+import cv2
+
+TARGET_CLASS_ID = 0        # person
+MIN_INTERVAL = 1           # detect every N frames, N in [MIN_INTERVAL, MAX_INTERVAL]
+MAX_INTERVAL = 12
+START_INTERVAL = 4
+FRAME_BUDGET_MS = 33.0     # per-frame time we want to stay under on average (~30 control updates/s)
+LOW_MOTION = 0.02          # box-diagonal fractions per frame: below -> stretch N, above HIGH -> shrink N
+HIGH_MOTION = 0.08
+MIN_QUALITY = 0.5          # fraction of flow points that survive the forward-backward check
+TRACK_SCALE = 0.5          # optical flow runs on a downscaled image
+MAX_POINTS = 40
+MIN_POINTS = 6
+FB_MAX_PX = 1.5            # forward-backward error limit, in downscaled pixels
+
+
+def _iou(a, b):
+    x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+    x2, y2 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0.0, x2 - x1) * max(0.0, y2 - y1)
+    union = (a[2]-a[0])*(a[3]-a[1]) + (b[2]-b[0])*(b[3]-b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+class HybridTracker:
+    """
+    update(frame) -> (box, score, detected)
+
+    box is x1,y1,x2,y2 in frame pixels (None while nothing is locked), score is the last
+    detector score, detected says whether this frame ran the detector or only the flow tracker.
+    `detector` is any callable frame -> (boxes, scores, class_ids), e.g. a detection_engine engine.
+    `select(boxes, class_ids, frame_shape) -> index or None` picks the target on detector frames
+    (e.g. SteeringEstimator.select); without it: best overlap with the current box, else top score.
+    """
+
+    def __init__(self, detector, target_class=TARGET_CLASS_ID, min_interval=MIN_INTERVAL,
+                 max_interval=MAX_INTERVAL, frame_budget_ms=FRAME_BUDGET_MS, select=None):
+        self.detector = detector
+        self.target_class = target_class
+        self.select = select
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.frame_budget_ms = frame_budget_ms
+
+        self.box = None
+        self.score = 0.0
+        self.interval = min(max_interval, max(min_interval, START_INTERVAL))
+        self.since_detect = 0
+        self.quality = 1.0        # last flow step's surviving-point fraction
+        self.motion = 0.0         # last flow step's displacement / box diagonal
+        self._prev_gray = None
+        # stats
+        self.detect_ms = None     # EMA of detector latency
+        self.track_ms = None      # EMA of flow latency
+        self.n_detect = 0
+        self.n_track = 0
+
+    # ---- public ----
+    def update(self, frame):
+        gray = self._gray(frame)
+        need_detect = (self.box is None or self._prev_gray is None
+                       or self.since_detect + 1 >= self.interval)
+        if not need_detect:
+            t0 = time.perf_counter()
+            ok = self._track(gray)
+            self.track_ms = self._ema(self.track_ms, (time.perf_counter() - t0) * 1000.0)
+            if ok:
+                self.n_track += 1
+                self.since_detect += 1
+                self._prev_gray = gray
+                return self.box, self.score, False
+            # flow lost the target (occlusion, blur, too few points): fall back to the detector
+        self._detect(frame)
+        self._prev_gray = gray
+        return self.box, self.score, True
+
+    def reset(self):
+        self.box = None
+        self.score = 0.0
+        self.since_detect = 0
+        self.quality = 1.0
+        self.motion = 0.0
+        self.interval = min(self.max_interval, max(self.min_interval, START_INTERVAL))
+
+    @property
+    def detect_ratio(self):
+        return self.n_detect / max(1, self.n_detect + self.n_track)
+
+    # ---- detection ----
+    def _detect(self, frame):
+        t0 = time.perf_counter()
+        boxes, scores, ids = self.detector(frame)
+        self.detect_ms = self._ema(self.detect_ms, (time.perf_counter() - t0) * 1000.0)
+        self.n_detect += 1
+        self.since_detect = 0
+
+        if self.select is not None:
+            i = self.select(boxes, ids, frame.shape)
+            m = np.arange(len(boxes)) == (-1 if i is None else i)   # None: nobody to follow
+        else:
+            m = ids == self.target_class
+        boxes, scores = boxes[m], scores[m]
+        if not len(boxes):
+            self.box = None
+            self.score = 0.0
+            self.interval = self.min_interval
+            return
+        if len(boxes) == 1:
+            i = 0
+        elif self.box is not None:
+            # keep the lock on the same person: best overlap with where we think they are
+            ious = np.array([_iou(self.box, b) for b in boxes])
+            i = int(ious.argmax()) if ious.max() > 0 else int(scores.argmax())
+        else:
+            i = int(scores.argmax())
+        self.box = tuple(float(v) for v in boxes[i])
+        self.score = float(scores[i])
+        self._adapt_interval()
+
+    def _adapt_interval(self):
+        if self.motion > HIGH_MOTION or self.quality < MIN_QUALITY:
+            self.interval = max(self.min_interval, self.interval // 2)
+        elif self.motion < LOW_MOTION:
+            self.interval = min(self.max_interval, self.interval + 1)
+        # never detect more often than the CPU budget allows: one detect + (N-1) flow steps
+        # must average out to frame_budget_ms
+        if self.detect_ms is not None and self.detect_ms > self.frame_budget_ms:
+            track_ms = self.track_ms or 0.0
+            slack = max(1e-3, self.frame_budget_ms - track_ms)
+            self.interval = max(self.interval, math.ceil((self.detect_ms - track_ms) / slack))
+        self.interval = int(min(self.max_interval, max(self.min_interval, self.interval)))
+
+    # ---- optical flow ----
+    def _gray(self, frame):
+        g = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        if TRACK_SCALE != 1.0:
+            g = cv2.resize(g, None, fx=TRACK_SCALE, fy=TRACK_SCALE, interpolation=cv2.INTER_AREA)
+        return g
+
+    def _track(self, gray):
+        s = TRACK_SCALE
+        x1, y1, x2, y2 = (v * s for v in self.box)
+        h, w = gray.shape[:2]
+        # sample features from the inner part of the box to stay off the background
+        bw, bh = x2 - x1, y2 - y1
+        ix1, iy1 = int(max(0, x1 + 0.15*bw)), int(max(0, y1 + 0.1*bh))
+        ix2, iy2 = int(min(w, x2 - 0.15*bw)), int(min(h, y2 - 0.1*bh))
+        if ix2 - ix1 < 4 or iy2 - iy1 < 4:
+            return False
+        mask = np.zeros_like(self._prev_gray)
+        mask[iy1:iy2, ix1:ix2] = 255
+        pts = cv2.goodFeaturesToTrack(self._prev_gray, MAX_POINTS, 0.01, 3, mask=mask)
+        if pts is None or len(pts) < MIN_POINTS:
+            return False
+        nxt, st, _ = cv2.calcOpticalFlowPyrLK(self._prev_gray, gray, pts, None, winSize=(15, 15), maxLevel=2)
+        back, st2, _ = cv2.calcOpticalFlowPyrLK(gray, self._prev_gray, nxt, None, winSize=(15, 15), maxLevel=2)
+        fb = np.linalg.norm((pts - back).reshape(-1, 2), axis=1)
+        good = (st.ravel() == 1) & (st2.ravel() == 1) & (fb < FB_MAX_PX)
+        self.quality = float(good.mean())
+        if good.sum() < MIN_POINTS or self.quality < MIN_QUALITY:
+            return False
+
+        p0, p1 = pts[good].reshape(-1, 2), nxt[good].reshape(-1, 2)
+        dx, dy = np.median(p1 - p0, axis=0)
+        # scale from the change in spread around the median point
+        d0 = np.linalg.norm(p0 - np.median(p0, axis=0), axis=1)
+        d1 = np.linalg.norm(p1 - np.median(p1, axis=0), axis=1)
+        valid = d0 > 1e-3
+        scale = float(np.clip(np.median(d1[valid] / d0[valid]), 0.8, 1.25)) if valid.any() else 1.0
+
+        cx, cy = (x1 + x2) / 2 + dx, (y1 + y2) / 2 + dy
+        bw, bh = bw * scale, bh * scale
+        self.motion = float(math.hypot(dx, dy) / max(1e-6, math.hypot(bw, bh)))
+        W, H = w / s, h / s
+        box = ((cx - bw/2) / s, (cy - bh/2) / s, (cx + bw/2) / s, (cy + bh/2) / s)
+        self.box = (min(max(box[0], 0.0), W-1), min(max(box[1], 0.0), H-1),
+                    min(max(box[2], 0.0), W-1), min(max(box[3], 0.0), H-1))
+        return self.box[2] - self.box[0] > 2 and self.box[3] - self.box[1] > 2
+
+    @staticmethod
+    def _ema(prev, value, alpha=0.2):
+        return value if prev is None else (1 - alpha) * prev + alpha * value
+
+
+def benchmark(source=0, n_frames=300, backend=None):
+    """Control updates per second: detector on every frame vs HybridTracker, same frames."""
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from detection_engine import create_engine, load_frames
+    frames = load_frames(source, n_frames)
+    if not frames:
+        print("No frames to benchmark.")
+        return
+    engine = create_engine(backend)
+    engine.warmup()
+
+    t0 = time.perf_counter()
+    for f in frames:
+        engine.detect(f)
+    full = len(frames) / (time.perf_counter() - t0)
+
+    tracker = HybridTracker(engine)
+    t0 = time.perf_counter()
+    for f in frames:
+        tracker.update(f)
+    hybrid = len(frames) / (time.perf_counter() - t0)
+
+    print(f"every frame: {full:6.1f} updates/s")
+    print(f"hybrid     : {hybrid:6.1f} updates/s ({hybrid / full:.1f}x) | detector on "
+          f"{100 * tracker.detect_ratio:.0f}% of frames | detect {tracker.detect_ms or 0:.1f} ms, "
+          f"flow {tracker.track_ms or 0:.1f} ms | final N={tracker.interval}")
+
+
+if __name__ == "__main__":
+    benchmark(sys.argv[1] if len(sys.argv) > 1 else None)
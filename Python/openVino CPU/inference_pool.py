@@ -0,0 +1,260 @@
+# inference_pool.py
+# Run the detector in several worker processes, each with its own model, so capture, drawing
+# and inference no longer share one GIL. Frames travel through a multiprocessing.shared_memory
+# ring buffer (one memcpy into a slot, nothing pickled); only the small detection arrays come
+# back over a queue. Results are handed out in submission order.
+#
+#   python inference_pool.py [video|image folder] [worker counts...]   FPS scaling benchmark
+import os, sys, time, queue
+import multiprocessing as mp
+from collections import deque
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import autotune
+from ov_detection import InOrderBuffer, THREAD_BUDGET_ENV
+
+FRAME_SHAPE = (480, 640, 3)
+SLOTS_PER_WORKER = 2          # one being inferred, one queued
+READY_TIMEOUT_S = 300        # model load + compile + warm-up per worker (slow on a Pi without a model cache)
+POLL_S = 1.0                 # how often a blocked wait checks that the workers are still alive
+BENCH_WORKERS = (1, 2, 3, 4)
+BENCH_FRAMES = 200
+
+
+class SharedFrameRing:
+    """n_slots frames of one fixed shape in a single shared memory block."""
+
+    def __init__(self, n_slots, frame_shape=FRAME_SHAPE, dtype=np.uint8, name=None):
+        self.n_slots = n_slots
+        self.frame_shape = tuple(frame_shape)
+        self.dtype = np.dtype(dtype)
+        nbytes = n_slots * int(np.prod(self.frame_shape)) * self.dtype.itemsize
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=nbytes if self.owner else 0)
+        if not self.owner:
+            # attaching registers the block with the resource tracker, which would then "clean up"
+            # (unlink) the owner's memory when this process exits
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(self.shm._name, "shared_memory")
+        self.frames = np.ndarray((n_slots,) + self.frame_shape, self.dtype, buffer=self.shm.buf)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def close(self):
+        del self.frames   # drop the view first, SharedMemory.close() refuses while it is exported
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def default_detector():
+    """Worker-side factory: the configured detection engine, warmed up."""
+    from detection_engine import create_engine
+    engine = create_engine()
+    engine.warmup()
+    return engine
+
+
+def _worker(make_detector, ring_args, tasks, results, threads):
+    if threads:
+        # each worker gets a slice of the cores instead of every process fighting over all of them;
+        # OpenVINO ignores OMP, it reads the budget through ov_detection.ov_config()
+        os.environ["OMP_NUM_THREADS"] = str(threads)
+        os.environ[THREAD_BUDGET_ENV] = str(threads)
+        import cv2
+        cv2.setNumThreads(threads)
+    ring = SharedFrameRing(*ring_args)
+    try:
+        try:
+            detector = make_detector()
+        except Exception as e:
+            results.put(("failed", None, e))
+            return
+        if "torch" in sys.modules and threads:
+            sys.modules["torch"].set_num_threads(threads)
+        results.put(("ready", None, None))
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            seq, slot = task
+            try:
+                out = detector(ring.frames[slot])
+            except Exception as e:   # hand it to the caller instead of killing the worker
+                out = e
+            results.put((seq, slot, out))
+    finally:
+        ring.close()
+
+
+class InferencePool:
+    """
+    with InferencePool(workers=3) as pool:
+        pool.submit(frame)          # blocks only when every slot is in flight
+        seq, (boxes, scores, ids) = pool.get()
+
+    make_detector runs inside each worker, so it must be picklable (a module-level function
+    or functools.partial) and return a callable frame -> result.
+    """
+
+    def __init__(self, make_detector=default_detector, workers=None, frame_shape=FRAME_SHAPE,
+                 slots=None, threads_per_worker=None, ready_timeout=READY_TIMEOUT_S):
+        # tuned worker count if autotune.py has run, else leave a core for capture/drawing
+        self.workers = workers or autotune.best_workers() or max(1, (os.cpu_count() or 1) - 1)
+        threads = threads_per_worker or max(1, (os.cpu_count() or 1) // self.workers)
+        self.ring = SharedFrameRing(slots or SLOTS_PER_WORKER * self.workers, frame_shape)
+        self._free = deque(range(self.ring.n_slots))
+        self._ctx = mp.get_context("spawn")   # fork + an already-initialised inference runtime is asking for trouble
+        self._tasks = self._ctx.Queue()
+        self._results = self._ctx.Queue()
+        self._order = InOrderBuffer()
+        self._ready = deque()
+        self._next_seq = 0
+        self._in_flight = 0
+        ring_args = (self.ring.n_slots, self.ring.frame_shape, self.ring.dtype, self.ring.name)
+        self._procs = [self._ctx.Process(target=_worker, daemon=True, name=f"infer-{i}",
+                                         args=(make_detector, ring_args, self._tasks, self._results, threads))
+                       for i in range(self.workers)]
+        for p in self._procs:
+            p.start()
+        try:
+            self._wait_ready(ready_timeout)
+        except BaseException:
+            self.close()
+            raise
+
+    def _wait_ready(self, timeout):
+        """Wait for every model to load so timing starts clean; a worker that dies silently (segfault, OOM kill) fails it."""
+        deadline = time.monotonic() + timeout
+        ready = 0
+        while ready < len(self._procs):
+            try:
+                status, _, err = self._results.get(timeout=POLL_S)
+            except queue.Empty:
+                self._check_workers("before it was ready")
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"inference workers not ready after {timeout:.0f} s")
+                continue
+            if status == "failed":
+                raise err
+            ready += 1
+
+    def submit(self, frame):
+        """Copy `frame` into a free slot and queue it. Returns its sequence number."""
+        while not self._free:
+            self._collect()
+        slot = self._free.popleft()
+        np.copyto(self.ring.frames[slot], frame)
+        seq = self._next_seq
+        self._next_seq += 1
+        self._in_flight += 1
+        self._tasks.put((seq, slot))
+        return seq
+
+    def get(self, timeout=None):
+        """Next result in submission order: (seq, result). Raises queue.Empty on timeout."""
+        while not self._ready:
+            if not self._in_flight and not len(self._order):
+                raise queue.Empty
+            self._collect(timeout)
+        seq, out = self._ready.popleft()
+        if isinstance(out, Exception):
+            raise out
+        return seq, out
+
+    def __iter__(self):
+        """Remaining results in order, until nothing is left in flight."""
+        while True:
+            try:
+                yield self.get()
+            except queue.Empty:
+                return
+
+    def _collect(self, timeout=None):
+        """Take one result off the queue. Polls, so a worker killed with frames in flight raises instead of hanging."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = POLL_S if deadline is None else min(POLL_S, max(0.0, deadline - time.monotonic()))
+            try:
+                seq, slot, out = self._results.get(timeout=wait)
+                break
+            except queue.Empty:
+                self._check_workers("with frames in flight")
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise
+        self._free.append(slot)
+        self._in_flight -= 1
+        self._order.push(seq, (seq, out))
+        self._ready.extend(self._order.pop_ready())
+
+    def _check_workers(self, when):
+        dead = [p for p in self._procs if not p.is_alive()]
+        if dead:
+            names = ", ".join(f"{p.name} (exit code {p.exitcode})" for p in dead)
+            raise RuntimeError(f"inference worker {names} exited {when}")
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    def close(self):
+        for _ in self._procs:
+            self._tasks.put(None)
+        for p in self._procs:
+            p.join(5)
+            if p.is_alive():
+                p.terminate()
+        self.ring.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def measure_fps(frames, workers, make_detector=default_detector):
+    """Frames/s of a pool with `workers` processes, keeping every slot busy."""
+    with InferencePool(make_detector, workers=workers, frame_shape=frames[0].shape) as pool:
+        t0 = time.perf_counter()
+        for f in frames:
+            if pool.in_flight == pool.ring.n_slots:
+                pool.get()
+            pool.submit(f)
+        for _ in pool:
+            pass
+        return len(frames) / (time.perf_counter() - t0)
+
+
+def benchmark(source=None, worker_counts=BENCH_WORKERS, n_frames=BENCH_FRAMES):
+    """Frames/s with the detector in-process vs pools of increasing size, same frames."""
+    from detection_engine import load_frames
+    frames = load_frames(source, n_frames)
+    if not frames:
+        print("No frames to benchmark.")
+        return
+    import cv2
+    frames = [cv2.resize(f, FRAME_SHAPE[1::-1]) for f in frames]
+
+    detector = default_detector()
+    t0 = time.perf_counter()
+    for f in frames:
+        detector(f)
+    base = len(frames) / (time.perf_counter() - t0)
+    del detector
+    print(f"{'workers':>8} | {'FPS':>6} | speedup   ({os.cpu_count()} CPUs)")
+    print(f"{'inline':>8} | {base:6.1f} | 1.00x")
+
+    for n in worker_counts:
+        fps = measure_fps(frames, n)
+        print(f"{n:>8} | {fps:6.1f} | {fps / base:.2f}x")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    src = args.pop(0) if args and not args[0].isdigit() else None
+    benchmark(src, tuple(int(a) for a in args) or BENCH_WORKERS)
@@ -0,0 +1,119 @@
+# input_scheduler.py
+# Hold a per-frame latency target by moving the detector input size through a fixed ladder
+# of shapes. Latency is measured on every frame, so the size drops when the CPU gets busy
+# (telemetry bursts, recording, ...) and climbs back once there is headroom again.
+import os, time, threading
+
+INPUT_SIZES = (256, 320, 416, 512, 640)   # multiples of the 32 px YOLO stride
+TARGET_MS = float(os.environ.get("LATENCY_TARGET_MS", "60"))
+HEADROOM = 0.8        # step up only if the larger size is predicted to stay under HEADROOM x target
+HOLD_FRAMES = 10      # frames to observe after a switch before deciding again
+EMA_ALPHA = 0.2
+
+
+class InputSizeScheduler:
+    """
+    observe(latency_ms) -> size to use for the next frame.
+
+    Latency is smoothed with an EMA. Over target -> one step down. Under target with room to
+    spare -> one step up, predicting the larger size's cost from the pixel-count ratio.
+    `ready` (a container of sizes, None = all) limits the steps to sizes that can run right now.
+    """
+
+    def __init__(self, sizes=INPUT_SIZES, target_ms=TARGET_MS, start=None, headroom=HEADROOM,
+                 hold_frames=HOLD_FRAMES):
+        self.sizes = sorted(sizes)
+        self.target_ms = target_ms
+        self.headroom = headroom
+        self.hold_frames = hold_frames
+        self.index = self.sizes.index(start) if start in self.sizes else len(self.sizes) // 2
+        self.ema_ms = None
+        self.since_switch = 0
+        self.switches = 0
+        self.ready = None
+
+    @property
+    def size(self):
+        return self.sizes[self.index]
+
+    def observe(self, latency_ms):
+        self.ema_ms = latency_ms if self.ema_ms is None else (1 - EMA_ALPHA) * self.ema_ms + EMA_ALPHA * latency_ms
+        self.since_switch += 1
+        if self.since_switch < self.hold_frames:
+            return self.size
+        if self.ema_ms > self.target_ms and self.index > 0:
+            if self._usable(self.index - 1):
+                self._switch(-1)
+        elif self.index < len(self.sizes) - 1 and self._usable(self.index + 1):
+            bigger = self.sizes[self.index + 1]
+            predicted = self.ema_ms * (bigger / self.size) ** 2
+            if predicted < self.headroom * self.target_ms:
+                self._switch(+1)
+        return self.size
+
+    def _usable(self, index):
+        return self.ready is None or self.sizes[index] in self.ready
+
+    def _switch(self, step):
+        old = self.size
+        self.index += step
+        # rescale so the next decision starts from a sensible estimate, not the old size's latency
+        self.ema_ms *= (self.size / old) ** 2
+        self.since_switch = 0
+        self.switches += 1
+
+
+class AdaptiveEngine:
+    """
+    Detection engine that owns one engine per input size and lets an InputSizeScheduler pick
+    which one runs each frame. make_engine(imgsz) -> engine, e.g. lambda s: create_engine("openvino", imgsz=s).
+
+    The starting size is built here; the other sizes are built and warmed up on a background
+    thread, nearest to the start first, and the scheduler only steps onto a size once it's ready.
+    So detect() never compiles a model in the steering loop, and startup costs one build, not five.
+    background=False builds every size before returning instead.
+    """
+
+    def __init__(self, make_engine, sizes=INPUT_SIZES, target_ms=TARGET_MS, start=None, background=True):
+        self.scheduler = InputSizeScheduler(sizes, target_ms, start)
+        self.make_engine = make_engine
+        self.engines = {}
+        self.scheduler.ready = self.engines
+        first = self.scheduler.size
+        self.engines[first] = make_engine(first)
+        self.name = f"{self.engines[first].name}@adaptive"
+        rest = sorted((s for s in self.scheduler.sizes if s != first), key=lambda s: abs(s - first))
+        self._builder = threading.Thread(target=self._build, args=(rest,), daemon=True, name="adaptive-build")
+        if background:
+            self._builder.start()
+        else:
+            self._build(rest)
+
+    def _build(self, sizes):
+        for size in sizes:
+            engine = self.make_engine(size)
+            engine.warmup()               # before the scheduler can pick it, so its first frame isn't a cold one
+            self.engines[size] = engine   # a single dict store: the detect thread sees all or nothing
+
+    def wait_ready(self, timeout=None):
+        """Block until every size is built. True if they all are."""
+        if self._builder.is_alive():
+            self._builder.join(timeout)
+        return len(self.engines) == len(self.scheduler.sizes)
+
+    @property
+    def imgsz(self):
+        return self.scheduler.size
+
+    def detect(self, frame):
+        engine = self.engines[self.scheduler.size]
+        t0 = time.perf_counter()
+        out = engine.detect(frame)
+        self.scheduler.observe((time.perf_counter() - t0) * 1000.0)
+        return out
+
+    def __call__(self, frame):
+        return self.detect(frame)
+
+    def warmup(self, *args, **kwargs):
+        return self.engines[self.scheduler.size].warmup(*args, **kwargs)   # the rest warm up as they're built
@@ -1,8 +1,12 @@
 # ov_yolo11_webcam.py
-import os, time
+import os, sys, time, threading, queue
+from collections import deque
 import numpy as np
 import cv2
 
+import ov_postprocess
+from pool_region import load_region
+
 # ---- COCO labels ----
 COCO = [
     "person","bicycle","car","motorcycle","airplane","bus","train","truck","boat","traffic light",
@@ -17,11 +21,26 @@ COCO = [
 
 MODEL_PT = "yolo11n.pt"
 IR_DIR = "yolo11n_openvino_416"
+IR_XML = "yolo11n.xml"
+IR_U8_XML = "yolo11n_u8.xml"  # same net, takes the letterboxed uint8 NHWC BGR frame directly
+IR_PRECISION = "fp16"  # "fp32", "fp16" or "int8" (--precision); variants come from ov_quantize.py
 IMG_SIZE = 416        
 CONF_TH = 0.30
 IOU_TH  = 0.45
 CLASS_FILTER = None    #{0} for person-only, or None for all
 
+# ---- pipeline ----
+ASYNC_PIPELINE = True  # overlap capture/preprocess/infer/postprocess (--sync for the plain loop)
+PERF_HINT = "LATENCY"  # "LATENCY" or "THROUGHPUT" (--throughput)
+INFER_JOBS = 0         # infer requests in flight, 0 = OpenVINO's optimal number for the hint
+LAT_WINDOW = 100       # frames kept for latency percentiles
+USE_U8_IR = True       # layout/colour/scaling inside the graph, letterbox into a reused buffer
+
+# ---- startup ----
+CACHE_DIR = os.environ.get("OV_CACHE_DIR", "ov_cache")  # compiled-model cache, "" to disable
+THREAD_BUDGET_ENV = "OV_THREAD_BUDGET"  # set by inference_pool workers: CPU threads this process may use
+WARMUP_RUNS = 2        # inferences on a blank frame before we report ready
+
 # ---- utils ----
 def letterbox(img, new_shape=(416,416), color=(114,114,114)):
     h, w = img.shape[:2]
@@ -55,33 +74,232 @@ def nms_np(boxes, scores, th=0.45):
     return keep
 
 def export_openvino_ir():
-    if os.path.isdir(IR_DIR):
-        return IR_DIR
-    from ultralytics import YOLO
-    m = YOLO(MODEL_PT)
-    # export to OpenVINO IR (FP16) at 416 for speed
-    m.export(format="openvino", imgsz=IMG_SIZE, half=True, dynamic=False, simplify=True)
-    base = "yolo11n_openvino_model"
-    if os.path.isdir(base):
-        os.replace(base, IR_DIR)
-    else:
-        latest = None
-        for d in [p for p in os.listdir(".") if os.path.isdir(p)]:
-            if d.endswith("_openvino_model"):
-                latest = d
-        if latest:
-            os.replace(latest, IR_DIR)
+    if not os.path.isdir(IR_DIR):
+        from ultralytics import YOLO
+        m = YOLO(MODEL_PT)
+        # export to OpenVINO IR (FP16) at 416 for speed
+        m.export(format="openvino", imgsz=IMG_SIZE, half=True, dynamic=False, simplify=True)
+        base = "yolo11n_openvino_model"
+        if os.path.isdir(base):
+            os.replace(base, IR_DIR)
+        else:
+            latest = None
+            for d in [p for p in os.listdir(".") if os.path.isdir(p)]:
+                if d.endswith("_openvino_model"):
+                    latest = d
+            if latest:
+                os.replace(latest, IR_DIR)
+    if not os.path.isfile(os.path.join(IR_DIR, IR_U8_XML)):
+        build_u8_ir(IR_DIR)
     return IR_DIR
 
-def main():
-    ir = export_openvino_ir()
+def ir_dir_for(precision=IR_PRECISION):
+    """IR directory for the default FP16 export, or the FP32/INT8 variants built by ov_quantize."""
+    if precision == "fp16":
+        return export_openvino_ir()
+    import ov_quantize
+    return ov_quantize.export_variant(precision)
 
+def build_u8_ir(ir_dir=IR_DIR):
+    """
+    Save a copy of the IR that accepts the letterboxed frame as-is (uint8, NHWC, BGR).
+    PrePostProcessor folds the NHWC->NCHW transpose, BGR->RGB and /255 into the graph,
+    so the CPU plugin does them fused with the first conv instead of NumPy per frame.
+    """
     import openvino as ov
+    from openvino.preprocess import PrePostProcessor, ColorFormat
     core = ov.Core()
-    model = core.read_model(model=os.path.join(ir, "yolo11n.xml"))  
-    compiled = core.compile_model(model, "CPU", {"PERFORMANCE_HINT":"LATENCY"})
+    model = core.read_model(os.path.join(ir_dir, IR_XML))
+    ppp = PrePostProcessor(model)
+    ppp.input().tensor() \
+        .set_element_type(ov.Type.u8) \
+        .set_layout(ov.Layout("NHWC")) \
+        .set_color_format(ColorFormat.BGR)
+    ppp.input().model().set_layout(ov.Layout("NCHW"))
+    ppp.input().preprocess() \
+        .convert_element_type(ov.Type.f32) \
+        .convert_color(ColorFormat.RGB) \
+        .scale(255.0)
+    ov.save_model(ppp.build(), os.path.join(ir_dir, IR_U8_XML))
+
+def make_core():
+    """ov.Core with the persistent compiled-model cache switched on."""
+    import openvino as ov
+    core = ov.Core()
+    if CACHE_DIR:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        core.set_property({"CACHE_DIR": CACHE_DIR})
+    return core
+
+def thread_budget():
+    """Threads this process may use ($OV_THREAD_BUDGET), or None for the whole machine."""
+    budget = os.environ.get(THREAD_BUDGET_ENV)
+    return int(budget) if budget else None
+
+def ov_config(hint="LATENCY"):
+    """
+    Compile config for a performance hint plus the streams/threads autotune.py found best here.
+    Under a thread budget (one of several inference_pool workers) it's one stream on that many
+    threads instead, so N workers don't each start a full set of CPU streams.
+    """
+    import autotune
+    config = {"PERFORMANCE_HINT": hint, **autotune.openvino_config("latency" if hint == "LATENCY" else "throughput")}
+    budget = thread_budget()
+    if budget:
+        config.update(NUM_STREAMS=1, INFERENCE_NUM_THREADS=budget)
+    return config
+
+def compile_ir(ir_dir, ir_xml, config, device="CPU", core=None, img_size=IMG_SIZE, dynamic_batch=False):
+    # compiling straight from the path lets a cache hit skip reading/building the IR at all
+    core = core or make_core()
+    path = os.path.join(ir_dir, ir_xml)
+    if img_size == IMG_SIZE and not dynamic_batch:
+        return core.compile_model(path, device, config)
+    # the IR is exported at IMG_SIZE, batch 1; the net is fully convolutional, so other sizes
+    # (and a dynamic batch dimension, -1) are a reshape away
+    model = core.read_model(path)
+    nhwc = model.input(0).get_partial_shape()[3].get_length() == 3
+    b = -1 if dynamic_batch else 1
+    model.reshape([b, img_size, img_size, 3] if nhwc else [b, 3, img_size, img_size])
+    return core.compile_model(model, device, config)
+
+def warmup(request, prep, frame_shape=(360,640,3), runs=WARMUP_RUNS):
+    """Run a few inferences on a blank frame so the first real frame isn't the slow one."""
+    t0 = time.perf_counter()
+    blank = np.zeros(frame_shape, np.uint8)
+    for _ in range(runs):
+        request.infer({0: prep(blank)[0]})
+    return time.perf_counter() - t0
+
+def preprocess(frame, img_size=IMG_SIZE):
+    """Letterbox + BGR->RGB + HWC->NCHW float blob. Returns (blob, scale, pad)."""
+    lb, scale, pad = letterbox(frame, (img_size, img_size))
+    blob = lb[:, :, ::-1].transpose(2,0,1).astype(np.float32) / 255.0
+    blob = np.expand_dims(blob, 0)
+    return blob, scale, pad
+
+class LetterboxBuffer:
+    """
+    letterbox() into one preallocated uint8 canvas, for the u8 IR.
+    cv2.resize writes straight into the canvas view and the grey border is only
+    painted when the frame size changes, so steady state allocates nothing.
+    Returns the same (blob, scale, pad) as preprocess(); blob is a [1,S,S,3] view of the canvas.
+    """
+    def __init__(self, img_size=IMG_SIZE, color=(114,114,114)):
+        self.img_size = img_size
+        self.color = color
+        self.canvas = np.empty((img_size, img_size, 3), np.uint8)
+        self.blob = self.canvas[None]
+        self._geom = None
+
+    def _layout(self, h, w):
+        S = self.img_size
+        r = min(S/h, S/w)
+        nh, nw = int(round(h*r)), int(round(w*r))
+        top, left = (S-nh)//2, (S-nw)//2
+        self.canvas[:] = self.color
+        self._roi = self.canvas[top:top+nh, left:left+nw]
+        self._geom = ((h, w), r, (nw, nh), (left, top))
+
+    def __call__(self, frame):
+        h, w = frame.shape[:2]
+        if self._geom is None or self._geom[0] != (h, w):
+            self._layout(h, w)
+        _, r, size, pad = self._geom
+        cv2.resize(frame, size, dst=self._roi, interpolation=cv2.INTER_LINEAR)
+        return self.blob, r, pad
+
+def make_preprocessor(use_u8_ir=USE_U8_IR, img_size=IMG_SIZE):
+    """(IR file name, frame -> (blob, scale, pad)) for the chosen input flavour."""
+    if use_u8_ir:
+        return IR_U8_XML, LetterboxBuffer(img_size)
+    return IR_XML, lambda frame: preprocess(frame, img_size)
+
+def bench_preprocess(frame_shape=(360,640,3), repeats=300):
+    """Per-frame time and peak NumPy/OpenCV allocation: float32 preprocess() vs LetterboxBuffer."""
+    import tracemalloc
+    frame = np.random.default_rng(0).integers(0, 255, frame_shape, dtype=np.uint8)
+    print(f"{'path':>16} | {'us/frame':>8} | {'peak alloc KiB/frame':>20}")
+    for name, fn in (("float32 NCHW", lambda f: preprocess(f, IMG_SIZE)), ("u8 reused buffer", LetterboxBuffer(IMG_SIZE))):
+        fn(frame)
+        t0 = time.perf_counter()
+        for _ in range(repeats): fn(frame)
+        us = (time.perf_counter() - t0) * 1e6 / repeats
+        # temporaries (resized, padded, transposed, float, scaled copies) all show up in the peak
+        tracemalloc.start()
+        fn(frame)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{name:>16} | {us:8.0f} | {peak / 1024:20.1f}")
+
+def postprocess(pred, scale, pad, frame_shape, conf_th=CONF_TH, iou_th=IOU_TH, class_filter=CLASS_FILTER):
+    """
+    Raw YOLO output (one image) -> (boxes xyxy in frame pixels, scores, class_ids).
+    Decode, confidence/class filter, class-aware NMS and letterbox inversion are
+    vectorized in ov_postprocess; nms_np above stays as the reference implementation.
+    """
+    return ov_postprocess.postprocess(pred, scale, pad, frame_shape, conf_th=conf_th,
+                                      iou_th=iou_th, class_filter=class_filter)
+
+def draw_detections(frame, boxes, scores, ids):
+    drawn = frame.copy()
+    for box, sc, cid in zip(boxes, scores, ids):
+        x1,y1,x2,y2 = (int(v) for v in box)
+        cid = int(cid)
+        name = COCO[cid] if 0 <= cid < len(COCO) else str(cid)
+        cv2.rectangle(drawn,(x1,y1),(x2,y2),(0,255,0),2)
+        label = f"{name} {sc:.2f}"
+        ((tw,th),_) = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)
+        y0 = max(20, y1-6)
+        cv2.rectangle(drawn,(x1,y0-th-6),(x1+tw+6,y0),(0,255,0),-1)
+        cv2.putText(drawn,label,(x1+3,y0-3),cv2.FONT_HERSHEY_SIMPLEX,0.6,(0,0,0),2)
+    return drawn
+
+class InOrderBuffer:
+    """Collects results that finish out of order and releases them in sequence order."""
+    def __init__(self):
+        self._next = 0
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def push(self, seq, item):
+        with self._lock:
+            self._pending[seq] = item
+
+    def pop_ready(self):
+        out = []
+        with self._lock:
+            while self._next in self._pending:
+                out.append(self._pending.pop(self._next))
+                self._next += 1
+        return out
+
+    def __len__(self):
+        with self._lock:
+            return len(self._pending)
+
+def _overlay_stats(img, tag, fps, lat):
+    p50 = np.percentile(lat, 50) if lat else 0.0
+    cv2.putText(img, f"{tag} | {fps:.1f} FPS | {p50:.0f} ms", (10,30),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255,255,255), 2)
+
+def _report(tag, n, elapsed, lat):
+    lat = np.array(lat) if len(lat) else np.zeros(1)
+    print(f"{tag}: {n} frames | {n / max(1e-6, elapsed):.1f} FPS | latency "
+          f"p50 {np.percentile(lat,50):.1f} ms  p95 {np.percentile(lat,95):.1f} ms  max {lat.max():.1f} ms")
+
+def main(perf_hint=PERF_HINT, precision=IR_PRECISION):
+    t_start = time.perf_counter()
+    ir = ir_dir_for(precision)
+
+    ir_xml, prep = make_preprocessor()
+    compiled = compile_ir(ir, ir_xml, ov_config(perf_hint))
+    request = compiled.create_infer_request()
     input_tensor = compiled.inputs[0]
     output_tensor = compiled.outputs[0]
+    warm_s = warmup(request, prep)
+    print(f"✅ Detector ready in {time.perf_counter() - t_start:.2f} s (warm-up {warm_s:.2f} s)")
+    region = load_region()   # calibrated pool outline (pool_region.py), None = whole frame
 
     cap = cv2.VideoCapture(0)
     cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
@@ -92,76 +310,126 @@ def main():
         print("Failed to open webcam.")
         return
 
-    H,W,_ = frame.shape
     t0=time.time(); n=0
+    lat = deque(maxlen=LAT_WINDOW)
 
     while True:
         ok, frame = cap.read()
         if not ok: break
+        t_cap = time.perf_counter()
 
-        lb, scale, pad = letterbox(frame, (IMG_SIZE, IMG_SIZE))
-        blob = lb[:, :, ::-1].transpose(2,0,1).astype(np.float32) / 255.0
-        blob = np.expand_dims(blob, 0)
-
-        res = compiled.infer_new_request({input_tensor: blob})[output_tensor]
-        pred = res[0]
-        if pred.shape[0] in (84,85):
-            pred = pred.T
-        C = pred.shape[1]
-        xywh = pred[:, :4]
-        if C == 85:
-            obj = pred[:,4:5]
-            cls = pred[:,5:]
-            scores = (obj*cls).max(1)
-            ids    = (obj*cls).argmax(1)
-        else:
-            cls = pred[:,4:]
-            scores = cls.max(1)
-            ids    = cls.argmax(1)
-
-        mask = scores >= CONF_TH
-        if CLASS_FILTER is not None:
-            mask &= np.isin(ids, list(CLASS_FILTER))
-        xywh, scores, ids = xywh[mask], scores[mask], ids[mask]
-
-        if len(xywh):
-            cx,cy,w,h = xywh.T
-            boxes = np.stack([cx-w/2, cy-h/2, cx+w/2, cy+h/2], 1)
-            # NMS per-class
-            final=[]
-            for c in np.unique(ids):
-                m = ids==c
-                keep = nms_np(boxes[m], scores[m], th=IOU_TH)
-                for k in keep:
-                    final.append((boxes[m][k], float(scores[m][k]), int(c)))
-
-            # reverse letterbox
-            (left, top) = pad
-            drawn = frame.copy()
-            for box, sc, cid in final:
-                x1,y1,x2,y2 = box
-                x1-=left; x2-=left; y1-=top; y2-=top
-                x1/=scale; x2/=scale; y1/=scale; y2/=scale
-                x1=int(np.clip(x1,0,W-1)); y1=int(np.clip(y1,0,H-1))
-                x2=int(np.clip(x2,0,W-1)); y2=int(np.clip(y2,0,H-1))
-                name = COCO[cid] if 0 <= cid < len(COCO) else str(cid)
-                cv2.rectangle(drawn,(x1,y1),(x2,y2),(0,255,0),2)
-                label = f"{name} {sc:.2f}"
-                ((tw,th),_) = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)
-                y0 = max(20, y1-6)
-                cv2.rectangle(drawn,(x1,y0-th-6),(x1+tw+6,y0),(0,255,0),-1)
-                cv2.putText(drawn,label,(x1+3,y0-3),cv2.FONT_HERSHEY_SIMPLEX,0.6,(0,0,0),2)
-
-        else:
-            drawn = frame
+        view, offset = region.crop(frame) if region else (frame, (0, 0))
+        blob, scale, pad = prep(view)
+        # the request reads blob in place; nothing touches it until the next frame
+        res = request.infer({input_tensor: blob}, share_inputs=True)[output_tensor]
+        boxes, scores, ids = postprocess(res[0], scale, pad, view.shape)
+        if region:
+            boxes, scores, ids = region.restore(boxes, scores, ids, offset, frame.shape)
+        drawn = draw_detections(frame, boxes, scores, ids) if len(boxes) else frame
 
+        lat.append((time.perf_counter() - t_cap) * 1000.0)
         n+=1; fps = n / max(1e-6, (time.time()-t0))
-        cv2.putText(drawn, f"OpenVINO CPU | {fps:.1f} FPS", (10,30),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255,255,255), 2)
+        _overlay_stats(drawn, f"OpenVINO CPU sync {perf_hint.lower()}", fps, lat)
         cv2.imshow("YOLO11n OpenVINO", drawn)
         if cv2.waitKey(1) & 0xFF in (27, ord('q')): break
 
     cap.release(); cv2.destroyAllWindows()
+    _report("sync", n, time.time()-t0, lat)
+
+def main_async(perf_hint=PERF_HINT, jobs=INFER_JOBS, precision=IR_PRECISION):
+    """
+    Pipelined loop: a capture thread feeds frames, the main thread preprocesses them and
+    queues them on an AsyncInferQueue (several requests in flight), and postprocess/draw
+    runs on whatever has finished while the CPU plugin works on the next frames.
+    Frames are shown strictly in capture order.
+    """
+    t_start = time.perf_counter()
+    ir = ir_dir_for(precision)
+
+    import openvino as ov
+    ir_xml, prep = make_preprocessor()
+    compiled = compile_ir(ir, ir_xml, ov_config(perf_hint))
+    warm_s = warmup(compiled.create_infer_request(), prep)
+    print(f"✅ Detector ready in {time.perf_counter() - t_start:.2f} s (warm-up {warm_s:.2f} s)")
+    infer_queue = ov.AsyncInferQueue(compiled, jobs)
+    done = InOrderBuffer()
+    region = load_region()   # calibrated pool outline (pool_region.py), None = whole frame
+
+    def on_done(request, userdata):
+        # copy out: the request's output buffer is reused by its next job
+        done.push(userdata[0], (request.get_output_tensor(0).data.copy(), userdata))
+    infer_queue.set_callback(on_done)
+
+    cap = cv2.VideoCapture(0)
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 360)
+    if not cap.isOpened():
+        print("Failed to open webcam.")
+        return
+
+    frames = queue.Queue(maxsize=len(infer_queue))
+    stop = threading.Event()
+
+    def grab():
+        while not stop.is_set():
+            ok, frame = cap.read()
+            item = (frame, time.perf_counter()) if ok else None
+            # never block for good on a full queue: the consumer may have quit
+            while not stop.is_set():
+                try:
+                    frames.put(item, timeout=0.1)
+                    break
+                except queue.Full:
+                    pass
+            if not ok: break
+    grabber = threading.Thread(target=grab, name="capture", daemon=True)
+    grabber.start()
+
+    tag = f"OpenVINO CPU async x{len(infer_queue)} {perf_hint.lower()}"
+    lat = deque(maxlen=LAT_WINDOW)
+    t0 = time.time(); n = 0; seq = 0; quit_ = False
+
+    def show_ready():
+        nonlocal n
+        for pred, (_, frame, scale, pad, t_cap, view_shape, offset) in done.pop_ready():
+            boxes, scores, ids = postprocess(pred[0], scale, pad, view_shape)
+            if region:
+                boxes, scores, ids = region.restore(boxes, scores, ids, offset, frame.shape)
+            drawn = draw_detections(frame, boxes, scores, ids) if len(boxes) else frame
+            lat.append((time.perf_counter() - t_cap) * 1000.0)
+            n += 1
+            _overlay_stats(drawn, tag, n / max(1e-6, time.time()-t0), lat)
+            cv2.imshow("YOLO11n OpenVINO", drawn)
+            if cv2.waitKey(1) & 0xFF in (27, ord('q')):
+                return True
+        return False
+
+    while not quit_:
+        item = frames.get()
+        if item is None: break
+        frame, t_cap = item
+        view, offset = region.crop(frame) if region else (frame, (0, 0))
+        blob, scale, pad = prep(view)
+        # blocks only when every infer request is busy; the input is copied into the
+        # request, so the reused letterbox buffer is free again right away
+        infer_queue.start_async({0: blob}, (seq, frame, scale, pad, t_cap, view.shape, offset))
+        seq += 1
+        quit_ = show_ready()
+
+    stop.set()
+    grabber.join()   # it may still be inside cap.read(); release only once it's out
+    infer_queue.wait_all()
+    if not quit_:
+        show_ready()
+    cap.release(); cv2.destroyAllWindows()
+    _report(tag, n, time.time()-t0, lat)
 
 if __name__ == "__main__":
-    main()
+    hint = "THROUGHPUT" if "--throughput" in sys.argv else PERF_HINT
+    precision = sys.argv[sys.argv.index("--precision") + 1] if "--precision" in sys.argv else IR_PRECISION
+    if "--bench-preprocess" in sys.argv:
+        bench_preprocess()
+    elif "--sync" in sys.argv or not ASYNC_PIPELINE:
+        main(perf_hint=hint, precision=precision)
+    else:
+        main_async(perf_hint=hint, precision=precision)
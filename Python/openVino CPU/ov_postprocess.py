@@ -0,0 +1,176 @@
+# ov_postprocess.py
+# Vectorized YOLO postprocess for raw OpenVINO/ONNX output:
+# decode -> confidence/class filter -> class-aware batched NMS -> undo letterbox.
+# Drop-in for the per-class nms_np loop in ov_detection (same boxes, same scores).
+import time
+
+import numpy as np
+import cv2
+
+CONF_TH = 0.30
+IOU_TH = 0.45
+MATCH_IOU = 0.5          # IoU at which a detection counts as the same object (eval, target lock)
+CV2_CLASS_OFFSET = 4096  # coordinate offset per class for cv2.dnn.NMSBoxesBatched-style batching
+
+
+def decode(pred, conf_th=CONF_TH, class_filter=None):
+    """
+    Raw output for one image ([84|85, N] or [N, 84|85]) -> (boxes xyxy, scores, class_ids)
+    of the candidates above conf_th, in letterboxed input coordinates.
+    """
+    if pred.shape[0] not in (84, 85):
+        pred = pred.T
+    # channels-first: every reduction below runs along contiguous rows
+    if pred.shape[0] == 85:
+        cls = pred[4:5] * pred[5:]
+    else:
+        cls = pred[4:]
+    ids = cls.argmax(0)
+    scores = np.take_along_axis(cls, ids[None], 0)[0]
+
+    mask = scores >= conf_th
+    if class_filter is not None:
+        mask &= np.isin(ids, list(class_filter))
+    idx = np.flatnonzero(mask)
+    cx, cy, w, h = pred[:4, idx]
+    boxes = np.stack([cx-w/2, cy-h/2, cx+w/2, cy+h/2], 1)
+    return boxes, scores[idx], ids[idx]
+
+
+def nms_batched(boxes, scores, ids, iou_th=IOU_TH):
+    """
+    Class-aware greedy NMS for all classes in one sort. Candidates are grouped by class
+    (score-descending inside each group) so every class is a contiguous slice of
+    precomputed coordinate/area columns; each kept box costs one vectorized IoU row over
+    the survivors of its own class. Returns kept indices, highest score first.
+    """
+    if not len(boxes):
+        return np.zeros((0,), np.int64)
+    order = np.lexsort((-scores, ids))
+    c = ids[order]
+    x1, y1, x2, y2 = (np.ascontiguousarray(boxes[order, k]) for k in range(4))
+    areas = (x2 - x1) * (y2 - y1)
+    bounds = np.flatnonzero(c[1:] != c[:-1]) + 1
+
+    keep = []
+    for start, end in zip(np.r_[0, bounds], np.r_[bounds, len(c)]):
+        rest = np.arange(start, end)
+        while rest.size:
+            i = rest[0]; keep.append(i)
+            rest = rest[1:]
+            xi1 = np.maximum(x1[i], x1[rest]); yi1 = np.maximum(y1[i], y1[rest])
+            xi2 = np.minimum(x2[i], x2[rest]); yi2 = np.minimum(y2[i], y2[rest])
+            inter = np.maximum(0, xi2 - xi1) * np.maximum(0, yi2 - yi1)
+            rest = rest[inter / (areas[i] + areas[rest] - inter + 1e-6) < iou_th]
+    keep = order[keep]
+    return keep[np.argsort(-scores[keep], kind="stable")]
+
+
+def nms_cv2_batched(boxes, scores, ids, iou_th=IOU_TH, conf_th=0.0):
+    """Same contract as nms_batched, via OpenCV's NMS with per-class coordinate offsets."""
+    if not len(boxes):
+        return np.zeros((0,), np.int64)
+    off = ids.astype(np.float64)[:, None] * CV2_CLASS_OFFSET
+    shifted = boxes.astype(np.float64) + off
+    xywh = np.concatenate([shifted[:, :2], shifted[:, 2:] - shifted[:, :2]], 1)
+    keep = cv2.dnn.NMSBoxes(xywh.tolist(), scores.astype(float).tolist(), conf_th, iou_th)
+    return np.asarray(keep, np.int64).reshape(-1)
+
+
+def unletterbox(boxes, scale, pad, frame_shape):
+    """Map boxes from the letterboxed input back to frame pixels (clipped to the frame)."""
+    H, W = frame_shape[:2]
+    left, top = pad
+    out = np.empty(boxes.shape, np.float32)
+    out[:, 0::2] = np.clip((boxes[:, 0::2] - left) / scale, 0, W-1)
+    out[:, 1::2] = np.clip((boxes[:, 1::2] - top) / scale, 0, H-1)
+    return out
+
+
+def box_iou(a, b):
+    """Pairwise IoU of xyxy boxes: [N,4] x [M,4] -> [N,M]."""
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0]); y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2]); y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.maximum(0, x2 - x1) * np.maximum(0, y2 - y1)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return inter / (area_a[:, None] + area_b[None, :] - inter + 1e-9)
+
+
+def box_ios(a, b):
+    """Pairwise intersection over the smaller box's area (SAHI's IOS): [N,4] x [M,4] -> [N,M]."""
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0]); y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2]); y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.maximum(0, x2 - x1) * np.maximum(0, y2 - y1)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return inter / (np.minimum(area_a[:, None], area_b[None, :]) + 1e-9)
+
+
+def postprocess(pred, scale, pad, frame_shape, conf_th=CONF_TH, iou_th=IOU_TH, class_filter=None, use_cv2=False):
+    """Raw YOLO output (one image) -> (boxes xyxy in frame pixels, scores, class_ids)."""
+    boxes, scores, ids = decode(pred, conf_th, class_filter)
+    if not len(boxes):
+        return np.zeros((0,4), np.float32), np.zeros((0,), np.float32), np.zeros((0,), np.int64)
+    keep = (nms_cv2_batched if use_cv2 else nms_batched)(boxes, scores, ids, iou_th)
+    return (unletterbox(boxes[keep], scale, pad, frame_shape),
+            scores[keep].astype(np.float32), ids[keep].astype(np.int64))
+
+
+# ---- microbenchmark ----
+def dense_predictions(n_anchors=3549, n_classes=80, n_objects=60, img_size=416, seed=0):
+    """Synthetic [4+C, N] output with many overlapping, confident boxes (crowded scene)."""
+    rng = np.random.default_rng(seed)
+    centers = rng.uniform(40, img_size-40, (n_objects, 2))
+    sizes = rng.uniform(20, 120, (n_objects, 2))
+    obj = rng.integers(0, n_objects, n_anchors)
+    xywh = np.concatenate([centers[obj] + rng.normal(0, 4, (n_anchors, 2)),
+                           sizes[obj] * rng.uniform(0.85, 1.15, (n_anchors, 2))], 1)
+    cls = rng.uniform(0, 0.05, (n_anchors, n_classes))
+    cls[np.arange(n_anchors), obj % 5] = rng.uniform(0.05, 0.95, n_anchors)
+    return np.concatenate([xywh, cls], 1).T.astype(np.float32)
+
+
+def legacy_postprocess(pred, scale, pad, frame_shape, conf_th=CONF_TH, iou_th=IOU_TH):
+    """The original per-class nms_np loop, kept as the benchmark/equivalence baseline."""
+    from ov_detection import nms_np
+    H, W = frame_shape[:2]
+    pred = pred.T if pred.shape[0] in (84, 85) else pred
+    cls = pred[:, 4:]
+    scores, ids = cls.max(1), cls.argmax(1)
+    m = scores >= conf_th
+    xywh, scores, ids = pred[m, :4], scores[m], ids[m]
+    if not len(xywh):
+        return np.zeros((0,4), np.float32), np.zeros((0,), np.float32), np.zeros((0,), np.int64)
+    cx, cy, w, h = xywh.T
+    boxes = np.stack([cx-w/2, cy-h/2, cx+w/2, cy+h/2], 1)
+    out_b, out_s, out_c = [], [], []
+    for c in np.unique(ids):
+        mc = ids == c
+        for k in nms_np(boxes[mc], scores[mc], th=iou_th):
+            out_b.append(boxes[mc][k]); out_s.append(scores[mc][k]); out_c.append(int(c))
+    left, top = pad
+    b = np.array(out_b, np.float32)
+    b[:, [0,2]] = np.clip((b[:, [0,2]] - left) / scale, 0, W-1)
+    b[:, [1,3]] = np.clip((b[:, [1,3]] - top) / scale, 0, H-1)
+    return b, np.array(out_s, np.float32), np.array(out_c, np.int64)
+
+
+def benchmark(conf_ths=(0.05, 0.15, 0.30), repeats=50):
+    pred = dense_predictions()
+    args = (416/640, (0, 52), (360, 640, 3))
+    print(f"{'conf':>5} | {'cands':>5} | {'kept':>4} | {'legacy ms':>9} | {'vector ms':>9} | {'cv2 ms':>7}")
+    for th in conf_ths:
+        n_cand = len(decode(pred, th)[0])
+        row = []
+        for fn, kw in ((legacy_postprocess, {}), (postprocess, {}), (postprocess, {"use_cv2": True})):
+            fn(pred, *args, conf_th=th, **kw)
+            t0 = time.perf_counter()
+            for _ in range(repeats):
+                out = fn(pred, *args, conf_th=th, **kw)
+            row.append((time.perf_counter() - t0) * 1000.0 / repeats)
+        print(f"{th:5.2f} | {n_cand:5d} | {len(out[0]):4d} | {row[0]:9.2f} | {row[1]:9.2f} | {row[2]:7.2f}")
+
+
+if __name__ == "__main__":
+    benchmark()
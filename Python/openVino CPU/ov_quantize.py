@@ -0,0 +1,271 @@
+# ov_quantize.py
+# FP32 / FP16 / INT8 variants of the YOLO11n OpenVINO IR, plus a report comparing them.
+#
+#   python ov_quantize.py collect 300      save pool frames from the webcam into CALIB_DIR
+#   python ov_quantize.py export           build FP32 + INT8 (NNCF post-training quantization)
+#   python ov_quantize.py report           latency / throughput / mAP@0.5 / person recall on VAL_DIR
+#
+# VAL_DIR holds images with YOLO-format labels ("cls cx cy w h", normalized), either as
+# images/ + labels/ subfolders or as .txt files next to each image.
+import os, re, sys, time, glob, json
+
+import numpy as np
+import cv2
+
+import ov_detection
+from ov_detection import MODEL_PT, IR_DIR, IR_XML, IR_U8_XML, IMG_SIZE, CONF_TH, IOU_TH
+from ov_postprocess import box_iou, MATCH_IOU
+
+CALIB_DIR = "calibration_frames"
+CALIB_SIZE = 300           # NNCF subset_size
+VAL_DIR = "validation"
+REPORT_PATH = "quantization_report.md"
+
+VARIANTS = {
+    "fp32": IR_DIR + "_fp32",
+    "fp16": IR_DIR,         # the default ultralytics export (half=True)
+    "int8": IR_DIR + "_int8",
+}
+PERSON_ID = 0
+EVAL_CONF = 0.001          # mAP is computed over the full score range
+LATENCY_REPEATS = 3
+THROUGHPUT_SECONDS = 10
+
+
+def _images(folder):
+    exts = ("*.jpg", "*.jpeg", "*.png", "*.bmp")
+    sub = os.path.join(folder, "images")
+    folder = sub if os.path.isdir(sub) else folder
+    return sorted(p for e in exts for p in glob.glob(os.path.join(folder, e)))
+
+
+def collect_calibration_frames(n=CALIB_SIZE, every=5, out_dir=CALIB_DIR, source=0):
+    """Save every `every`-th camera frame until `n` are on disk."""
+    os.makedirs(out_dir, exist_ok=True)
+    cap = cv2.VideoCapture(source)
+    saved = k = 0
+    while saved < n:
+        ok, frame = cap.read()
+        if not ok: break
+        if k % every == 0:
+            cv2.imwrite(os.path.join(out_dir, f"pool_{int(time.time()*1000)}_{saved:04d}.jpg"), frame)
+            saved += 1
+        k += 1
+    cap.release()
+    print(f"📸 Saved {saved} calibration frames to {out_dir}")
+    return saved
+
+
+def _export_fp32():
+    out = VARIANTS["fp32"]
+    if os.path.isfile(os.path.join(out, IR_XML)):
+        return out
+    from ultralytics import YOLO
+    path = YOLO(MODEL_PT).export(format="openvino", imgsz=IMG_SIZE, half=False, dynamic=False, simplify=True)
+    os.replace(path, out)
+    return out
+
+
+def detect_head_patterns(op_names):
+    """
+    NNCF ignored-scope patterns for the detect head's box decoding: the DFL and the anchor/stride
+    arithmetic and class sigmoid directly under the last "model.N" module (as Ultralytics' own INT8
+    export does). A type-based scope would also catch every SiLU in the backbone and neck.
+    """
+    head = max(int(m.group(1)) for m in (re.search(r"model\.(\d+)[./]", n) for n in op_names) if m)
+    return [rf".*model\.{head}/aten::(add|sub|mul|div|sigmoid)/.*", rf".*model\.{head}\.dfl.*"]
+
+
+def _export_int8(calib_dir=CALIB_DIR, subset_size=CALIB_SIZE):
+    out = VARIANTS["int8"]
+    if os.path.isfile(os.path.join(out, IR_XML)):
+        return out
+    import nncf
+    import openvino as ov
+
+    paths = _images(calib_dir)
+    if not paths:
+        raise FileNotFoundError(f"No calibration frames in '{calib_dir}' (python ov_quantize.py collect)")
+
+    def transform(path):
+        # the float IR input, same preprocessing the detector uses at run time
+        return ov_detection.preprocess(cv2.imread(path), IMG_SIZE)[0]
+
+    model = ov.Core().read_model(os.path.join(_export_fp32(), IR_XML))
+    quantized = nncf.quantize(
+        model,
+        nncf.Dataset(paths, transform),
+        preset=nncf.QuantizationPreset.MIXED,
+        subset_size=min(subset_size, len(paths)),
+        # keep the box-decoding arithmetic of the detect head in float, nothing else
+        ignored_scope=nncf.IgnoredScope(patterns=detect_head_patterns([op.get_friendly_name() for op in model.get_ops()])),
+    )
+    os.makedirs(out, exist_ok=True)
+    ov.save_model(quantized, os.path.join(out, IR_XML), compress_to_fp16=False)
+    return out
+
+
+def export_variant(precision):
+    """Directory of the IR for `precision` ("fp32", "fp16" or "int8"), exporting it if needed."""
+    if precision not in VARIANTS:
+        raise ValueError(f"Unknown precision '{precision}'. Choose from: {', '.join(VARIANTS)}")
+    if precision == "fp16":
+        return ov_detection.export_openvino_ir()
+    ir_dir = _export_fp32() if precision == "fp32" else _export_int8()
+    if not os.path.isfile(os.path.join(ir_dir, IR_U8_XML)):
+        ov_detection.build_u8_ir(ir_dir)
+    return ir_dir
+
+
+# ---- evaluation ----
+def load_labels(image_path, shape):
+    """YOLO txt labels for an image -> (boxes xyxy pixels, class_ids)."""
+    stem = os.path.splitext(os.path.basename(image_path))[0]
+    folder = os.path.dirname(image_path)
+    candidates = [os.path.join(folder, stem + ".txt")]
+    if os.path.basename(folder) == "images":
+        candidates.insert(0, os.path.join(os.path.dirname(folder), "labels", stem + ".txt"))
+    for path in candidates:
+        if os.path.isfile(path):
+            # an empty file is a negative image (nobody in it); loadtxt would give shape (0, 1)
+            rows = np.loadtxt(path, ndmin=2).reshape(-1, 5) if os.path.getsize(path) else np.zeros((0, 5))
+            break
+    else:
+        rows = np.zeros((0, 5))
+    H, W = shape[:2]
+    cls = rows[:, 0].astype(np.int64)
+    cx, cy, w, h = rows[:, 1] * W, rows[:, 2] * H, rows[:, 3] * W, rows[:, 4] * H
+    return np.stack([cx-w/2, cy-h/2, cx+w/2, cy+h/2], 1), cls
+
+
+def match(pred_boxes, pred_scores, gt_boxes, iou_th=MATCH_IOU):
+    """Greedy, score-ordered matching of one class in one image. Returns a TP flag per prediction."""
+    tp = np.zeros(len(pred_boxes), bool)
+    if not len(pred_boxes) or not len(gt_boxes):
+        return tp
+    iou = box_iou(pred_boxes, gt_boxes)
+    used = np.zeros(len(gt_boxes), bool)
+    for i in np.argsort(-pred_scores, kind="stable"):
+        cand = np.where(used, -1.0, iou[i])
+        j = int(cand.argmax())
+        if cand[j] >= iou_th:
+            tp[i] = used[j] = True
+    return tp
+
+
+def average_precision(tp, scores, n_gt):
+    """All-point interpolated AP (VOC2010+/COCO-style area under the P-R curve)."""
+    if n_gt == 0:
+        return float("nan")
+    if not len(tp):
+        return 0.0
+    order = np.argsort(-scores, kind="stable")
+    tpc = np.cumsum(tp[order]); fpc = np.cumsum(~tp[order])
+    recall = tpc / n_gt
+    precision = tpc / (tpc + fpc)
+    mrec = np.concatenate([[0.0], recall, [1.0]])
+    mpre = np.concatenate([[1.0], precision, [0.0]])
+    mpre = np.flip(np.maximum.accumulate(np.flip(mpre)))
+    i = np.flatnonzero(mrec[1:] != mrec[:-1])
+    return float(np.sum((mrec[i + 1] - mrec[i]) * mpre[i + 1]))
+
+
+def evaluate(detect, images):
+    """mAP@0.5 over classes present in the labels, and person recall at the operating CONF_TH."""
+    per_class = {}   # cls -> [tp flags], [scores], n_gt
+    person_hits = person_gt = 0
+    for path in images:
+        frame = cv2.imread(path)
+        gt_boxes, gt_cls = load_labels(path, frame.shape)
+        boxes, scores, ids = detect(frame)
+        for c in np.union1d(np.unique(gt_cls), np.unique(ids)):
+            pm, gm = ids == c, gt_cls == c
+            tp = match(boxes[pm], scores[pm], gt_boxes[gm])
+            acc = per_class.setdefault(int(c), [[], [], 0])
+            acc[0].append(tp); acc[1].append(scores[pm]); acc[2] += int(gm.sum())
+            if c == PERSON_ID:
+                person_gt += int(gm.sum())
+                person_hits += int(tp[scores[pm] >= CONF_TH].sum())
+    aps = [average_precision(np.concatenate(tp), np.concatenate(sc), n) for tp, sc, n in per_class.values() if n]
+    return {
+        "map50": float(np.mean(aps)) if aps else float("nan"),
+        "person_recall": person_hits / person_gt if person_gt else float("nan"),
+    }
+
+
+def _compile(ir_dir, hint, config=None):
+    return ov_detection.compile_ir(ir_dir, IR_U8_XML, {"PERFORMANCE_HINT": hint, **(config or {})})
+
+
+def measure_latency(ir_dir, frames, config=None):
+    compiled = _compile(ir_dir, "LATENCY", config)
+    request = compiled.create_infer_request()
+    prep = ov_detection.LetterboxBuffer(IMG_SIZE)
+    request.infer({0: prep(frames[0])[0]})
+    lat = []
+    for _ in range(LATENCY_REPEATS):
+        for f in frames:
+            blob = prep(f)[0]
+            t0 = time.perf_counter()
+            request.infer({0: blob}, share_inputs=True)
+            lat.append((time.perf_counter() - t0) * 1000.0)
+    return float(np.mean(lat)), float(np.percentile(lat, 95))
+
+
+def measure_throughput(ir_dir, frames, seconds=THROUGHPUT_SECONDS, config=None):
+    import openvino as ov
+    compiled = _compile(ir_dir, "THROUGHPUT", config)
+    queue = ov.AsyncInferQueue(compiled, 0)
+    prep = ov_detection.LetterboxBuffer(IMG_SIZE)
+    blobs = [prep(f)[0].copy() for f in frames]
+    n = 0
+    t0 = time.perf_counter()
+    while time.perf_counter() - t0 < seconds:
+        queue.start_async({0: blobs[n % len(blobs)]})
+        n += 1
+    queue.wait_all()
+    return n / (time.perf_counter() - t0)
+
+
+def report(val_dir=VAL_DIR, precisions=tuple(VARIANTS), out_path=REPORT_PATH):
+    images = _images(val_dir)
+    if not images:
+        raise FileNotFoundError(f"No validation images in '{val_dir}'")
+    from detection_engine import OpenVINOEngine
+    frames = [cv2.imread(p) for p in images]
+    rows = {}
+    for prec in precisions:
+        ir_dir = export_variant(prec)
+        engine = OpenVINOEngine(ir_dir=ir_dir, conf=EVAL_CONF, iou=IOU_TH)
+        mean_ms, p95_ms = measure_latency(ir_dir, frames)
+        rows[prec] = {"mean_ms": mean_ms, "p95_ms": p95_ms,
+                      "throughput_fps": measure_throughput(ir_dir, frames),
+                      **evaluate(engine.detect, images)}
+        print(f"✅ {prec}: {rows[prec]}")
+
+    base = rows.get("fp32") or next(iter(rows.values()))
+    lines = [f"# YOLO11n OpenVINO precision report ({len(images)} images from {val_dir}, imgsz {IMG_SIZE})", "",
+             "| variant | latency mean ms | latency p95 ms | throughput FPS | speedup vs fp32 | mAP@0.5 | person recall |",
+             "|---|---|---|---|---|---|---|"]
+    for prec, r in rows.items():
+        lines.append(f"| {prec} | {r['mean_ms']:.1f} | {r['p95_ms']:.1f} | {r['throughput_fps']:.1f} | "
+                     f"{base['mean_ms'] / r['mean_ms']:.2f}x | {r['map50']:.3f} | {r['person_recall']:.3f} |")
+    with open(out_path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+    with open(os.path.splitext(out_path)[0] + ".json", "w") as f:
+        json.dump(rows, f, indent=2)
+    print("\n".join(lines))
+    return rows
+
+
+if __name__ == "__main__":
+    cmd = sys.argv[1] if len(sys.argv) > 1 else "report"
+    if cmd == "collect":
+        collect_calibration_frames(int(sys.argv[2]) if len(sys.argv) > 2 else CALIB_SIZE)
+    elif cmd == "export":
+        for prec in VARIANTS:
+            print(f"📦 {prec}: {export_variant(prec)}")
+    elif cmd == "report":
+        report()
+    else:
+        print("usage: python ov_quantize.py [collect N | export | report]")
@@ -0,0 +1,185 @@
+# pool_region.py
+# The camera always sees deck, fences and sky. Calibrate the pool outline once per camera,
+# then detectors infer only on the polygon's bounding crop and drop detections whose anchor
+# point (bottom centre of the box, where a person meets the water) falls outside the polygon.
+#
+#   python pool_region.py calibrate [--camera NAME] [--source 0]
+#       click the pool corners, Enter = save, r = start over, Esc = cancel
+#
+# The outline is saved to REGION_PATH on the machine that runs the detector. It depends on how that
+# camera is mounted, so it is gitignored; copy the file along when moving a calibrated setup.
+import os, sys, json, argparse
+
+import numpy as np
+import cv2
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+REGION_PATH = os.path.join(HERE, "pool_region.json")   # {camera: {"frame_size": [w, h], "polygon": [[x, y], ...]}}
+CAMERA = os.environ.get("POOL_CAMERA", "default")
+CROP_MARGIN = 16      # px around the polygon's bounding box, so people on the edge aren't cut in half
+ANCHOR = "bottom"     # point of a box tested against the mask: "bottom" centre or "center"
+
+
+class PoolRegion:
+    """Polygon in calibration-frame pixels; mask and crop are rebuilt for whatever frame size comes in."""
+
+    def __init__(self, polygon, frame_size, margin=CROP_MARGIN, anchor=ANCHOR):
+        self.polygon = np.asarray(polygon, np.float32)
+        self.frame_size = tuple(frame_size)    # (w, h) the polygon was drawn on
+        self.margin = margin
+        self.anchor = anchor
+        self._shape = None
+        self.mask = None
+        self.bbox = None
+
+    def _prepare(self, frame_shape):
+        h, w = frame_shape[:2]
+        if self._shape == (h, w):
+            return
+        sx, sy = w / self.frame_size[0], h / self.frame_size[1]
+        poly = np.round(self.polygon * [sx, sy]).astype(np.int32)
+        self.mask = np.zeros((h, w), np.uint8)
+        cv2.fillPoly(self.mask, [poly], 255)
+        x, y, bw, bh = cv2.boundingRect(poly)
+        m = self.margin
+        self.bbox = (max(0, x - m), max(0, y - m), min(w, x + bw + m), min(h, y + bh + m))
+        self._shape = (h, w)
+
+    def crop(self, frame):
+        """(view of the frame inside the pool's bounding box, (x0, y0) offset of that view)."""
+        self._prepare(frame.shape)
+        x0, y0, x1, y1 = self.bbox
+        return frame[y0:y1, x0:x1], (x0, y0)
+
+    def inside(self, boxes, frame_shape):
+        """Bool per box: is its anchor point on the pool mask? boxes are in frame pixels."""
+        self._prepare(frame_shape)
+        h, w = self._shape
+        xs = ((boxes[:, 0] + boxes[:, 2]) / 2).astype(np.int64).clip(0, w - 1)
+        y = boxes[:, 3] - 1 if self.anchor == "bottom" else (boxes[:, 1] + boxes[:, 3]) / 2
+        ys = y.astype(np.int64).clip(0, h - 1)
+        return self.mask[ys, xs] > 0
+
+    def restore(self, boxes, scores, ids, offset, frame_shape):
+        """Shift crop detections back to frame pixels and keep only the ones in the pool."""
+        boxes = boxes + np.array([offset[0], offset[1], offset[0], offset[1]], np.float32)
+        keep = self.inside(boxes, frame_shape)
+        return boxes[keep], scores[keep], ids[keep]
+
+    def draw(self, frame, color=(255, 200, 0)):
+        self._prepare(frame.shape)
+        sx, sy = frame.shape[1] / self.frame_size[0], frame.shape[0] / self.frame_size[1]
+        cv2.polylines(frame, [np.round(self.polygon * [sx, sy]).astype(np.int32)], True, color, 2)
+        return frame
+
+
+def load_region(camera=CAMERA, path=None):
+    """The calibrated PoolRegion for `camera`, or None if it hasn't been calibrated."""
+    try:
+        with open(path or REGION_PATH) as f:
+            entry = json.load(f)[camera]
+        return PoolRegion(entry["polygon"], entry["frame_size"])
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def save_region(polygon, frame_size, camera=CAMERA, path=None):
+    path = path or REGION_PATH
+    try:
+        with open(path) as f:
+            regions = json.load(f)
+    except (OSError, ValueError):
+        regions = {}
+    regions[camera] = {"frame_size": list(frame_size), "polygon": [[int(x), int(y)] for x, y in polygon]}
+    with open(path, "w") as f:
+        json.dump(regions, f, indent=2)
+
+
+class RegionDetector:
+    """
+    Wraps a detection engine: infers on the pool crop only, returns frame-pixel boxes inside the pool.
+    Same detect(frame) -> (boxes, scores, class_ids) interface as the engine.
+    """
+
+    def __init__(self, engine, region):
+        self.engine = engine
+        self.region = region
+        self.name = f"{engine.name}+pool"
+
+    def detect(self, frame):
+        view, offset = self.region.crop(frame)
+        boxes, scores, ids = self.engine.detect(view)
+        return self.region.restore(boxes, scores, ids, offset, frame.shape)
+
+    def __call__(self, frame):
+        return self.detect(frame)
+
+    def warmup(self, *args, **kwargs):
+        return self.engine.warmup(*args, **kwargs)
+
+
+def with_pool_region(engine, camera=CAMERA):
+    """engine wrapped in a RegionDetector if `camera` has a calibrated pool, else engine unchanged."""
+    region = load_region(camera)
+    if region is None:
+        return engine
+    print(f"🏊 Pool region for '{camera}': inferring on the pool crop only")
+    return RegionDetector(engine, region)
+
+
+def calibrate(camera=CAMERA, source=0):
+    cap = cv2.VideoCapture(source)
+    ok, frame = cap.read()
+    cap.release()
+    if not ok:
+        print("Failed to read a frame for calibration.")
+        return None
+    points = []
+
+    def on_click(event, x, y, flags, param):
+        if event == cv2.EVENT_LBUTTONDOWN:
+            points.append((x, y))
+    win = "Pool calibration: click corners, Enter = save, r = reset, Esc = cancel"
+    cv2.namedWindow(win)
+    cv2.setMouseCallback(win, on_click)
+    try:
+        while True:
+            view = frame.copy()
+            if points:
+                cv2.polylines(view, [np.array(points, np.int32)], len(points) > 2, (255, 200, 0), 2)
+                for p in points:
+                    cv2.circle(view, p, 4, (0, 0, 255), -1)
+            cv2.imshow(win, view)
+            key = cv2.waitKey(20) & 0xFF
+            if key == 27:
+                return None
+            if key == ord("r"):
+                points.clear()
+            if key in (13, 10) and len(points) >= 3:
+                break
+    finally:
+        cv2.destroyWindow(win)
+    h, w = frame.shape[:2]
+    save_region(points, (w, h), camera)
+    region = PoolRegion(points, (w, h))
+    region.crop(frame)
+    kept = 100.0 * (region.bbox[2] - region.bbox[0]) * (region.bbox[3] - region.bbox[1]) / (w * h)
+    print(f"✅ Saved pool region for '{camera}' ({len(points)} points, crop keeps {kept:.0f}% of the frame)")
+    return region
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Pool region calibration")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    c = sub.add_parser("calibrate", help="click the pool outline on a live frame")
+    c.add_argument("--camera", default=CAMERA)
+    c.add_argument("--source", default="0", help="camera index or video file")
+    args = ap.parse_args(argv)
+    if args.cmd == "calibrate":
+        source = int(args.source) if args.source.isdigit() else args.source
+        return 0 if calibrate(args.camera, source) is not None else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
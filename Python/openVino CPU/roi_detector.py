@@ -0,0 +1,162 @@
+# roi_detector.py
+# Once a target is locked, most of the frame is background. RoiDetector crops an expanded
+# window around the last target box, runs a second engine on it at a smaller input size and
+# maps the boxes back to frame pixels. A full-frame pass still runs every FULL_EVERY frames
+# (to catch new people) and whenever the target is not found inside the window.
+#
+#   python roi_detector.py [video|image folder]   latency + recall vs full-frame inference
+import os, sys, time
+
+import numpy as np
+
+from ov_postprocess import box_iou, MATCH_IOU
+
+TARGET_CLASS_ID = 0   # person
+ROI_IMGSZ = 256       # input size for the cropped window (full frame uses the engine's IMG_SIZE)
+ROI_EXPAND = 1.8      # window side = ROI_EXPAND x the longer side of the last target box
+ROI_MIN_PX = 160      # never crop smaller than this, tiny windows lose the target on the first step
+FULL_EVERY = 15       # full-frame pass at least every N frames
+
+
+def roi_window(box, frame_shape, expand=ROI_EXPAND, min_px=ROI_MIN_PX):
+    """Square-ish window (x0, y0, x1, y1) around `box`, shifted to stay inside the frame."""
+    h, w = frame_shape[:2]
+    x1, y1, x2, y2 = box
+    side = max(min_px, expand * max(x2 - x1, y2 - y1))
+    sw, sh = int(min(w, side)), int(min(h, side))
+    cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+    x0 = int(min(max(0, cx - sw / 2), w - sw))
+    y0 = int(min(max(0, cy - sh / 2), h - sh))
+    return x0, y0, x0 + sw, y0 + sh
+
+
+class RoiDetector:
+    """
+    Drop-in for a detection engine: detect(frame) -> (boxes, scores, class_ids) in frame pixels.
+    `full_engine` sees whole frames, `roi_engine` (same backend, smaller imgsz) sees the crops.
+    Only the locked target is guaranteed to be reported between full-frame passes.
+    `select(boxes, class_ids, frame_shape) -> index or None` picks the person to crop around
+    (e.g. SteeringEstimator.select); without it: best overlap with the last box, else top score.
+    With a pool_region.PoolRegion, window detections outside the pool are dropped before anything
+    locks onto them (wrap full_engine in a RegionDetector for the full-frame passes).
+    """
+
+    def __init__(self, full_engine, roi_engine, target_class=TARGET_CLASS_ID, expand=ROI_EXPAND,
+                 min_px=ROI_MIN_PX, full_every=FULL_EVERY, select=None, region=None):
+        self.full_engine = full_engine
+        self.roi_engine = roi_engine
+        self.target_class = target_class
+        self.select = select
+        self.region = region
+        self.expand = expand
+        self.min_px = min_px
+        self.full_every = full_every
+        self.name = f"{full_engine.name}+roi{roi_engine.imgsz}"
+
+        self.last_box = None
+        self.window = None        # last crop window, None after a full-frame pass
+        self.since_full = 0
+        self.n_full = 0
+        self.n_roi = 0
+
+    def detect(self, frame):
+        if self.last_box is None or self.since_full + 1 >= self.full_every:
+            return self._full(frame)
+        x0, y0, x1, y1 = self.window = roi_window(self.last_box, frame.shape, self.expand, self.min_px)
+        boxes, scores, ids = self.roi_engine.detect(frame[y0:y1, x0:x1])
+        self.n_roi += 1
+        self.since_full += 1
+        if self.region is not None:
+            boxes, scores, ids = self.region.restore(boxes, scores, ids, (x0, y0), frame.shape)
+        else:
+            boxes = boxes + np.array([x0, y0, x0, y0], np.float32)
+        if not np.any(ids == self.target_class):
+            # target left the window (or was occluded): look at the whole frame right away
+            return self._full(frame)
+        self._lock(boxes, scores, ids, frame.shape)
+        return boxes, scores, ids
+
+    def __call__(self, frame):
+        return self.detect(frame)
+
+    def warmup(self, *args, **kwargs):
+        return self.full_engine.warmup(*args, **kwargs) + self.roi_engine.warmup(*args, **kwargs)
+
+    def reset(self):
+        self.last_box = None
+        self.window = None
+        self.since_full = 0
+
+    @property
+    def roi_ratio(self):
+        return self.n_roi / max(1, self.n_roi + self.n_full)
+
+    def _full(self, frame):
+        boxes, scores, ids = self.full_engine.detect(frame)
+        self.n_full += 1
+        self.since_full = 0
+        self.window = None
+        self._lock(boxes, scores, ids, frame.shape)
+        return boxes, scores, ids
+
+    def _lock(self, boxes, scores, ids, frame_shape):
+        if self.select is not None:
+            i = self.select(boxes, ids, frame_shape)
+            self.last_box = None if i is None else tuple(float(v) for v in boxes[i])
+            return
+        m = ids == self.target_class
+        if not m.any():
+            self.last_box = None
+            return
+        boxes, scores = boxes[m], scores[m]
+        if self.last_box is not None:
+            # stay on the same person: best overlap with the previous box, else the most confident
+            iou = box_iou(np.asarray([self.last_box], np.float32), boxes)[0]
+            i = int(iou.argmax()) if iou.max() > 0 else int(scores.argmax())
+        else:
+            i = int(scores.argmax())
+        self.last_box = tuple(float(v) for v in boxes[i])
+
+
+def benchmark(source=None, n_frames=300, backend=None, roi_imgsz=ROI_IMGSZ):
+    """
+    Full-frame engine vs RoiDetector on the same frames. Recall counts full-frame target
+    detections that the ROI detector also reported (IoU >= MATCH_IOU).
+    """
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from detection_engine import create_engine, load_frames
+    frames = load_frames(source, n_frames)
+    if not frames:
+        print("No frames to benchmark.")
+        return
+    full = create_engine(backend)
+    roi = RoiDetector(full, create_engine(backend, imgsz=roi_imgsz))
+    roi.warmup()
+
+    full_ms, roi_ms = [], []
+    n_ref = n_hit = 0
+    for f in frames:
+        t0 = time.perf_counter()
+        ref_boxes, _, ref_ids = full.detect(f)
+        t1 = time.perf_counter()
+        boxes, _, ids = roi.detect(f)
+        t2 = time.perf_counter()
+        full_ms.append((t1 - t0) * 1000.0)
+        roi_ms.append((t2 - t1) * 1000.0)
+
+        ref = ref_boxes[ref_ids == TARGET_CLASS_ID]
+        got = boxes[ids == TARGET_CLASS_ID]
+        n_ref += len(ref)
+        if len(ref) and len(got):
+            n_hit += int((box_iou(ref, got).max(1) >= MATCH_IOU).sum())
+
+    full_ms, roi_ms = np.array(full_ms), np.array(roi_ms)
+    print(f"full frame: {full_ms.mean():6.1f} ms mean, {np.percentile(full_ms, 95):6.1f} ms p95")
+    print(f"roi       : {roi_ms.mean():6.1f} ms mean, {np.percentile(roi_ms, 95):6.1f} ms p95 "
+          f"({full_ms.mean() / roi_ms.mean():.1f}x) | crop on {100 * roi.roi_ratio:.0f}% of frames")
+    print(f"recall vs full frame: {n_hit}/{n_ref} = {n_hit / max(1, n_ref):.3f} "
+          f"(people outside the window are only seen on full-frame passes)")
+
+
+if __name__ == "__main__":
+    benchmark(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,110 @@
+# startup_bench.py
+# Cold-start cost of each detector entry point, measured in a fresh interpreter per run:
+# import time, model load/compile, first inference and a steady-state inference.
+# OpenVINO entry points run twice: with an empty CACHE_DIR (cold) and with a populated one (warm).
+#
+#   python startup_bench.py                 all entry points
+#   python startup_bench.py engine:openvino only the named ones
+import os, sys, json, time, shutil, tempfile, subprocess
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+LIVE_FEED_DIR = os.path.join(HERE, "..", "Live Camera Feed")
+
+_FRAME = "np.zeros((480, 640, 3), np.uint8)"
+
+# name -> (imports, load, one inference, uses the OpenVINO cache)
+ENTRY_POINTS = {
+    "ov_detection": (
+        "import numpy as np, ov_detection",
+        "ir_xml, prep = ov_detection.make_preprocessor(); "
+        "req = ov_detection.compile_ir(ov_detection.ir_dir_for(), ir_xml, {'PERFORMANCE_HINT': 'LATENCY'}).create_infer_request()",
+        f"req.infer({{0: prep({_FRAME})[0]}})",
+        True),
+    "engine:openvino": (
+        "import numpy as np, detection_engine",
+        "eng = detection_engine.create_engine('openvino')",
+        f"eng.detect({_FRAME})",
+        True),
+    "engine:onnxruntime": (
+        "import numpy as np, detection_engine",
+        "eng = detection_engine.create_engine('onnxruntime')",
+        f"eng.detect({_FRAME})",
+        False),
+    "engine:ultralytics": (
+        "import numpy as np, detection_engine",
+        "eng = detection_engine.create_engine('ultralytics')",
+        f"eng.detect({_FRAME})",
+        False),
+    # import only: PC_Brain must not pull in torch/ultralytics/livekit before main() runs
+    "PC_Brain (import)": (
+        f"sys.path.insert(0, {LIVE_FEED_DIR!r}); import PC_Brain; "
+        "heavy = [m for m in ('torch', 'ultralytics', 'livekit', 'openvino') if m in sys.modules]; "
+        "print('heavy modules at import:', heavy or 'none', file=sys.stderr)",
+        "pass",
+        "pass",
+        False),
+}
+
+_SNIPPET = """
+import json, sys, time
+t0 = time.perf_counter()
+sys.path.insert(0, {here!r})
+{imports}
+t1 = time.perf_counter()
+{load}
+t2 = time.perf_counter()
+{infer}
+t3 = time.perf_counter()
+{infer}
+t4 = time.perf_counter()
+print("STARTUP " + json.dumps(dict(import_s=t1-t0, load_s=t2-t1, first_s=t3-t2, steady_s=t4-t3)))
+"""
+
+
+def run_entry(name, cache_dir=""):
+    imports, load, infer, _ = ENTRY_POINTS[name]
+    code = _SNIPPET.format(here=HERE, imports=imports, load=load, infer=infer)
+    env = dict(os.environ, OV_CACHE_DIR=cache_dir)
+    t0 = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-c", code], cwd=HERE, env=env, capture_output=True, text=True)
+    wall = time.perf_counter() - t0
+    for line in proc.stdout.splitlines():
+        if line.startswith("STARTUP "):
+            res = json.loads(line[len("STARTUP "):])
+            res["wall_s"] = wall   # includes interpreter start
+            if proc.stderr.strip():
+                print(f"   {name}: {proc.stderr.strip().splitlines()[-1]}")
+            return res
+    err = (proc.stderr.strip().splitlines() or ["no output"])[-1]
+    print(f"⚠️ {name}: failed ({err})")
+    return None
+
+
+def main(names=None):
+    names = names or list(ENTRY_POINTS)
+    rows = []
+    cache_dir = tempfile.mkdtemp(prefix="ov_cache_bench_")
+    try:
+        for name in names:
+            runs = [("none", "")]
+            if ENTRY_POINTS[name][3]:
+                shutil.rmtree(cache_dir, ignore_errors=True)
+                # first run fills the cache, second one reads it
+                runs = [("cold", cache_dir), ("warm", cache_dir)]
+            for label, cdir in runs:
+                res = run_entry(name, cdir)
+                if res:
+                    rows.append((name, label, res))
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    print(f"{'entry point':>20} | {'cache':>5} | {'import s':>8} | {'load s':>6} | {'1st inf s':>9} | "
+          f"{'steady s':>8} | {'wall s':>6}")
+    for name, label, r in rows:
+        print(f"{name:>20} | {label:>5} | {r['import_s']:8.2f} | {r['load_s']:6.2f} | {r['first_s']:9.3f} | "
+              f"{r['steady_s']:8.3f} | {r['wall_s']:6.2f}")
+    return rows
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or None)
@@ -0,0 +1,215 @@
+# tiled_detector.py
+# Small, distant swimmers are a few pixels wide once the whole frame is squeezed into 416x416.
+# TiledDetector cuts the frame into overlapping tiles (SAHI-style), runs them as one batch through
+# the engine's detect_batch() so each tile is seen at full input resolution, shifts the boxes back
+# and merges duplicates across tile borders. A downscaled full-frame pass rides along in the same
+# batch for people too big for one tile.
+#
+# Merging is SAHI's greedy NMM over intersection-over-smaller-box, not IoU NMS: a person cut off at
+# a tile border comes back as a sliver of their full box, and a sliver has a low IoU with the whole
+# but an IoS near 1. Matching same-class boxes are replaced by their union, so someone no single
+# tile holds entirely is put back together from the pieces.
+#
+# Tiles where nothing moved are skipped (motion mask against a running background), so cost grows
+# with activity, not with tile count. A tile stays live for a while after it had a detection and
+# every tile is refreshed periodically: a motionless swimmer is exactly the case we can't miss.
+#
+#   python tiled_detector.py [video|image folder]   full frame vs tiled vs tiled + motion skip
+import sys, time
+
+import numpy as np
+import cv2
+
+from ov_postprocess import box_ios
+
+TILE_PX = 320           # tile side in frame pixels (inferred at the engine's imgsz, i.e. upscaled)
+TILE_OVERLAP = 0.2      # fraction of a tile shared with its neighbour
+FULL_FRAME_PASS = True  # also infer the whole frame in the same batch
+MOTION_SCALE = 0.25     # motion mask is computed on a downscaled grey image
+MOTION_ALPHA = 0.05     # background update rate
+MOTION_DIFF = 18        # grey-level difference that counts as motion
+MOTION_MIN_FRACTION = 0.002   # moving fraction of a tile that makes it active
+HOLD_FRAMES = 15        # keep a tile active this many frames after it produced a detection
+REFRESH_EVERY = 30      # run every tile at least this often
+MERGE_IOS = 0.5         # same-class boxes overlapping this much of the smaller one are one object
+
+
+def make_tiles(frame_shape, tile=TILE_PX, overlap=TILE_OVERLAP):
+    """Overlapping (x0, y0, x1, y1) windows covering the frame; edge tiles are shifted inward."""
+    h, w = frame_shape[:2]
+    tw, th = min(tile, w), min(tile, h)
+    step_x, step_y = max(1, int(tw * (1 - overlap))), max(1, int(th * (1 - overlap)))
+    xs = list(range(0, max(1, w - tw + 1), step_x))
+    ys = list(range(0, max(1, h - th + 1), step_y))
+    if xs[-1] + tw < w: xs.append(w - tw)
+    if ys[-1] + th < h: ys.append(h - th)
+    return [(x, y, x + tw, y + th) for y in ys for x in xs]
+
+
+class MotionMask:
+    """Running-average background on a small grey image; update(frame) -> bool mask."""
+
+    def __init__(self, scale=MOTION_SCALE, alpha=MOTION_ALPHA, diff=MOTION_DIFF):
+        self.scale = scale
+        self.alpha = alpha
+        self.diff = diff
+        self.background = None
+
+    def update(self, frame):
+        g = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        g = cv2.resize(g, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+        g = cv2.GaussianBlur(g, (5, 5), 0).astype(np.float32)
+        if self.background is None:
+            self.background = g
+            return np.ones(g.shape, bool)   # nothing to compare with yet: everything is "moving"
+        mask = cv2.absdiff(g, self.background) > self.diff
+        cv2.accumulateWeighted(g, self.background, self.alpha)
+        return mask
+
+    def fraction(self, mask, tile):
+        s = self.scale
+        x0, y0, x1, y1 = (int(v * s) for v in tile)
+        window = mask[y0:max(y0 + 1, y1), x0:max(x0 + 1, x1)]
+        return float(window.mean()) if window.size else 0.0
+
+
+class TiledDetector:
+    """
+    detect(frame) -> (boxes, scores, class_ids) in frame pixels, like a detection engine.
+    `engine` is a detection_engine engine (anything with detect_batch(frames)).
+    """
+
+    def __init__(self, engine, tile=TILE_PX, overlap=TILE_OVERLAP, full_frame=FULL_FRAME_PASS,
+                 motion=True, merge_ios=MERGE_IOS):
+        self.engine = engine
+        self.tile = tile
+        self.overlap = overlap
+        self.full_frame = full_frame
+        self.motion = MotionMask() if motion else None
+        self.merge_ios = merge_ios
+        self.name = f"{engine.name}+tiles"
+
+        self._tiles = None
+        self._shape = None
+        self._hold = None          # frames each tile stays active regardless of motion
+        self._since_refresh = 0
+        # stats
+        self.tiles_run = 0
+        self.tiles_skipped = 0
+
+    def detect(self, frame):
+        if frame.shape[:2] != self._shape:
+            self._shape = frame.shape[:2]
+            self._tiles = make_tiles(frame.shape, self.tile, self.overlap)
+            self._hold = np.zeros(len(self._tiles), int)
+            self._since_refresh = 0
+        active = self._active(frame)
+        self.tiles_run += len(active)
+        self.tiles_skipped += len(self._tiles) - len(active)
+
+        crops = [frame[y0:y1, x0:x1] for x0, y0, x1, y1 in (self._tiles[i] for i in active)]
+        offsets = [self._tiles[i][:2] for i in active]
+        if self.full_frame:
+            crops.append(frame)
+            offsets.append((0, 0))
+        if not crops:
+            return _empty()
+
+        parts = self.engine.detect_batch(crops)
+        boxes = np.concatenate([b + np.array([x, y, x, y], np.float32) for (b, _, _), (x, y) in zip(parts, offsets)])
+        scores = np.concatenate([s for _, s, _ in parts])
+        ids = np.concatenate([c for _, _, c in parts])
+        if not len(boxes):
+            return _empty()
+        boxes, scores, ids = merge_boxes(boxes, scores, ids, self.merge_ios)
+        self._hold_tiles_with(boxes)
+        return boxes, scores, ids
+
+    def __call__(self, frame):
+        return self.detect(frame)
+
+    def warmup(self, *args, **kwargs):
+        return self.engine.warmup(*args, **kwargs)
+
+    @property
+    def skip_ratio(self):
+        return self.tiles_skipped / max(1, self.tiles_run + self.tiles_skipped)
+
+    def _active(self, frame):
+        self._hold = np.maximum(self._hold - 1, 0)
+        self._since_refresh += 1
+        if self.motion is None:
+            return list(range(len(self._tiles)))
+        mask = self.motion.update(frame)
+        if self._since_refresh >= REFRESH_EVERY:
+            self._since_refresh = 0
+            return list(range(len(self._tiles)))
+        return [i for i, t in enumerate(self._tiles)
+                if self._hold[i] > 0 or self.motion.fraction(mask, t) >= MOTION_MIN_FRACTION]
+
+    def _hold_tiles_with(self, boxes):
+        cx = (boxes[:, 0] + boxes[:, 2]) / 2
+        cy = (boxes[:, 1] + boxes[:, 3]) / 2
+        for i, (x0, y0, x1, y1) in enumerate(self._tiles):
+            if np.any((cx >= x0) & (cx < x1) & (cy >= y0) & (cy < y1)):
+                self._hold[i] = HOLD_FRAMES
+
+
+def merge_boxes(boxes, scores, ids, ios_th=MERGE_IOS):
+    """
+    Greedy non-maximum merging: in score order, each remaining box grows into the union of the
+    same-class boxes whose IoS with that union is >= ios_th, keeping its own score. Matching against
+    the growing union picks up the far pieces of someone cut by two seams. -> (boxes, scores, ids)
+    """
+    order = np.argsort(-scores, kind="stable")
+    boxes, scores, ids = boxes[order], scores[order], ids[order]
+    free = np.ones(len(boxes), bool)
+    lead = []
+    for i in range(len(boxes)):   # tens of boxes per frame
+        if not free[i]:
+            continue
+        free[i] = False
+        union = boxes[i:i + 1].copy()
+        while True:
+            grab = free & (ids == ids[i]) & (box_ios(union, boxes)[0] >= ios_th)
+            if not grab.any():
+                break
+            free &= ~grab
+            g = np.vstack([union, boxes[grab]])
+            union[0] = g[:, 0].min(), g[:, 1].min(), g[:, 2].max(), g[:, 3].max()
+        boxes[i] = union[0]
+        lead.append(i)
+    return boxes[lead], scores[lead], ids[lead]
+
+
+def _empty():
+    return np.zeros((0, 4), np.float32), np.zeros((0,), np.float32), np.zeros((0,), np.int64)
+
+
+def benchmark(source=None, n_frames=200, backend=None, small_px=32):
+    """ms/frame and detections (and how many are small) for full frame, tiled, tiled + motion skip."""
+    from detection_engine import create_engine, load_frames
+    frames = load_frames(source, n_frames)
+    if not frames:
+        print("No frames to benchmark.")
+        return
+    engine = create_engine(backend)
+    engine.warmup()
+    runs = (("full frame", engine.detect),
+            ("tiled", TiledDetector(engine, motion=False)),
+            ("tiled + motion", TiledDetector(engine, motion=True)))
+    print(f"{'mode':>15} | {'ms/frame':>8} | {'dets':>5} | {f'< {small_px}px':>7} | tiles skipped")
+    for name, det in runs:
+        n_det = n_small = 0
+        t0 = time.perf_counter()
+        for f in frames:
+            boxes, _, _ = det(f)
+            n_det += len(boxes)
+            n_small += int(np.sum((boxes[:, 3] - boxes[:, 1]) < small_px))
+        ms = (time.perf_counter() - t0) * 1000.0 / len(frames)
+        skipped = f"{100 * det.skip_ratio:.0f}%" if isinstance(det, TiledDetector) else "-"
+        print(f"{name:>15} | {ms:8.1f} | {n_det:5d} | {n_small:7d} | {skipped}")
+
+
+if __name__ == "__main__":
+    benchmark(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,79 @@
+import os
+import sys
+import threading
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "YAMNET_ai_audio_model"))
+from audio_capture import AudioCapture, PA_INPUT_OVERFLOW
+
+WINDOW, HOP, CHUNK = 400, 200, 100
+
+
+def _feed(cap, n, start=0, status=0):
+    """n chunks whose samples count up from `start`, so every window says where it came from."""
+    for i in range(start, start + n):
+        data = np.arange(i * CHUNK, (i + 1) * CHUNK, dtype=np.int16).tobytes()
+        cap._on_audio(data, CHUNK, None, status)
+    return start + n
+
+
+def _last_sample(wav):
+    return int(round(wav[-1] * 32768))
+
+
+def test_latest_policy_skips_to_newest_window():
+    cap = AudioCapture(chunk=CHUNK, window=WINDOW, hop=HOP, policy="latest", queue_hops=2)
+    _feed(cap, 10)                                   # windows end at chunks 4, 6, 8, 10
+    wav = cap.get(timeout=0)
+    assert _last_sample(wav) == 10 * CHUNK - 1
+    assert cap.hops == 4 and cap.dropped_hops == 3
+    assert cap.get(timeout=0) is None and cap.timeouts == 1
+
+
+def test_fifo_policy_keeps_order_and_drops_oldest():
+    cap = AudioCapture(chunk=CHUNK, window=WINDOW, hop=HOP, policy="fifo", queue_hops=2)
+    _feed(cap, 10)
+    got = [_last_sample(cap.get(timeout=0)) for _ in range(2)]
+    assert got == [8 * CHUNK - 1, 10 * CHUNK - 1]     # the two newest, in order
+    assert cap.dropped_hops == 2
+
+
+def test_held_window_is_not_overwritten():
+    cap = AudioCapture(chunk=CHUNK, window=WINDOW, hop=HOP, policy="fifo", queue_hops=1)
+    n = _feed(cap, 4)
+    wav = cap.get(timeout=0)
+    held = wav.copy()
+    _feed(cap, 20, n)                                # producer keeps going while "inference" runs
+    np.testing.assert_array_equal(wav, held)
+
+
+def test_overflow_flag_is_counted():
+    cap = AudioCapture(chunk=CHUNK, window=WINDOW, hop=HOP)
+    _feed(cap, 3, status=PA_INPUT_OVERFLOW)
+    assert cap.stats()["overflows"] == 3
+
+
+def test_get_wakes_up_when_a_window_arrives():
+    cap = AudioCapture(chunk=CHUNK, window=WINDOW, hop=HOP)
+    threading.Timer(0.05, _feed, (cap, 4)).start()
+    assert cap.get(timeout=2.0) is not None
+
+
+def test_rejects_unknown_policy():
+    with pytest.raises(ValueError):
+        AudioCapture(policy="oldest")
+
+
+def test_new_samples_counts_dropped_hops():
+    cap = AudioCapture(chunk=CHUNK, window=WINDOW, hop=HOP, policy="latest")
+    n = _feed(cap, 4)
+    cap.get(timeout=0)
+    assert cap.new_samples == WINDOW                 # first window: all of it is new
+    n = _feed(cap, 2, n)
+    cap.get(timeout=0)
+    assert cap.new_samples == HOP
+    _feed(cap, 4, n)                                 # two hops, one gets skipped
+    cap.get(timeout=0)
+    assert cap.new_samples == 2 * HOP
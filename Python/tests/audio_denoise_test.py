@@ -0,0 +1,67 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "YAMNET_ai_audio_model"))
+from audio_denoise import StreamingDenoiser, WindowDenoiser, _synthetic, _windows, RATE
+
+
+def test_no_gating_reconstructs_input_in_any_chunking():
+    x = np.random.default_rng(0).standard_normal(RATE).astype(np.float32)
+    den = StreamingDenoiser(prop_decrease=0.0)
+    y = np.concatenate([den.process(x[i:i + 777]) for i in range(0, len(x), 777)])
+    np.testing.assert_allclose(y[den.delay:], x[:len(y) - den.delay], atol=1e-5)
+
+
+def test_noise_is_gated_and_events_kept():
+    x = _synthetic(seconds=12)
+    den = StreamingDenoiser()
+    y = den.process(x)
+    y = y[den.delay:]
+    t = np.arange(len(y)) / RATE
+    burst = np.sin(2 * np.pi * 0.25 * t) > 0.9
+    settled = t > 2.0                                   # give the noise profile a couple of seconds
+    rms = lambda a: np.sqrt(np.mean(a ** 2))
+    assert rms(y[settled & ~burst]) < 0.2 * rms(x[:len(y)][settled & ~burst])
+    assert rms(y[settled & burst]) > 0.3 * rms(x[:len(y)][settled & burst])
+
+
+def test_window_denoiser_matches_one_pass_over_the_stream():
+    x = _synthetic(seconds=5)
+    wd = WindowDenoiser()
+    clean = [wd(w).copy() for w in _windows(x)]
+    ref = StreamingDenoiser()
+    y = ref.process(x)
+    end = len(clean) * wd.hop + (len(clean[0]) - wd.hop)
+    np.testing.assert_allclose(clean[-1], y[end - len(clean[-1]):end], atol=1e-5)
+
+
+def _tone_in_noise(pre_s=4.0, tone_s=3.0, post_s=2.0, snr_db=23.0):
+    rng = np.random.default_rng(0)
+    n = int((pre_s + tone_s + post_s) * RATE)
+    x = 0.01 * rng.standard_normal(n).astype(np.float32)
+    a, b = int(pre_s * RATE), int((pre_s + tone_s) * RATE)
+    t = np.arange(b - a) / RATE
+    x[a:b] += 0.01 * np.sqrt(2) * 10 ** (snr_db / 20) * np.sin(2 * np.pi * 440 * t)
+    den = StreamingDenoiser()
+    y = np.concatenate([den.process(x[i:i + 7680]) for i in range(0, n, 7680)])
+    return x, np.r_[y[den.delay:], np.zeros(den.delay, np.float32)][:n]
+
+
+def test_sustained_narrowband_event_is_not_absorbed_into_the_noise_floor():
+    x, y = _tone_in_noise()
+    db = lambda s, e: 10 * np.log10(np.mean(y[int(s * RATE):int(e * RATE)] ** 2)
+                                    / np.mean(x[int(s * RATE):int(e * RATE)] ** 2))
+    assert db(4.1, 4.4) > -3.0          # onset
+    assert db(6.5, 7.0) > -3.0          # end of a 3 s tone: the floor didn't learn it as noise
+    assert db(1.0, 4.0) < -6.0          # noise alone is still gated
+
+
+def test_noise_floor_still_follows_a_lasting_background_rise():
+    rng = np.random.default_rng(1)
+    x = np.concatenate([0.01 * rng.standard_normal(4 * RATE), 0.05 * rng.standard_normal(20 * RATE)]).astype(np.float32)
+    den = StreamingDenoiser()
+    y = den.process(x)[den.delay:]
+    tail = slice(len(y) - 2 * RATE, len(y))
+    assert np.sqrt(np.mean(y[tail] ** 2)) < 0.5 * np.sqrt(np.mean(x[tail] ** 2))
@@ -0,0 +1,65 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "YAMNET_ai_audio_model"))
+from audio_events import EnergyGate, EventAlerter, HANGOVER_CHUNKS
+from audio_ring import CHUNK, HOP_CHUNKS
+
+HOP = HOP_CHUNKS * CHUNK
+NAMES = ["Speech", "Splash, splatter", "Screaming", "Shout", "Silence"]
+
+
+def _hop(level, rng):
+    return (level * rng.standard_normal(HOP)).astype(np.float32)
+
+
+def test_gate_stays_closed_on_steady_noise_and_opens_on_a_loud_hop():
+    rng = np.random.default_rng(0)
+    gate = EnergyGate()
+    quiet = [gate.update(_hop(0.01, rng)) for _ in range(20)]
+    assert not any(quiet[2:])                         # the first hops initialise the floor
+    assert gate.update(_hop(0.2, rng))
+    hang = [gate.update(_hop(0.01, rng)) for _ in range(4)]
+    assert hang[:HANGOVER_CHUNKS // HOP_CHUNKS - 1] == [True] * (HANGOVER_CHUNKS // HOP_CHUNKS - 1)
+    assert not hang[-1]
+    assert 0 < gate.duty_cycle < 0.5
+
+
+def _scores(**named):
+    s = np.zeros((3, len(NAMES)), np.float32)
+    for name, v in named.items():
+        s[:, NAMES.index(name)] = v
+    return s
+
+
+def test_alerts_are_rate_limited_per_type():
+    sent = []
+    alerter = EventAlerter(send=lambda *a, **k: sent.append(k), background=False, cooldown_s=60)
+    assert alerter.check(_scores(Screaming=0.8), NAMES, now=0) == ["scream"]
+    assert alerter.check(_scores(Screaming=0.8), NAMES, now=30) == []
+    assert alerter.check(_scores(Shout=0.5), NAMES, now=31) == ["shout"]
+    assert alerter.check(_scores(Screaming=0.8), NAMES, now=61) == ["scream"]
+    assert [k["alert_type"] for k in sent] == ["scream", "shout", "scream"]
+    assert sent[0]["severity"] == "critical" and alerter.suppressed == 1
+
+
+def test_low_scores_and_failures_do_not_raise():
+    def broken(*a, **k):
+        raise OSError("backend down")
+    alerter = EventAlerter(send=broken, background=False)
+    assert alerter.check(_scores(Speech=0.9, Shout=0.1), NAMES, now=0) == []
+    assert alerter.check(_scores(**{"Splash, splatter": 0.6}), NAMES, now=0) == ["splash"]
+    assert alerter.failed == 1 and alerter.sent == 0
+
+
+def test_gate_closes_again_after_a_lasting_rise_in_background_noise():
+    rng = np.random.default_rng(1)
+    gate = EnergyGate()
+    for _ in range(50):
+        gate.update(_hop(0.01, rng))
+    louder = [gate.update(_hop(0.05, rng)) for _ in range(60)]    # +14 dB for ~29 s, e.g. a pump starting
+    assert louder[0]                                               # a step up is an event at first
+    assert not any(louder[-20:])
+    assert gate.update(_hop(0.5, rng))                             # and real events above the new floor still open it
@@ -0,0 +1,35 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "YAMNET_ai_audio_model"))
+from audio_features import LogMelFrontend, log_mel, mel_matrix, PATCH_FRAMES, MEL_BANDS, STFT_HOP, RATE
+
+
+def test_mel_matrix_shape_and_band_limits():
+    m = mel_matrix()
+    assert m.shape == (257, MEL_BANDS)
+    hz = np.linspace(0, RATE / 2, 257)
+    used = hz[m.sum(axis=1) > 0]
+    assert used.min() > 125 and used.max() < 7500
+    assert np.all(m.argmax(axis=0)[1:] >= m.argmax(axis=0)[:-1])   # bands go up in frequency
+
+
+def test_streaming_patch_matches_batch_log_mel():
+    x = (0.1 * np.random.default_rng(0).standard_normal(3 * RATE)).astype(np.float32)
+    front = LogMelFrontend()
+    for i in range(0, len(x), 1234):                  # chunking unrelated to the STFT hop
+        front.push(x[i:i + 1234])
+    ref = log_mel(x)
+    assert front.frames == len(ref)
+    np.testing.assert_allclose(front.patch(), ref[-PATCH_FRAMES:], atol=1e-4)
+
+
+def test_patch_is_contiguous_and_ready_after_96_frames():
+    front = LogMelFrontend()
+    front.push(np.zeros(400 + (PATCH_FRAMES - 2) * STFT_HOP, np.float32))
+    assert not front.ready
+    front.push(np.zeros(STFT_HOP, np.float32))
+    assert front.ready and front.patch().shape == (PATCH_FRAMES, MEL_BANDS)
+    assert front.patch().flags.c_contiguous
@@ -0,0 +1,62 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "YAMNET_ai_audio_model"))
+from audio_ring import AudioRingBuffer, _deque_frontend, CHUNK, WIN_CHUNKS, HOP_CHUNKS
+
+
+def _chunks(n, size=CHUNK, seed=0):
+    rng = np.random.default_rng(seed)
+    return [rng.integers(-32768, 32767, size, dtype=np.int16) for _ in range(n)]
+
+
+def test_windows_match_deque_frontend():
+    chunks = _chunks(WIN_CHUNKS + 5 * HOP_CHUNKS + 7)
+    ring = AudioRingBuffer()
+    got = [ring.window().copy() for c in chunks if ring.push(c)]
+    want = list(_deque_frontend([c.tobytes() for c in chunks]))
+    assert len(got) == len(want) == 6
+    for g, w in zip(got, want):
+        assert g.dtype == np.float32
+        np.testing.assert_allclose(g, w.astype(np.float32), rtol=0, atol=1e-7)
+
+
+def test_chunks_straddling_the_ring_end():
+    window, hop, size = 1000, 500, 170          # 170 doesn't divide 1000: writes wrap mid-chunk
+    ring = AudioRingBuffer(window, hop)
+    stream = np.concatenate(_chunks(30, size))
+    for i in range(30):
+        if ring.push(stream[i * size:(i + 1) * size]):
+            end = (i + 1) * size
+            np.testing.assert_allclose(ring.window(), stream[end - window:end] / 32768.0, atol=1e-7)
+
+
+def test_hop_cadence_and_ready():
+    ring = AudioRingBuffer()
+    ready_at = [i for i, c in enumerate(_chunks(WIN_CHUNKS + 2 * HOP_CHUNKS)) if ring.push(c)]
+    assert ready_at == [WIN_CHUNKS - 1, WIN_CHUNKS + HOP_CHUNKS - 1, WIN_CHUNKS + 2 * HOP_CHUNKS - 1]
+    assert ring.ready
+
+
+def test_bytes_in_and_window_into_caller_buffer():
+    chunks = _chunks(WIN_CHUNKS + HOP_CHUNKS + 3)
+    ring, out = AudioRingBuffer(), np.empty(WIN_CHUNKS * CHUNK, np.float32)
+    want = list(_deque_frontend([c.tobytes() for c in chunks]))
+    got = []
+    for c in chunks:
+        if ring.push(memoryview(c.tobytes()).cast("h")):     # what the PortAudio callback pushes
+            assert ring.window(out=out) is out
+            got.append(out.copy())
+    assert len(got) == len(want) == 2
+    for g, w in zip(got, want):
+        np.testing.assert_allclose(g, w.astype(np.float32), rtol=0, atol=1e-7)
+
+
+def test_float_ring_keeps_float_samples():
+    ring = AudioRingBuffer(8, 4, np.float32)
+    ring.push(np.arange(4, dtype=np.float64) / 10)   # other dtype: cast, not rejected
+    assert not ring.push(np.arange(4, 6, dtype=np.float32) / 10)
+    assert ring.push(np.arange(6, 8, dtype=np.float32) / 10)
+    np.testing.assert_allclose(ring.window(), np.arange(8) / 10, atol=1e-7)
@@ -0,0 +1,45 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "openVino CPU"))
+import autotune
+
+
+def test_tune_picks_best_latency_and_throughput(tmp_path, monkeypatch):
+    monkeypatch.setattr(autotune, "PROFILE_PATH", str(tmp_path / "profile.json"))
+    monkeypatch.setattr(autotune, "sweep_openvino", lambda frames: [
+        {"section": "openvino", "config": {"NUM_STREAMS": 1, "INFERENCE_NUM_THREADS": 4}, "mean_ms": 20.0, "fps": 50.0},
+        {"section": "openvino", "config": {"NUM_STREAMS": 2, "INFERENCE_NUM_THREADS": 4}, "mean_ms": 30.0, "fps": 70.0},
+    ])
+    monkeypatch.setattr(autotune, "sweep_workers", lambda frames: [
+        {"section": "workers", "config": n, "mean_ms": None, "fps": fps} for n, fps in ((1, 10.0), (2, 18.0), (4, 15.0))
+    ])
+
+    autotune.tune([None], sections=("openvino", "workers"))
+
+    assert autotune.openvino_config("latency") == {"NUM_STREAMS": 1, "INFERENCE_NUM_THREADS": 4}
+    assert autotune.openvino_config("throughput") == {"NUM_STREAMS": 2, "INFERENCE_NUM_THREADS": 4}
+    assert autotune.best_workers() == 2
+    assert "workers" not in autotune.load_profile()["latency"]
+
+
+def test_partial_sweep_keeps_other_sections(tmp_path, monkeypatch):
+    monkeypatch.setattr(autotune, "PROFILE_PATH", str(tmp_path / "profile.json"))
+    monkeypatch.setattr(autotune, "sweep_workers", lambda frames: [
+        {"section": "workers", "config": 3, "mean_ms": None, "fps": 9.0}])
+    monkeypatch.setattr(autotune, "sweep_torch", lambda frames: [
+        {"section": "torch", "config": {"intra_op": 2, "inter_op": 1}, "mean_ms": 80.0, "fps": 12.5}])
+
+    autotune.tune([None], sections=("workers",))
+    autotune.tune([None], sections=("torch",))
+
+    assert autotune.best_workers() == 3
+    assert autotune.torch_threads("latency") == (2, 1)
+
+
+def test_untuned_host_uses_defaults(tmp_path, monkeypatch):
+    monkeypatch.setattr(autotune, "PROFILE_PATH", str(tmp_path / "missing.json"))
+    assert autotune.openvino_config() == {}
+    assert autotune.torch_threads() is None
+    assert autotune.apply_torch_threads() is None
+    assert autotune.best_workers(3) == 3
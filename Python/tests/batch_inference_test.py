@@ -0,0 +1,60 @@
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "openVino CPU"))
+from batch_inference import BatchedInferenceService
+
+
+def test_results_routed_to_callers():
+    calls = []
+
+    def infer_batch(frames):
+        calls.append(len(frames))
+        return [f * 10 for f in frames]
+
+    with BatchedInferenceService(infer_batch, max_batch_size=4, max_wait_ms=50) as svc:
+        futures = [svc.submit(i) for i in range(10)]
+        results = [f.result(timeout=5) for f in futures]
+
+    assert results == [i * 10 for i in range(10)]
+    assert max(calls) <= 4
+    assert sum(calls) == 10
+    assert svc.batches < 10  # frames were actually grouped
+
+
+def test_concurrent_producers():
+    with BatchedInferenceService(lambda frames: list(frames), max_batch_size=8, max_wait_ms=5) as svc:
+        out = {}
+
+        def producer(pid):
+            out[pid] = [svc.infer((pid, k), timeout=5) for k in range(20)]
+
+        threads = [threading.Thread(target=producer, args=(p,)) for p in range(4)]
+        for t in threads: t.start()
+        for t in threads: t.join()
+
+    for pid in range(4):
+        assert out[pid] == [(pid, k) for k in range(20)]
+
+
+def test_errors_propagate_to_every_caller():
+    def infer_batch(frames):
+        raise ValueError("boom")
+
+    with BatchedInferenceService(infer_batch, max_batch_size=2, max_wait_ms=20) as svc:
+        futures = [svc.submit(i) for i in range(3)]
+        for f in futures:
+            assert isinstance(f.exception(timeout=5), ValueError)
+
+
+def test_submit_after_stop_raises():
+    svc = BatchedInferenceService(lambda frames: list(frames))
+    with pytest.raises(RuntimeError):
+        svc.submit(1)   # never started
+    with svc:
+        assert svc.infer(1, timeout=5) == 1
+    with pytest.raises(RuntimeError):
+        svc.infer(2)    # stopped: fails at once instead of waiting forever
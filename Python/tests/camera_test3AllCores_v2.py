@@ -3,11 +3,17 @@ import cv2
 from ultralytics import YOLO
 from picamera2 import Picamera2, Preview
 import time
+import os, sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "openVino CPU"))
+from video_recorder import VideoRecorder
+import autotune
 from ultralytics import solutions
 
 
-# Use all CPU cores
-torch.set_num_threads(4)
+# Thread counts from `python autotune.py` on this host (all 4 cores if it hasn't been run)
+autotune.apply_torch_threads("latency", default=4)
 
 # Initialize Picamera2
 picam2 = Picamera2()
@@ -15,12 +21,9 @@ config = picam2.create_preview_configuration(main={"size": (640, 480)}, display=
 picam2.configure(config)
 picam2.start()
 
-# Get frame size for VideoWriter
-w, h = 640, 480
+# Video writer (encodes on a background thread, rotates files by time/size)
 fps = 30  # Picamera2 default FPS
-video_writer = cv2.VideoWriter("instance-segmentation.avi",
-                               cv2.VideoWriter_fourcc(*"mp4v"),
-                               fps, (w, h))
+video_writer = VideoRecorder(prefix="instance-segmentation", fps=fps).start()
 
 # Load YOLO model
 visioneye = solutions.VisionEye(
@@ -51,6 +54,6 @@ try:
 
 finally:
     picam2.stop()
-    video_writer.release()
+    video_writer.stop()
     cv2.destroyAllWindows()
     print("Video capture stopped.")
@@ -0,0 +1,24 @@
+import os
+import sys
+
+import cv2
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "openVino CPU"))
+from detection_engine import load_frames
+
+
+def test_load_frames_skips_unreadable_images(tmp_path):
+    cv2.imwrite(str(tmp_path / "a.jpg"), np.zeros((8, 8, 3), np.uint8))
+    (tmp_path / "b.jpg").write_bytes(b"not a jpeg")
+    cv2.imwrite(str(tmp_path / "c.png"), np.zeros((8, 8, 3), np.uint8))
+    frames = load_frames(str(tmp_path), 10)
+    assert len(frames) == 2 and all(f.shape == (8, 8, 3) for f in frames)
+    assert len(load_frames(str(tmp_path), 1)) == 1
+
+
+def test_load_frames_errors_when_nothing_is_readable(tmp_path):
+    (tmp_path / "b.jpg").write_bytes(b"")
+    with pytest.raises(ValueError, match="No readable images"):
+        load_frames(str(tmp_path))
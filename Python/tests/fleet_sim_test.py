@@ -0,0 +1,32 @@
+import os
+import random
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import fleet_sim
+from fleet_sim import FleetSim, STATES, COLLISIONS
+
+
+def test_fleet_reproduces_scalar_sim_for_identical_seeds():
+    seeds = [0, 1, 7, 42, 1234, 99999] + list(range(100, 120))
+    fleet = FleetSim(seeds=seeds)
+    boats = [fleet_sim._sim.AquaguardSim(rng=random.Random(s)) for s in seeds]
+    for _ in range(1500):
+        fleet.step()
+        for b in boats:
+            b.update()
+    np.testing.assert_array_equal(fleet.x, [b.x for b in boats])
+    np.testing.assert_array_equal(fleet.y, [b.y for b in boats])
+    np.testing.assert_array_equal(fleet.heading, [b.heading for b in boats])
+    assert [STATES[k] for k in fleet.state] == [b.state for b in boats]
+    assert [COLLISIONS[k] for k in fleet.collision_type] == [b.collision_type for b in boats]
+    np.testing.assert_array_equal(fleet.front, [b.sensors["front"] for b in boats])
+
+
+def test_summary_counts_states_and_collisions():
+    stats = FleetSim(50).run(400)
+    assert abs(sum(stats["state_fraction"].values()) - 1.0) < 1e-9
+    assert stats["collisions_per_1000_steps"]["FREE"] > 0
+    assert stats["boats"] == 50 and stats["steps"] == 400
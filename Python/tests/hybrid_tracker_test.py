@@ -0,0 +1,82 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "openVino CPU"))
+from hybrid_tracker import HybridTracker
+
+PATCH = np.random.default_rng(0).integers(0, 255, (80, 60, 3), dtype=np.uint8)
+
+
+def _scene(x, y):
+    frame = np.full((360, 640, 3), 90, np.uint8)
+    frame[y:y+80, x:x+60] = PATCH
+    return frame
+
+
+class FakeDetector:
+    def __init__(self):
+        self.calls = 0
+        self.pos = (0, 0)
+
+    def __call__(self, frame):
+        self.calls += 1
+        x, y = self.pos
+        return (np.array([[x, y, x+60, y+80]], np.float32), np.array([0.9], np.float32),
+                np.array([0], np.int64))
+
+
+def test_flow_follows_target_between_detections():
+    det = FakeDetector()
+    tracker = HybridTracker(det, max_interval=8)
+    for k in range(40):
+        det.pos = (100 + 3*k, 120 + k)
+        box, score, detected = tracker.update(_scene(*det.pos))
+        assert box is not None
+        x, y = det.pos
+        assert abs(box[0] - x) < 6 and abs(box[1] - y) < 6
+    assert det.calls < 20          # most frames were tracked, not detected
+    assert tracker.interval > 1    # slow, steady motion stretched N
+
+
+def test_no_target_keeps_detecting():
+    class Empty:
+        calls = 0
+        def __call__(self, frame):
+            Empty.calls += 1
+            return np.zeros((0, 4), np.float32), np.zeros(0, np.float32), np.zeros(0, np.int64)
+
+    tracker = HybridTracker(Empty())
+    for _ in range(5):
+        box, _, detected = tracker.update(_scene(10, 10))
+        assert box is None and detected
+    assert Empty.calls == 5
+
+
+def test_cpu_budget_raises_interval():
+    tracker = HybridTracker(FakeDetector(), max_interval=10, frame_budget_ms=10)
+    tracker.detect_ms, tracker.track_ms = 95.0, 2.0
+    tracker.motion, tracker.quality = 0.05, 1.0
+    tracker._adapt_interval()
+    assert tracker.interval >= 10
+
+
+def test_select_chooses_the_target_on_detector_frames():
+    class TwoPeople:
+        def __call__(self, frame):
+            boxes = np.array([[10, 10, 70, 90], [300, 100, 360, 180]], np.float32)
+            return boxes, np.array([0.9, 0.5], np.float32), np.array([0, 0], np.int64)
+
+    picked = []
+
+    def select(boxes, class_ids, frame_shape):   # e.g. SteeringEstimator.select
+        picked.append(frame_shape)
+        return 1
+
+    box, score, detected = HybridTracker(TwoPeople(), select=select).update(_scene(10, 10))
+    assert detected and box == (300, 100, 360, 180) and score == 0.5   # not the top score
+    assert picked == [(360, 640, 3)]
+
+    tracker = HybridTracker(TwoPeople(), select=lambda *a: None)
+    assert tracker.update(_scene(10, 10))[0] is None
@@ -0,0 +1,78 @@
+import os
+import sys
+import time
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "openVino CPU"))
+from inference_pool import InferencePool, SharedFrameRing
+
+SHAPE = (48, 64, 3)
+
+
+def _fake_detector():
+    # runs in the worker: odd frames take longer so results finish out of order
+    def detect(frame):
+        value = int(frame[0, 0, 0])
+        if value % 2:
+            time.sleep(0.02)
+        if value == 99:
+            raise ValueError("bad frame")
+        if value == 77:
+            os._exit(9)   # killed mid-run, e.g. by the OOM killer
+        return value, int(frame.sum())
+    return detect
+
+
+def test_results_come_back_in_order():
+    frames = [np.full(SHAPE, i, np.uint8) for i in range(20)]
+    with InferencePool(_fake_detector, workers=2, frame_shape=SHAPE, slots=3) as pool:
+        got = []
+        for f in frames:
+            if pool.in_flight == pool.ring.n_slots:
+                got.append(pool.get())
+            pool.submit(f)
+        got.extend(pool)
+    assert [seq for seq, _ in got] == list(range(20))
+    assert [out for _, out in got] == [(i, i * int(np.prod(SHAPE))) for i in range(20)]
+
+
+def test_worker_errors_reach_the_caller():
+    with InferencePool(_fake_detector, workers=1, frame_shape=SHAPE) as pool:
+        pool.submit(np.full(SHAPE, 99, np.uint8))
+        with pytest.raises(ValueError):
+            pool.get(timeout=10)
+
+
+def test_ring_slots_share_one_block():
+    ring = SharedFrameRing(3, SHAPE)
+    try:
+        other = SharedFrameRing(3, SHAPE, name=ring.name)
+        ring.frames[1] = 7
+        assert other.frames[1].min() == 7 and other.frames[0].max() == 0
+        other.close()
+    finally:
+        ring.close()
+
+
+def _dying_detector():
+    os._exit(3)   # like a segfault / OOM kill: no "failed" message
+
+
+def test_worker_dying_during_startup_raises():
+    t0 = time.perf_counter()
+    with pytest.raises(RuntimeError, match=r"infer-0 \(exit code 3\) exited before it was ready"):
+        InferencePool(_dying_detector, workers=1, frame_shape=SHAPE)
+    assert time.perf_counter() - t0 < 30
+
+
+def test_worker_dying_mid_run_raises_instead_of_hanging():
+    with InferencePool(_fake_detector, workers=1, frame_shape=SHAPE) as pool:
+        pool.submit(np.full(SHAPE, 2, np.uint8))
+        pool.submit(np.full(SHAPE, 77, np.uint8))
+        assert pool.get()[0] == 0
+        t0 = time.perf_counter()
+        with pytest.raises(RuntimeError, match=r"infer-0 \(exit code 9\) exited with frames in flight"):
+            pool.get()                                  # no timeout: used to block forever
+        assert time.perf_counter() - t0 < 30
@@ -0,0 +1,70 @@
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "openVino CPU"))
+from input_scheduler import InputSizeScheduler, AdaptiveEngine
+
+
+def _cost(size, load=1.0):
+    # latency roughly follows pixel count: 40 ms at 416 on an idle CPU
+    return 40.0 * (size / 416) ** 2 * load
+
+
+def test_steps_down_under_load_and_back_up():
+    sched = InputSizeScheduler(target_ms=55, start=416, hold_frames=5)
+    for _ in range(100):
+        sched.observe(_cost(sched.size, load=2.0))
+    assert sched.size == 320   # ~47 ms under double load
+
+    for _ in range(200):
+        sched.observe(_cost(sched.size))
+    assert sched.size == 416   # 512 would be ~61 ms, over the target
+
+
+def test_holds_between_switches():
+    sched = InputSizeScheduler(target_ms=10, start=640, hold_frames=10)
+    sizes = [sched.observe(1000.0) for _ in range(25)]
+    assert sizes[:9] == [640] * 9
+    assert sched.switches == 2
+
+
+def _engine_class(built, gate=None):
+    class Engine:
+        name = "fake"
+        def __init__(self, size):
+            if gate is not None and built:
+                gate.wait(5)            # the background builds wait until the test lets them go
+            built.append(size)
+            self.size = size
+            self.warmups = 0
+        def detect(self, frame):
+            return self.size
+        def warmup(self):
+            self.warmups += 1
+            return 0.0
+    return Engine
+
+
+def test_adaptive_engine_only_steps_onto_sizes_already_built():
+    built, gate = [], threading.Event()
+    eng = AdaptiveEngine(_engine_class(built, gate), sizes=(256, 416), target_ms=1e9, start=256)
+    assert eng.name == "fake@adaptive"
+    sizes = [eng.detect(None) for _ in range(20)]
+    assert sizes == [256] * 20            # 416 still building: detect() keeps to what it has, never builds
+    assert built == [256]
+
+    gate.set()
+    assert eng.wait_ready(5)
+    sizes = [eng.detect(None) for _ in range(20)]
+    assert sizes[-1] == 416               # plenty of headroom: stepped up once it was there
+    assert built == [256, 416]            # each size built exactly once
+    assert eng.engines[416].warmups == 1  # warmed on the builder thread, before its first timed frame
+    assert eng.engines[256].warmups == 0  # the start engine is warmed by the caller
+
+
+def test_adaptive_engine_can_build_every_size_up_front():
+    built = []
+    eng = AdaptiveEngine(_engine_class(built), sizes=(256, 320, 416, 512), start=320, background=False)
+    assert built == [320, 256, 416, 512]  # nearest to the start first
+    assert eng.wait_ready(0)
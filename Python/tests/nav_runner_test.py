@@ -0,0 +1,41 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import nav_runner
+from fleet_sim import FleetSim, COLLISIONS
+
+
+def test_headless_run_metrics():
+    stats, traj, grid = nav_runner.run(3000, seed=3, report_every=500)
+    assert len(traj) == 3000 and grid.sum() == 3000
+    curve = [c for _, c in stats["coverage_curve"]]
+    assert curve == sorted(curve) and curve[-1] == stats["coverage"] == np.count_nonzero(grid) / grid.size
+    assert 0 <= stats["corner_fraction"] <= 1
+    marks = [n for n in stats["steps_to_coverage"].values() if n is not None]
+    assert marks == sorted(marks)
+
+
+def test_collision_counts_match_fleet_for_same_seed():
+    stats, _, _ = nav_runner.run(2000, seed=11)
+    fleet = FleetSim(seeds=[11])
+    fleet.run(2000)
+    assert stats["collisions"] == {name: int(fleet.collisions[0, k]) for k, name in enumerate(COLLISIONS) if k}
+
+
+def test_longest_run():
+    assert nav_runner._longest_run(np.array([0, 1, 1, 0, 1, 1, 1, 0], bool)) == 3
+    assert nav_runner._longest_run(np.zeros(5, bool)) == 0
+
+
+def test_zero_steps_are_rejected():
+    with pytest.raises(SystemExit):
+        nav_runner.main(["--steps", "0"])
+    with pytest.raises(ValueError):
+        nav_runner.run(0)
+    with pytest.raises(ValueError):
+        nav_runner.run_fleet(0, 4)
+    assert nav_runner.run(1, seed=0)[0]["steps"] == 1
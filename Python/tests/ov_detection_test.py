@@ -0,0 +1,36 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "openVino CPU"))
+import ov_detection
+
+
+def test_letterbox_buffer_matches_letterbox():
+    rng = np.random.default_rng(0)
+    lb = ov_detection.LetterboxBuffer(416)
+    for shape in ((360, 640, 3), (480, 640, 3), (360, 640, 3), (640, 480, 3)):
+        frame = rng.integers(0, 255, shape, dtype=np.uint8)
+        expected, r, pad = ov_detection.letterbox(frame, (416, 416))
+        blob, r2, pad2 = lb(frame)
+        assert blob.shape == (1, 416, 416, 3) and blob.dtype == np.uint8
+        np.testing.assert_array_equal(blob[0], expected)
+        assert (r2, pad2) == (r, pad)
+
+
+def test_letterbox_buffer_reuses_canvas():
+    lb = ov_detection.LetterboxBuffer(416)
+    frame = np.zeros((360, 640, 3), np.uint8)
+    first, _, _ = lb(frame)
+    second, _, _ = lb(frame + 1)
+    assert np.shares_memory(first, second)
+    assert second[0, 208, 208, 0] == 1
+
+
+def test_thread_budget_limits_openvino_streams(monkeypatch):
+    monkeypatch.delenv(ov_detection.THREAD_BUDGET_ENV, raising=False)
+    assert ov_detection.thread_budget() is None
+    monkeypatch.setenv(ov_detection.THREAD_BUDGET_ENV, "2")
+    config = ov_detection.ov_config("THROUGHPUT")
+    assert config["NUM_STREAMS"] == 1 and config["INFERENCE_NUM_THREADS"] == 2
@@ -0,0 +1,90 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "openVino CPU"))
+import ov_detection
+import ov_postprocess
+from ov_postprocess import dense_predictions, legacy_postprocess
+
+LETTERBOX = (416 / 640, (0, 52), (360, 640, 3))
+
+
+def _sorted(boxes, scores, ids):
+    order = np.lexsort((-scores, ids))
+    return boxes[order], scores[order], ids[order]
+
+
+def test_matches_legacy_on_dense_scenes():
+    for seed in range(5):
+        pred = dense_predictions(seed=seed)
+        for conf in (0.05, 0.3, 0.6):
+            new = ov_detection.postprocess(pred, *LETTERBOX, conf_th=conf)
+            old = legacy_postprocess(pred, *LETTERBOX, conf_th=conf)
+            for a, b in zip(_sorted(*new), _sorted(*old)):
+                np.testing.assert_array_equal(a, b)
+
+
+def test_matches_legacy_on_row_major_output():
+    pred = dense_predictions(n_anchors=500, n_objects=10, seed=7)
+    new = ov_postprocess.postprocess(pred.T, *LETTERBOX)
+    old = legacy_postprocess(pred, *LETTERBOX)
+    for a, b in zip(_sorted(*new), _sorted(*old)):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_nms_batched_matches_per_class_nms_np():
+    rng = np.random.default_rng(3)
+    xy = rng.uniform(0, 300, (400, 2))
+    boxes = np.concatenate([xy, xy + rng.uniform(10, 80, (400, 2))], 1).astype(np.float32)
+    scores = rng.random(400).astype(np.float32)
+    ids = rng.integers(0, 4, 400)
+
+    expected = set()
+    for c in np.unique(ids):
+        idx = np.flatnonzero(ids == c)
+        expected |= {int(idx[k]) for k in ov_detection.nms_np(boxes[idx], scores[idx], 0.45)}
+
+    keep = ov_postprocess.nms_batched(boxes, scores, ids, 0.45)
+    assert set(keep.tolist()) == expected
+    assert np.all(np.diff(scores[keep]) <= 0)  # highest score first
+
+
+def test_class_filter_and_empty():
+    pred = dense_predictions(n_anchors=300, n_objects=8)
+    boxes, scores, ids = ov_postprocess.postprocess(pred, *LETTERBOX, class_filter={0})
+    assert len(boxes) and np.all(ids == 0)
+
+    boxes, scores, ids = ov_postprocess.postprocess(pred, *LETTERBOX, conf_th=1.1)
+    assert boxes.shape == (0, 4) and scores.shape == (0,) and ids.shape == (0,)
+
+
+def test_box_iou_pairwise():
+    a = np.array([[0, 0, 10, 10], [0, 0, 5, 10]], np.float32)
+    b = np.array([[0, 0, 10, 10], [20, 20, 30, 30]], np.float32)
+    np.testing.assert_allclose(ov_postprocess.box_iou(a, b), [[1, 0], [0.5, 0]], atol=1e-6)
+
+
+def test_box_ios_is_relative_to_the_smaller_box():
+    a = np.array([[0, 0, 100, 100]], np.float32)
+    b = np.array([[60, 0, 100, 100], [90, 0, 190, 100]], np.float32)
+    np.testing.assert_allclose(ov_postprocess.box_ios(a, b), [[1.0, 0.1]], atol=1e-6)
+    np.testing.assert_allclose(ov_postprocess.box_iou(a, b)[0, 0], 0.4, atol=1e-6)
+
+
+def test_nms_cv2_batched_matches_nms_batched():
+    rng = np.random.default_rng(5)
+    xy = rng.uniform(0, 600, (300, 2))
+    boxes = np.concatenate([xy, xy + rng.uniform(10, 120, (300, 2))], 1).astype(np.float32)
+    boxes[150:] = boxes[:150]                  # the same boxes again under other classes: the class
+    ids = rng.integers(0, 5, 300)              # offset must keep them out of each other's NMS
+    ids[150:] = (ids[:150] + 1) % 5
+    scores = rng.random(300).astype(np.float32)
+
+    expected = ov_postprocess.nms_batched(boxes, scores, ids, 0.45)
+    keep = ov_postprocess.nms_cv2_batched(boxes, scores, ids, 0.45)
+    assert set(keep.tolist()) == set(expected.tolist())
+    kept = set(keep.tolist())
+    assert any(i in kept and i + 150 in kept for i in range(150))   # identical boxes, both classes kept
+    assert ov_postprocess.nms_cv2_batched(boxes[:0], scores[:0], ids[:0]).shape == (0,)
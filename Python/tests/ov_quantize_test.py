@@ -0,0 +1,66 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "openVino CPU"))
+import ov_quantize
+
+
+def test_average_precision_perfect_and_half():
+    tp = np.array([True, True])
+    assert ov_quantize.average_precision(tp, np.array([0.9, 0.8]), 2) == 1.0
+    # one of two objects found, with a higher-scored false positive in front of it
+    tp = np.array([False, True])
+    assert abs(ov_quantize.average_precision(tp, np.array([0.9, 0.8]), 2) - 0.25) < 1e-9
+
+
+def test_match_is_one_to_one():
+    gt = np.array([[0, 0, 10, 10]], float)
+    preds = np.array([[0, 0, 10, 10], [1, 1, 10, 10]], float)
+    tp = ov_quantize.match(preds, np.array([0.5, 0.9]), gt)
+    assert tp.tolist() == [False, True]  # only the higher score gets the object
+
+
+def test_load_labels_images_labels_layout(tmp_path):
+    (tmp_path / "images").mkdir(); (tmp_path / "labels").mkdir()
+    img = tmp_path / "images" / "a.jpg"
+    img.write_bytes(b"")
+    (tmp_path / "labels" / "a.txt").write_text("0 0.5 0.5 0.2 0.4\n")
+    boxes, cls = ov_quantize.load_labels(str(img), (100, 200, 3))
+    np.testing.assert_allclose(boxes, [[80, 30, 120, 70]])
+    assert cls.tolist() == [0]
+
+
+def test_empty_label_file_is_a_negative_image(tmp_path):
+    import cv2
+    (tmp_path / "images").mkdir(); (tmp_path / "labels").mkdir()
+    for stem, labels in (("a", ""), ("b", "0 0.5 0.5 0.2 0.4\n")):
+        cv2.imwrite(str(tmp_path / "images" / f"{stem}.jpg"), np.zeros((100, 200, 3), np.uint8))
+        (tmp_path / "labels" / f"{stem}.txt").write_text(labels)
+
+    boxes, cls = ov_quantize.load_labels(str(tmp_path / "images" / "a.jpg"), (100, 200, 3))
+    assert boxes.shape == (0, 4) and cls.shape == (0,)
+
+    def detect(frame):   # one false positive on the negative image, the person found on the other
+        return (np.array([[80, 30, 120, 70]], np.float32), np.array([0.9], np.float32), np.array([0]))
+
+    images = [str(tmp_path / "images" / f"{stem}.jpg") for stem in "ab"]
+    res = ov_quantize.evaluate(detect, images)
+    assert res["person_recall"] == 1.0
+    assert 0.0 < res["map50"] < 1.0
+
+
+def test_detect_head_patterns_leave_the_backbone_quantized():
+    import re
+    xml = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "openVino CPU", "yolo11n_openvino_416", "yolo11n.xml")
+    with open(xml) as f:
+        names = re.findall(r'<layer id="\d+" name="([^"]+)"', f.read())
+    patterns = ov_quantize.detect_head_patterns(names)
+    ignored = {n for n in names if any(re.fullmatch(p, n) for p in patterns)}
+    assert "__module.model.23/aten::sigmoid/Sigmoid" in ignored
+    assert "__module.model.23/aten::mul/Multiply" in ignored
+    assert "__module.model.23.dfl/aten::softmax/Softmax" in ignored
+    assert "__module.model.23.dfl.conv/aten::_convolution/Convolution" in ignored
+    assert all("model.23" in n for n in ignored)                    # nothing from the backbone / neck
+    assert not any("cv2" in n or "cv3" in n for n in ignored)       # nor the head's own convolutions
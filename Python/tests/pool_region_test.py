@@ -0,0 +1,51 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "openVino CPU"))
+from pool_region import PoolRegion, RegionDetector, load_region, save_region
+
+POLY = [(100, 200), (540, 200), (600, 470), (40, 470)]   # trapezoid: pool seen from the deck
+
+
+class RecordingEngine:
+    name = "rec"
+
+    def __init__(self, boxes):
+        self.boxes = np.array(boxes, np.float32)
+        self.shapes = []
+
+    def detect(self, frame):
+        self.shapes.append(frame.shape[:2])
+        n = len(self.boxes)
+        return self.boxes, np.full(n, 0.8, np.float32), np.zeros(n, np.int64)
+
+
+def test_crop_and_filter_by_polygon():
+    region = PoolRegion(POLY, (640, 480), margin=10)
+    # crop-relative boxes: a swimmer in the water, and someone standing on the deck above it
+    engine = RecordingEngine([[300, 100, 340, 160], [0, 0, 30, 40]])
+    det = RegionDetector(engine, region)
+    boxes, scores, ids = det.detect(np.zeros((480, 640, 3), np.uint8))
+
+    assert engine.shapes == [(480 - 190, 611 - 30)]           # bounding crop (+ margin), not the whole frame
+    np.testing.assert_array_equal(boxes, [[330, 290, 370, 350]])
+    assert len(scores) == len(ids) == 1
+
+
+def test_polygon_scales_to_other_resolutions():
+    region = PoolRegion(POLY, (640, 480), margin=0)
+    view, offset = region.crop(np.zeros((240, 320, 3), np.uint8))
+    assert offset == (20, 100) and view.shape[:2] == (136, 281)
+    inside = region.inside(np.array([[150, 150, 170, 200], [5, 5, 25, 50]], np.float32), (240, 320))
+    assert inside.tolist() == [True, False]
+
+
+def test_save_and_load_per_camera(tmp_path):
+    path = str(tmp_path / "regions.json")
+    save_region(POLY, (640, 480), camera="deck", path=path)
+    save_region(POLY[:3], (1280, 720), camera="side", path=path)
+    assert load_region("deck", path).polygon.shape == (4, 2)
+    assert load_region("side", path).frame_size == (1280, 720)
+    assert load_region("missing", path) is None
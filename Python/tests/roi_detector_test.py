@@ -0,0 +1,106 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "openVino CPU"))
+from roi_detector import RoiDetector, roi_window
+
+
+def _scene(x, y, w=40, h=90):
+    frame = np.zeros((480, 640, 3), np.uint8)
+    frame[y:y+h, x:x+w] = 255
+    return frame
+
+
+class PatchEngine:
+    """Reports the white patch in whatever image it is given, in that image's pixels."""
+    def __init__(self, imgsz):
+        self.imgsz = imgsz
+        self.name = "patch"
+        self.shapes = []
+
+    def detect(self, frame):
+        self.shapes.append(frame.shape[:2])
+        ys, xs = np.nonzero(frame[..., 0] == 255)
+        if not len(xs):
+            return np.zeros((0, 4), np.float32), np.zeros(0, np.float32), np.zeros(0, np.int64)
+        box = [xs.min(), ys.min(), xs.max() + 1, ys.max() + 1]
+        return np.array([box], np.float32), np.array([0.9], np.float32), np.array([0], np.int64)
+
+
+def test_crop_boxes_map_back_to_frame_pixels():
+    full, crop = PatchEngine(416), PatchEngine(256)
+    det = RoiDetector(full, crop, full_every=100)
+    for k in range(10):
+        x, y = 200 + 5*k, 150 + 2*k
+        boxes, _, _ = det.detect(_scene(x, y))
+        np.testing.assert_array_equal(boxes[0], [x, y, x + 40, y + 90])
+    assert det.n_full == 1 and det.n_roi == 9
+    assert all(s[0] < 480 and s[1] < 640 for s in crop.shapes)
+
+
+def test_periodic_and_fallback_full_frame_passes():
+    det = RoiDetector(PatchEngine(416), PatchEngine(256), full_every=4)
+    for _ in range(8):
+        det.detect(_scene(300, 200))
+    assert det.n_full == 2 and det.n_roi == 6
+
+    # target jumps far outside the window: the same call falls back to the full frame
+    boxes, _, _ = det.detect(_scene(10, 10))
+    np.testing.assert_array_equal(boxes[0], [10, 10, 50, 100])
+    assert det.window is None
+
+
+def test_roi_window_stays_inside_frame():
+    for box in ((0, 0, 30, 60), (600, 400, 640, 480), (100, 0, 600, 480)):
+        x0, y0, x1, y1 = roi_window(box, (480, 640, 3))
+        assert 0 <= x0 < x1 <= 640 and 0 <= y0 < y1 <= 480
+        assert x0 <= box[0] and y0 <= box[1] and box[2] <= x1 and box[3] <= y1
+
+
+def test_select_picks_the_person_to_crop_around():
+    class TwoPeople(PatchEngine):
+        def detect(self, frame):
+            self.shapes.append(frame.shape[:2])
+            boxes = np.array([[10, 10, 50, 100], [400, 200, 440, 290]], np.float32)
+            return boxes, np.array([0.9, 0.6], np.float32), np.array([0, 0], np.int64)
+
+    det = RoiDetector(TwoPeople(416), PatchEngine(256), select=lambda boxes, ids, shape: 1)
+    det.detect(_scene(0, 0))
+    assert det.last_box == (400, 200, 440, 290)
+
+
+class FixedEngine:
+    """Returns the same (image-relative) boxes for any input, scores as given."""
+    def __init__(self, boxes, scores, imgsz=416):
+        self.boxes, self.scores = np.array(boxes, np.float32), np.array(scores, np.float32)
+        self.imgsz, self.name = imgsz, "fixed"
+
+    def detect(self, frame):
+        return self.boxes, self.scores, np.zeros(len(self.boxes), np.int64)
+
+
+def test_pool_region_filters_before_the_lock():
+    from pool_region import PoolRegion, RegionDetector
+    # pool seen from the deck; the bounding crop starts at (40, 200)
+    region = PoolRegion([(100, 200), (540, 200), (600, 470), (40, 470)], (640, 480), margin=0)
+    # crop-relative: someone on the deck in the crop's corner (higher score), a swimmer in the water
+    full = FixedEngine([[0, -50, 40, 10], [260, 100, 300, 180]], [0.95, 0.6])
+    det = RoiDetector(RegionDetector(full, region), FixedEngine([], []), region=region)
+    boxes, _, _ = det.detect(np.zeros((480, 640, 3), np.uint8))
+    np.testing.assert_array_equal(boxes, [[300, 300, 340, 380]])
+    assert det.last_box == (300, 300, 340, 380)   # never locked onto the person outside the polygon
+
+    # the window pass is filtered too: left half of the frame is the pool
+    half = PoolRegion([(0, 0), (320, 0), (320, 480), (0, 480)], (640, 480), margin=0)
+    full = FixedEngine([[250, 200, 290, 290]], [0.6])
+    # window-relative: the swimmer, and someone just right of the pool edge with a higher score
+    x0, y0, _, _ = roi_window((250, 200, 290, 290), (480, 640))
+    roi = FixedEngine(np.array([[250, 200, 290, 290], [320, 200, 345, 290]]) - [x0, y0, x0, y0], [0.6, 0.9], imgsz=256)
+    det = RoiDetector(RegionDetector(full, half), roi, region=half, full_every=100)
+    det.detect(np.zeros((480, 640, 3), np.uint8))
+    boxes, _, _ = det.detect(np.zeros((480, 640, 3), np.uint8))
+    assert det.n_roi == 1
+    np.testing.assert_array_equal(boxes, [[250, 200, 290, 290]])
+    assert det.last_box == (250, 200, 290, 290)
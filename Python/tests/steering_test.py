@@ -0,0 +1,67 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Live Camera Feed"))
+from steering import SteeringEstimator
+
+COAST_S = 0.5
+
+SHAPE = (480, 640, 3)
+
+
+def _box(cx, cy=240, bw=60, bh=150):
+    return (cx - bw / 2, cy - bh / 2, cx + bw / 2, cy + bh / 2)
+
+
+def test_predicts_ahead_by_loop_latency():
+    est = SteeringEstimator(sensitivity=1.0)
+    dt, speed = 0.2, 50.0                       # 5 updates/s, target moving 50 px/s to the right
+    for k in range(30):
+        aim = est.update(_box(100 + speed * dt * k), SHAPE, now=k * dt)
+    assert abs(est.latency_s - dt) < 1e-9
+    predicted_cx = (aim.box[0] + aim.box[2]) / 2
+    now_cx = 100 + speed * dt * 29
+    assert abs(predicted_cx - (now_cx + speed * dt)) < 5   # where it will be when the command lands
+    assert abs(aim.coverage - 150 / 480) < 0.01
+    assert 0 < aim.turn <= 1.0
+
+
+def test_stays_locked_on_the_same_person():
+    est = SteeringEstimator()
+    ids = np.array([0, 0])
+    for k in range(5):
+        boxes = np.array([_box(200 + 5 * k), _box(500, bh=300)])   # the second one is bigger
+        i = est.select(boxes, ids, SHAPE, now=k * 0.1) if k else 0
+        assert i == 0
+        est.update(boxes[i], SHAPE, now=k * 0.1)
+
+    fresh = SteeringEstimator()
+    assert fresh.select(np.array([_box(200), _box(500, bh=300)]), ids, SHAPE) == 1   # unlocked: largest
+    assert fresh.select(np.array([_box(200)]), np.array([2]), SHAPE) is None
+
+
+def test_selects_against_the_prediction_for_the_frame_time():
+    est = SteeringEstimator()
+    for k in range(10):                          # 400 px/s to the right
+        est.update(_box(100 + 40 * k), SHAPE, now=k * 0.1)
+    last = 100 + 40 * 9
+    # 0.3 s later the target is ~120 px on; someone else stands where it was at the last update
+    boxes = np.array([_box(last - 20), _box(last + 120)])
+    assert est.select(boxes, np.array([0, 0]), SHAPE, now=0.9 + 0.3) == 1
+
+
+def test_drops_the_target_at_once_unless_coasting_is_enabled():
+    est = SteeringEstimator()
+    est.update(_box(320), SHAPE, now=0.0)
+    assert est.update(None, SHAPE, now=0.1) is None     # no throttle on a lost target by default
+
+
+def test_coasts_then_drops_the_target():
+    est = SteeringEstimator(coast_s=COAST_S)
+    for k in range(5):
+        est.update(_box(320), SHAPE, now=k * 0.1)
+    aim = est.update(None, SHAPE, now=0.4 + COAST_S / 2)
+    assert aim is not None and not aim.measured
+    assert est.update(None, SHAPE, now=0.4 + 2 * COAST_S) is None
@@ -0,0 +1,95 @@
+import os
+import sys
+
+import cv2
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "openVino CPU"))
+import tiled_detector
+from tiled_detector import TiledDetector, make_tiles, merge_boxes
+
+
+class BlobEngine:
+    """Finds white squares in each image it is given, in that image's pixels; counts batch sizes."""
+    name = "blobs"
+
+    def __init__(self):
+        self.batches = []
+
+    def detect_batch(self, frames):
+        self.batches.append(len(frames))
+        out = []
+        for f in frames:
+            n, _, stats, _ = cv2.connectedComponentsWithStats((f[..., 0] == 255).astype(np.uint8))
+            b = np.array([[x, y, x + w, y + h] for x, y, w, h, _ in stats[1:]], np.float32).reshape(-1, 4)
+            out.append((b, np.full(len(b), 0.9, np.float32), np.zeros(len(b), np.int64)))
+        return out
+
+
+def _scene(*squares):
+    frame = np.full((480, 640, 3), 60, np.uint8)
+    for x, y, s in squares:
+        frame[y:y+s, x:x+s] = 255
+    return frame
+
+
+def test_tiles_cover_the_frame_with_overlap():
+    tiles = make_tiles((480, 640), tile=320, overlap=0.2)
+    cover = np.zeros((480, 640), int)
+    for x0, y0, x1, y1 in tiles:
+        assert x1 - x0 == 320 and y1 - y0 == 320
+        cover[y0:y1, x0:x1] += 1
+    assert cover.min() >= 1 and cover.max() > 1
+
+
+def test_small_object_found_once_in_frame_coordinates():
+    engine = BlobEngine()
+    det = TiledDetector(engine, full_frame=False, motion=False)
+    # (290, 250) sits where several tiles overlap
+    boxes, _, _ = det.detect(_scene((600, 440, 6), (290, 250, 8)))
+    assert len(boxes) == 2
+    got = sorted(map(tuple, boxes.tolist()))
+    assert got == [(290, 250, 298, 258), (600, 440, 606, 446)]
+    assert engine.batches == [len(make_tiles((480, 640)))]   # one batch for all tiles
+
+
+def test_static_tiles_are_skipped_until_refresh(monkeypatch):
+    monkeypatch.setattr(tiled_detector, "REFRESH_EVERY", 10)
+    engine = BlobEngine()
+    det = TiledDetector(engine, full_frame=False, motion=True)
+    n_tiles = len(make_tiles((480, 640)))
+    frame = _scene()
+    sizes = []
+    for _ in range(10):
+        engine.batches.clear()
+        det.detect(frame)
+        sizes.append(sum(engine.batches))
+    assert sizes[0] == n_tiles            # first frame: no background yet
+    assert sizes[1:9] == [0] * 8          # nothing moves, nothing held
+    assert sizes[9] == n_tiles            # periodic refresh
+
+    moving = _scene((20, 20, 10))
+    engine.batches.clear()
+    det.detect(moving)
+    assert 0 < sum(engine.batches) < n_tiles
+
+
+def test_object_straddling_a_tile_seam_is_reported_once():
+    # tiles start at x = 0, 256, 320: the tile at 256 sees only a 44 px sliver of the first square
+    # (IoU 0.44 with the whole, under NMS's threshold), and no tile holds all of the second one
+    engine = BlobEngine()
+    for full_frame in (False, True):
+        det = TiledDetector(engine, full_frame=full_frame, motion=False)
+        boxes, _, _ = det.detect(_scene((200, 60, 100), (230, 300, 100)))
+        got = sorted(map(tuple, boxes.tolist()))
+        assert got == [(200, 60, 300, 160), (230, 300, 330, 400)]
+
+
+def test_merge_keeps_classes_and_neighbours_apart():
+    boxes = np.array([[0, 0, 100, 100], [60, 0, 100, 100], [60, 0, 100, 100], [110, 0, 150, 100]], np.float32)
+    scores = np.array([0.9, 0.8, 0.7, 0.6], np.float32)
+    ids = np.array([0, 0, 1, 0])
+    b, s, c = merge_boxes(boxes, scores, ids)
+    assert b.tolist() == [[0, 0, 100, 100], [60, 0, 100, 100], [110, 0, 150, 100]]
+    assert s.tolist() == pytest.approx([0.9, 0.7, 0.6]) and c.tolist() == [0, 1, 0]
@@ -0,0 +1,37 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from video_recorder import VideoRecorder
+
+
+def _frames(n, shape=(48, 64, 3)):
+    rng = np.random.default_rng(0)
+    return [rng.integers(0, 255, shape, dtype=np.uint8) for _ in range(n)]
+
+
+def test_writes_and_rotates_by_size(tmp_path):
+    # noise compresses badly, so 90 frames of 240x320 are several MB
+    rec = VideoRecorder(str(tmp_path), prefix="clip", fourcc="MJPG", segment_mb=1, queue_size=200)
+    with rec:
+        for f in _frames(90, (240, 320, 3)):
+            assert rec.write(f)
+    assert rec.written == 90 and rec.dropped == 0
+    assert len(rec.segments) > 1
+    assert all(os.path.getsize(p) > 0 for p in rec.segments)
+
+
+def test_rotates_on_resolution_change(tmp_path):
+    with VideoRecorder(str(tmp_path), fourcc="MJPG") as rec:
+        for f in _frames(5) + _frames(5, (96, 128, 3)):
+            rec.write(f)
+    assert len(rec.segments) == 2
+
+
+def test_drops_instead_of_blocking(tmp_path):
+    rec = VideoRecorder(str(tmp_path), queue_size=4)   # not started: nothing drains the queue
+    accepted = [rec.write(f) for f in _frames(10)]
+    assert accepted == [True] * 4 + [False] * 6
+    assert rec.dropped == 6
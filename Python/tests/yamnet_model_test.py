@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "YAMNET_ai_audio_model"))
+import yamnet_model
+
+
+def test_class_names_from_cached_csv(tmp_path):
+    path = tmp_path / "yamnet_class_map.csv"
+    path.write_text('index,mid,display_name\n0,/m/09x0r,Speech\n1,/m/0ytgt,"Child speech, kid speaking"\n')
+    assert yamnet_model.class_names(str(path)) == ["Speech", "Child speech, kid speaking"]
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        yamnet_model.load_classifier("onnx")
+
+
+def test_missing_model_files_point_to_fetch(tmp_path, monkeypatch):
+    monkeypatch.setattr(yamnet_model, "SAVED_MODEL_DIR", str(tmp_path / "missing"))
+    with pytest.raises(FileNotFoundError, match="fetch"):
+        yamnet_model.load_classifier("saved_model")
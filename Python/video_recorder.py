@@ -0,0 +1,128 @@
+# video_recorder.py
+# Record annotated frames without slowing the detection loop: write() only hands the frame
+# to a bounded queue, a background thread does the encoding. When the encoder falls behind
+# the frame is dropped (and counted) instead of blocking. Output is split into segments
+# by duration or file size so a long session doesn't grow into one huge file.
+import os, time, threading, queue
+
+import cv2
+
+FOURCC = "mp4v"
+EXT = ".avi"
+SEGMENT_SECONDS = 300     # start a new file every 5 minutes...
+SEGMENT_MB = 200          # ...or once the current one reaches this size
+QUEUE_SIZE = 64           # ~2 s of 30 FPS video buffered before we start dropping
+SIZE_CHECK_EVERY = 30     # frames between file-size checks (the writer flushes in chunks, so size is approximate)
+
+_STOP = object()
+
+
+class VideoRecorder:
+    """
+    with VideoRecorder(prefix="isegment_output", fps=fps) as rec:
+        rec.write(frame)    # never blocks; False if the frame was dropped
+
+    The recorder keeps a reference to each queued frame, so don't draw into it afterwards.
+    """
+
+    def __init__(self, out_dir=".", prefix="recording", fps=30.0, fourcc=FOURCC, ext=EXT,
+                 segment_seconds=SEGMENT_SECONDS, segment_mb=SEGMENT_MB, queue_size=QUEUE_SIZE):
+        self.out_dir = out_dir
+        self.prefix = prefix
+        self.fps = fps if fps and fps > 0 else 30.0   # cameras often report 0
+        self.fourcc = cv2.VideoWriter_fourcc(*fourcc)
+        self.ext = ext
+        self.segment_seconds = segment_seconds
+        self.segment_bytes = segment_mb * 1024 * 1024
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+
+        self._writer = None
+        self._path = None
+        self._size = None
+        self._opened_at = 0.0
+        self._frames_in_segment = 0
+        # stats
+        self.written = 0
+        self.dropped = 0
+        self.segments = []
+
+    # ---- lifecycle ----
+    def start(self):
+        if self._thread is None:
+            os.makedirs(self.out_dir, exist_ok=True)
+            self._thread = threading.Thread(target=self._run, name="video-recorder", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=10.0):
+        """Flush what is queued, close the current segment and join the encoder thread."""
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+            self._thread = None
+        if self.dropped:
+            print(f"🎞️ recorder: {self.written} frames written, {self.dropped} dropped, "
+                  f"{len(self.segments)} segment(s)")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ---- producer side ----
+    def write(self, frame):
+        try:
+            self._queue.put_nowait(frame)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    @property
+    def pending(self):
+        return self._queue.qsize()
+
+    # ---- encoder thread ----
+    def _run(self):
+        try:
+            while True:
+                frame = self._queue.get()
+                if frame is _STOP:
+                    break
+                if self._needs_rotation(frame):
+                    self._open(frame)
+                self._writer.write(frame)
+                self._frames_in_segment += 1
+                self.written += 1
+        finally:
+            self._close()
+
+    def _needs_rotation(self, frame):
+        if self._writer is None or frame.shape[:2] != self._size:
+            return True
+        if time.monotonic() - self._opened_at >= self.segment_seconds:
+            return True
+        if self._frames_in_segment % SIZE_CHECK_EVERY == 0:
+            try:
+                return os.path.getsize(self._path) >= self.segment_bytes
+            except OSError:
+                return False
+        return False
+
+    def _open(self, frame):
+        self._close()
+        h, w = frame.shape[:2]
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        self._path = os.path.join(self.out_dir, f"{self.prefix}_{stamp}_{len(self.segments):03d}{self.ext}")
+        self._writer = cv2.VideoWriter(self._path, self.fourcc, self.fps, (w, h))
+        self._size = (h, w)
+        self._opened_at = time.monotonic()
+        self._frames_in_segment = 0
+        self.segments.append(self._path)
+
+    def _close(self):
+        if self._writer is not None:
+            self._writer.release()
+            self._writer = None
@@ -3,12 +3,14 @@ import cv2
 
 from ultralytics import solutions
 
+from video_recorder import VideoRecorder
+
 cap = cv2.VideoCapture(0)
 assert cap.isOpened(), "Error reading video file"
 
-# Video writer
-w, h, fps = (int(cap.get(x)) for x in (cv2.CAP_PROP_FRAME_WIDTH, cv2.CAP_PROP_FRAME_HEIGHT, cv2.CAP_PROP_FPS))
-video_writer = cv2.VideoWriter("isegment_output.avi", cv2.VideoWriter_fourcc(*"mp4v"), fps, (w, h))
+# Video writer (encodes on a background thread, rotates files by time/size)
+fps = cap.get(cv2.CAP_PROP_FPS)
+video_writer = VideoRecorder(prefix="isegment_output", fps=fps).start()
 
 # Initialize instance segmentation object
 isegment = solutions.InstanceSegmentation(
@@ -35,5 +37,5 @@ while cap.isOpened():
     video_writer.write(results.plot_im)  # write the processed frame.
 
 cap.release()
-video_writer.release()
+video_writer.stop()
 cv2.destroyAllWindows()  # destroy all opened windows
\ No newline at end of file